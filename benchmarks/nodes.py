@@ -0,0 +1,68 @@
+"""micro-benchmark of building, serializing, comparing, hashing, copying
+and pickling trees and linked lists of 10^6 nodes
+
+    python benchmarks/nodes.py [n]
+"""
+import sys
+import pickle
+
+from leezy.assists import ListNode, TreeNode, TreeArray
+from leezy.bench import benchmark, format_ns
+from leezy.fastcopy import fast_copy
+from leezy.fingerprint import fingerprint
+from leezy.utils import Table
+
+
+def complete_tree(n):
+    return list(range(n))
+
+
+def degenerate_tree(n):
+    """values of a tree where every node has only a right child"""
+    data = [0]
+    for i in range(1, n):
+        data.extend((None, i))
+    return data
+
+
+def cases(n):
+    for name, data in (('complete tree', complete_tree(n)),
+                       ('degenerate tree', degenerate_tree(n))):
+        tree = TreeNode.make_tree(data)
+        other = TreeNode.make_tree(data)
+        array_root = TreeArray.from_list(data).root
+        yield name, 'make_tree', TreeNode.make_tree, data
+        yield name, 'TreeArray.from_list', TreeArray.from_list, data
+        yield name, 'level order', list, tree
+        yield name, '==', tree.__eq__, other
+        yield name, 'fingerprint', fingerprint, tree
+        yield name, 'fingerprint (array)', fingerprint, array_root
+        yield name, 'fast_copy', fast_copy, tree
+        yield name, 'pickle round trip', round_trip, tree
+    data = list(range(n))
+    head = ListNode.make_linked_list(data)
+    other = ListNode.make_linked_list(data)
+    yield 'linked list', 'make_linked_list', ListNode.make_linked_list, data
+    yield 'linked list', '==', head.__eq__, other
+    yield 'linked list', 'fast_copy', fast_copy, head
+    yield 'linked list', 'pickle round trip', round_trip, head
+
+
+def round_trip(obj):
+    return pickle.loads(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    table = Table()
+    table.add_header([f'{n} nodes', 'operation', 'median', 'per node'])
+    for name, op, call, arg in cases(n):
+        _, stats = benchmark(call, lambda: ((arg,), {}), warmup=1,
+                             repeat=3)
+        table.add_row([name, op, format_ns(stats.median),
+                       format_ns(stats.median / n)])
+    print(table)
+
+
+if __name__ == '__main__':
+    main()
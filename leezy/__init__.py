@@ -2,4 +2,5 @@
 leezy: Manage your leetcode Python solutions better
 """
 
-from leezy.core import solution, Solution
+from leezy.core import solution, reference, Solution, timeit, memit
+from leezy.design import Design
@@ -1,9 +1,18 @@
 import sys
+
+# hand the command to a running daemon before importing anything heavy
+from leezy import daemon
+exit_code = daemon.forward(sys.argv[1:])
+if exit_code is not None:
+    sys.exit(exit_code)
+
 import logging
 import argparse
 import subprocess
 
-from leezy.crawler import Problem
+from leezy.crawler import Problem, ID_WIDTH
+from leezy.render import CONTEXTS
+from leezy.utils import Table
 from leezy.config import config, session_token, Urls
 
 from leezy.errors import show_error_and_exit, LeezyError
@@ -125,37 +134,132 @@ pull_parser = subs.add_parser(
     leezy pull 1 2 3             pull (1st, 2nd, 3rd) problems together
     leezy pull 1-3               pull (1st, 2nd, 3rd) problems together
     leezy pull 700 -c tree       pull no.700 and set tree context
-    leezy pull 2 -c linkedlist   pull no.2 and set linkedlist context""")
+    leezy pull 2 -c linkedlist   pull no.2 and set linkedlist context
+    leezy pull 133 -c graph      pull no.133 and set graph context""")
 
 pull_parser.add_argument('ids', nargs='+', help="problem ids")
 pull_parser.add_argument('-c', '--context',
                          metavar='',
-                         choices=['tree', 'linkedlist'],
-                         help="set a context for this problem [tree or linkedlist]")
+                         choices=list(CONTEXTS),
+                         help="set a context for this problem "
+                              f"[{', '.join(CONTEXTS)}]")
 pull_parser.set_defaults(func=pull)
 
 
-def run(args):
+def problem_path(pid):
+    """path of the file of problem `pid`, None if it's not found. Files
+    of pulled problems are found without the network
+    """
+    from leezy.batch import local_problem_path
+    loc_id = str(pid).rjust(ID_WIDTH, '0')
+    py_path = local_problem_path(config.get('core.workdir'), loc_id)
+    if py_path is not None:
+        return py_path
     try:
-        py_path = Problem(args.id).py_path
+        py_path = Problem(pid).py_path
     except LeezyError as e:
         show_error_and_exit(e)
     except Exception as e:
         show_uncaught_exc(e)
-
+        return None
     if not py_path.is_file():
         print(f'File not found: {py_path}')
+        return None
+    return py_path
+
+
+def launch(pid, timeout):
+    """run the file of problem `pid`, configs patched are passed on"""
+    py_path = problem_path(pid)
+    if py_path is None:
+        return
+    if daemon.current is not None:
+        daemon.current.run_file(py_path, timeout)
+        return
+    try:
+        subprocess.run(['python', str(py_path)],
+                       timeout=timeout,
+                       cwd=py_path.parent,
+                       env=config.patch_env())
+    except FileNotFoundError:
+        print('python can\'t be launched by command \'python\'')
+    except subprocess.TimeoutExpired:
+        print(f'Timeout({timeout:g}s). '
+              'Is there an infinite loop in the solution? '
+              'Try --sandbox to limit every solution separately')
+
+
+def run_batch(ids, timeout):
+    """run files of problems `ids`, or of all problems in the workdir if
+    `ids` is None, in a pool and exit with 1 if any of them fails
+    """
+    from leezy.batch import BatchRunner, local_problems
+    workdir = config.get('core.workdir')
+    found = local_problems(workdir)
+    if ids is None:
+        problems = [found[k] for k in sorted(found)]
     else:
-        try:
-            subprocess.run(['python', str(py_path)],
-                           timeout=5,
-                           cwd=py_path.parent)
-        except FileNotFoundError:
-            print('python can\'t be launched by command \'python\'')
-        except subprocess.TimeoutExpired:
-            print('Timeout(10s). Is there an infinite loop in the solution?')
-        except Exception:
-            raise
+        problems, missing = [], []
+        for pid in ids:
+            try:
+                key = int(pid)
+            except ValueError:
+                _exit(f'{pid!r} is not a number')
+            if key in found:
+                problems.append(found[key])
+            else:
+                missing.append(pid)
+        if missing:
+            print(f'skipped {len(missing)} problems not pulled: '
+                  f'{", ".join(missing[:10])}'
+                  f'{", ..." if len(missing) > 10 else ""}')
+    if not problems:
+        _exit(f'no problem files are found in {workdir}')
+    config.patch('run.exit_on_failure', True)
+    runner = BatchRunner(workdir, int(config.get('run.workers')), timeout,
+                         config.patch_env())
+    if runner.run(problems):
+        sys.exit(1)
+
+
+def run(args):
+    ids = expand_ids(args.ids) if args.ids else []
+    if not ids and not args.all:
+        _exit('give problem ids, or --all to run every problem')
+    if args.watch and (args.all or len(ids) > 1):
+        _exit('only one problem can be watched')
+    if args.parallel:
+        config.patch('run.parallel', True)
+    if args.bench:
+        config.patch('run.bench', True)
+    if args.scale:
+        config.patch('run.scale', True)
+    if args.sandbox:
+        config.patch('run.sandbox', True)
+    if args.verify_mutation:
+        config.patch('run.verify_mutation', True)
+    if args.memory:
+        config.patch('run.memory', True)
+    if args.profile:
+        config.patch('run.profile', True)
+    if args.no_cache:
+        config.patch('run.cache', False)
+    timeout = float(config.get('timeout.run'))
+    # pairs in sandboxes have their own limits, and measuring modes
+    # take long by design, don't let the total timeout kill their results
+    if any(config.get_bool(k) for k in ('run.sandbox', 'run.bench',
+                                        'run.scale', 'run.profile')):
+        timeout = None
+    if args.watch:
+        from leezy.watch import Watcher
+        py_path = problem_path(ids[0])
+        if py_path is not None:
+            Watcher(py_path, float(config.get('watch.interval'))).loop()
+        return
+    if args.all or len(ids) > 1:
+        run_batch(None if args.all else ids, timeout)
+        return
+    launch(ids[0], timeout)
 
 
 run_parser = subs.add_parser(
@@ -164,15 +268,129 @@ run_parser = subs.add_parser(
     help='run your solutions, see outputs or test them',
     formatter_class=argparse.RawDescriptionHelpFormatter,
     description=r"""examples:
-    leezy run 1       run the first problem""")
-run_parser.add_argument('id', help="problem id")
+    leezy run 1       run the first problem
+    leezy run 1-300   run files of problems 1 to 300 pulled in the workdir
+                      in a pool, the slowest last time first, and summarize
+                      their outcomes, exit with 1 if any of them fails
+    leezy run --all   run files of all problems pulled in the workdir
+    leezy run 1 -p    run (solution, case) pairs of problem 1 in parallel
+    leezy run 1 -b    benchmark solutions of problem 1 with repeated runs
+    leezy run 1 --scale
+                      estimate complexities of solutions of problem 1
+                      with inputs made by the generator of `set_generator`
+    leezy run 1 -m    trace peak memory of solutions of problem 1
+    leezy run 1 --profile
+                      profile solutions of problem 1, write collapsed
+                      stacks for flame graphs into the problem folder
+    leezy run 1 -w    run problem 1 whenever its file is saved, only
+                      changed solutions and cases are run again
+    leezy run 1 -s    run every (solution, case) of problem 1 in a sandbox,
+                      with time and memory limits of `sandbox.*` configs""")
+run_parser.add_argument('ids', nargs='*', help="problem ids")
+run_parser.add_argument('--all',
+                        action='store_true',
+                        help="run all problems in the workdir")
+run_parser.add_argument('-p', '--parallel',
+                        action='store_true',
+                        help="run solutions on cases in a process pool")
+run_parser.add_argument('-b', '--bench',
+                        action='store_true',
+                        help="report min/median/IQR of repeated runs")
+run_parser.add_argument('--scale',
+                        action='store_true',
+                        help="run solutions over growing input sizes")
+run_parser.add_argument('-s', '--sandbox',
+                        action='store_true',
+                        help="limit time and memory of every solution")
+run_parser.add_argument('-m', '--memory',
+                        action='store_true',
+                        help="trace peak memory and leaks of every solution")
+run_parser.add_argument('--profile',
+                        action='store_true',
+                        help="profile every solution and show hot functions")
+run_parser.add_argument('-w', '--watch',
+                        action='store_true',
+                        help="run again in this process whenever the file "
+                             "is saved")
+run_parser.add_argument('--no-cache',
+                        action='store_true',
+                        help="run every solution, even if its code and "
+                             "the case are unchanged since the last run")
+run_parser.add_argument('--verify-mutation',
+                        action='store_true',
+                        help="share inputs between solutions and verify "
+                             "they are not mutated, instead of copying")
 run_parser.set_defaults(func=run)
 
 
+def fuzz(args):
+    config.patch('run.fuzz', True)
+    if args.runs is not None:
+        config.patch('fuzz.runs', args.runs)
+    if args.seed is not None:
+        config.patch('fuzz.seed', args.seed)
+    launch(args.id, None)
+
+
+fuzz_parser = subs.add_parser(
+    'fuzz',
+    usage=argparse.SUPPRESS,
+    help='check solutions against a reference on random inputs',
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    description=r"""examples:
+    leezy fuzz 1              run solutions of problem 1 on random inputs
+                              made by the generator of `set_generator`,
+                              report where they disagree with `@reference`
+    leezy fuzz 1 -n 10000     fuzz with 10000 inputs
+    leezy fuzz 1 --seed 42 -n 1
+                              make the input of seed 42 again""")
+fuzz_parser.add_argument('id', help="problem id")
+fuzz_parser.add_argument('-n', '--runs',
+                         type=int,
+                         metavar='',
+                         help="number of inputs, default is `fuzz.runs`")
+fuzz_parser.add_argument('--seed',
+                         type=int,
+                         metavar='',
+                         help="seed of the first input, default is `fuzz.seed`")
+fuzz_parser.set_defaults(func=fuzz)
+
+
+def measure_solution(problem, func):
+    """benchmark solution `func` alone in the problem file, return its
+    total seconds over the local cases and the number of cases
+    """
+    from leezy.calibration import measure
+    print(f'benchmarking {func!r} on local cases...')
+    config.patch('run.bench', True)
+    config.patch('run.cache', False)
+    config.patch('run.only', func)
+    config.patch('history.enabled', True)
+    return measure(problem.py_path, problem.loc_id, func,
+                   config.patch_env(), float(config.get('timeout.run')))
+
+
 def submit(args):
     sol_id, front_id = parse_solution_pos(args.solution)
     try:
-        Problem(front_id).submit(sol_id)
+        problem = Problem(front_id)
+        local = note = None
+        if args.predict or config.get_bool('submit.calibrate'):
+            from leezy.calibration import Calibration
+            calibration = Calibration(config.get('core.workdir'))
+            func = problem.solution_name(sol_id)
+            local, n_cases = measure_solution(problem, func)
+            if local:
+                note = calibration.describe(problem.loc_id, local)
+            else:
+                note = (f'no local timing of {func!r}, '
+                        'cases without assertions are timed')
+        if args.predict:
+            print(note)
+            return
+        data = problem.submit(sol_id, note)
+        if local and data and data['status_code'] == 10:
+            calibration.record(problem.loc_id, func, local, n_cases, data)
     except LeezyError as e:
         show_error_and_exit(e)
     except Exception as e:
@@ -187,12 +405,54 @@ submit_parser = subs.add_parser(
     description=r"""examples:
     leezy submit 1@1      submit the 1st solution of problem 1
     leezy submit 2@1      submit the 2nd solution of problem 1
-    leezy submit 1        same with 1@1, just a shortcut""")
+    leezy submit 1        same with 1@1, just a shortcut
+    leezy submit 2@1 --predict
+                          predict the runtime and the percentile of the 2nd
+                          solution of problem 1 from local timings, fitted
+                          on accepted submissions, without submitting""")
 
 submit_parser.add_argument('solution', help="postion of your solution")
+submit_parser.add_argument('--predict',
+                           action='store_true',
+                           help="predict the online runtime, don't submit")
 submit_parser.set_defaults(func=submit)
 
 
+def history(args):
+    from leezy.history import History
+    store = History(config.get('core.workdir'))
+    for pid in expand_ids(args.ids):
+        rows = store.trends(str(pid).rjust(ID_WIDTH, '0'), args.last)
+        if not rows:
+            print(f'No history of problem {pid}')
+            continue
+        table = Table(**config.get('table'))
+        table.add_header([f'problem {pid}', 'case', 'runs',
+                          'trend', 'change since last run'])
+        for row in rows:
+            table.add_row(row)
+        print(table)
+
+
+history_parser = subs.add_parser(
+    'history',
+    usage=argparse.SUPPRESS,
+    help='show timing trends and regressions of solutions',
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    description=r"""examples:
+    leezy history 1        show timing trends of problem 1
+    leezy history 1-3      show timing trends of problem 1, 2 and 3
+
+    run with 'leezy run -b' to collect enough samples for significance""")
+history_parser.add_argument('ids', nargs='+', help="problem ids")
+history_parser.add_argument('-n', '--last',
+                            type=int,
+                            default=5,
+                            metavar='',
+                            help="number of runs shown in a trend")
+history_parser.set_defaults(func=history)
+
+
 def plot(args):
     from leezy.plot import SNSPlotter, DataFeeder
     SNSPlotter(DataFeeder()).plot()
@@ -247,10 +507,45 @@ group.add_argument('-a', '--add',
                    help='add a <Key Value> setting pair')
 config_parser.set_defaults(func=handle_config)
 
-args = parser.parse_args()
-if not hasattr(args, 'func'):
-    parser.print_help()
-else:
+
+def serve_daemon(args):
+    if args.stop:
+        if not daemon.stop_daemon():
+            print('no daemon is running')
+        return
+    if not hasattr(daemon.socket, 'AF_UNIX') or not hasattr(daemon.os, 'fork'):
+        _exit('the daemon needs Unix domain sockets and fork')
+    # build the session and load the problem index before serving
+    from leezy.crawler import shared_provider
+    try:
+        shared_provider()
+    except Exception as e:
+        # commands build it again when they need it
+        Warn(f'the session is not built: {e!r}')
+    daemon.Daemon(main).serve()
+
+
+daemon_parser = subs.add_parser(
+    'daemon',
+    usage=argparse.SUPPRESS,
+    help='serve commands from a warm process',
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    description=r"""examples:
+    leezy daemon          keep a process with leezy imported, the session
+                          and the problem index built, 'show', 'pull', 'run'
+                          and 'submit' in other terminals are served by it
+    leezy daemon --stop   stop the running daemon""")
+daemon_parser.add_argument('--stop',
+                           action='store_true',
+                           help="stop the running daemon")
+daemon_parser.set_defaults(func=serve_daemon)
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    if not hasattr(args, 'func'):
+        parser.print_help()
+        return
     if args.zone is not None:
         config.patch('core.zone', args.zone)
     if args.v is not None:
@@ -276,15 +571,21 @@ else:
             return True
         return _reject_filter
 
-    logging.basicConfig(level=log_lv)
     root = logging.getLogger()
-    rej_mat = reject_modules(['matplotlib'])
-    for hld in root.handlers:
-        hld.addFilter(rej_mat)
+    if not root.handlers:
+        logging.basicConfig()
+        rej_mat = reject_modules(['matplotlib'])
+        for hld in root.handlers:
+            hld.addFilter(rej_mat)
+    # a daemon serves commands of different verbosity
+    root.setLevel(log_lv)
 
     args.func(args)
 
 
+main()
+
+
 # this is for setup:entry_points:console_scripts
 def dummy_main(*_args, **_kwargs):
     return
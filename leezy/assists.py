@@ -2,24 +2,107 @@
 # --------------------------------------------------------
 # - linked list
 # - tree
+# - graph
+# - n-ary tree
+# - grid
 # --------------------------------------------------------
+from array import array
 from collections import deque
-from itertools import zip_longest, islice
+from itertools import chain, islice, zip_longest
+
+
+def _transform_lists(make, args, kwargs):
+    """apply `make` to the list arguments, positional or keyword"""
+    args = [make(x) if isinstance(x, list) else x for x in args]
+    kwargs = {k: make(v) if isinstance(v, list) else v
+              for k, v in kwargs.items()}
+    return args, kwargs
 
 
 class LinkedListContext:
     @staticmethod
     def transform_args(args, kwargs):
-        args = [ListNode.make_linked_list(x) if isinstance(x, list) else x for x in args]
-        return args, kwargs
+        return _transform_lists(ListNode.make_linked_list, args, kwargs)
+
+
+class CycleListContext:
+    """lists are made linked lists, and `[values, pos]` pairs, as cases of
+    problems 141 and 142 are given, are made linked lists whose tail links
+    to the node at index `pos`
+    """
+    @staticmethod
+    def transform_args(args, kwargs):
+        return _transform_lists(CycleListContext._make, args, kwargs)
+
+    @staticmethod
+    def _make(x):
+        if len(x) == 2 and isinstance(x[0], list) and type(x[1]) is int:
+            return ListNode.make_cycle_list(*x)
+        return ListNode.make_linked_list(x)
 
 
 class TreeContext:
     @staticmethod
     def transform_args(args, kwargs):
-        args = [TreeNode.make_tree(x) if isinstance(x, list) else x for x in args]
+        return _transform_lists(TreeNode.make_tree, args, kwargs)
+
+
+class LazyLinkedListContext:
+    @staticmethod
+    def transform_args(args, kwargs):
+        return _transform_lists(lambda x: ListArray(x).head, args, kwargs)
+
+
+class LazyTreeContext:
+    @staticmethod
+    def transform_args(args, kwargs):
+        return _transform_lists(lambda x: TreeArray.from_list(x).root,
+                                args, kwargs)
+
+
+class GraphContext:
+    """the graph, the first positional arg or the keyword `node` as problem
+    133 names it, is given as adjacency lists, `[[2, 4], [1, 3], [2, 4],
+    [1, 3]]`, and made a graph of `GraphNode`. Other args are kept, lists
+    of lists like edge lists are not taken for graphs by their shape
+    """
+    @staticmethod
+    def transform_args(args, kwargs):
+        if args:
+            args = [GraphContext._make(args[0]), *args[1:]]
+        elif 'node' in kwargs:
+            kwargs = dict(kwargs, node=GraphContext._make(kwargs['node']))
         return args, kwargs
 
+    @staticmethod
+    def _make(x):
+        if isinstance(x, list):
+            return GraphNode.make_graph(x)
+        return x
+
+
+class NaryTreeContext:
+    @staticmethod
+    def transform_args(args, kwargs):
+        return _transform_lists(NaryNode.make_tree, args, kwargs)
+
+
+class GridContext:
+    """rectangular lists of lists of numbers are made `Grid`s, whose rows
+    are views of one row-major array, other lists are kept
+    """
+    @staticmethod
+    def transform_args(args, kwargs):
+        return _transform_lists(GridContext._make, args, kwargs)
+
+    @staticmethod
+    def _make(x):
+        try:
+            return Grid.from_list(x)
+        except (TypeError, ValueError, OverflowError):
+            # ints beyond 64 bits don't fit the array either
+            return x
+
 
 class Context:
     @staticmethod
@@ -27,11 +110,190 @@ class Context:
         return args, kwargs
 
 
+def _build_linked_list(cls, data):
+    it = iter(data)
+    for item in it:
+        head = tail = cls(item)
+        break
+    else:
+        return None
+    for item in it:
+        node = cls(item)
+        tail.next = node
+        tail = node
+    return head
+
+
+def _build_tree(cls, data):
+    """a tree of `cls` from values in level order, in O(n) time with a
+    queue as wide as the tree
+    """
+    it = iter(data)
+    for val in it:
+        root = cls(val)
+        break
+    else:
+        return None
+    queue = deque([root])
+    for val in it:
+        try:
+            parent = queue.popleft()
+        except IndexError:
+            raise ValueError("bad data for binary tree")
+        if val is not None:
+            node = parent.left = cls(val)
+            queue.append(node)
+        val = next(it, None)
+        if val is not None:
+            node = parent.right = cls(val)
+            queue.append(node)
+    return root
+
+
+class _NodeTable:
+    """`ListNode`s and `TreeNode`s reachable from the added nodes, each
+    kept once however many times it's linked, with links as indexes into
+    the table. Nodes shared between structures, or linked in a cycle, are
+    rebuilt shared, by a loop instead of recursion.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.nodes = []
+        # index of `next` or `left`, and of `right`, -1 for None
+        self.firsts = []
+        self.seconds = []
+
+    def add(self, node):
+        """index of `node`, adding it and the nodes reachable from it"""
+        ids, nodes = self.ids, self.nodes
+        firsts, seconds = self.firsts, self.seconds
+        i = ids.get(id(node))
+        if i is not None:
+            return i
+        i = ids[id(node)] = len(nodes)
+        nodes.append(node)
+        get = ids.get
+
+        def put(child):
+            if child is None:
+                return -1
+            j = get(id(child))
+            if j is None:
+                j = ids[id(child)] = len(nodes)
+                nodes.append(child)
+            return j
+        # nodes past the linked ones are new, their links are put in order
+        n = len(firsts)
+        while n < len(nodes):
+            node = nodes[n]
+            n += 1
+            kind = _kind(node)
+            if kind is _LIST:
+                firsts.append(put(node.next))
+                seconds.append(-1)
+            elif kind is _TREE:
+                firsts.append(put(node.left))
+                seconds.append(put(node.right))
+            else:
+                # kept as it is, pickled with its array
+                firsts.append(-1)
+                seconds.append(-1)
+        return i
+
+    def state(self):
+        """(classes, vals, firsts, seconds) to make the nodes again by
+        `_nodes_of_table`, a node kept as it is has the class None
+        """
+        classes = [None if _kind(node) is None else node.__class__
+                   for node in self.nodes]
+        vals = [node if cls is None else node.val
+                for node, cls in zip(self.nodes, classes)]
+        return classes, vals, self.firsts, self.seconds
+
+
+_LIST, _TREE = 'list', 'tree'
+
+
+def _kind(node):
+    """_LIST or _TREE, None for a node of an array with nothing made after
+    it, which is pickled with the array
+    """
+    if type(node) is ListNode:
+        return _LIST
+    if type(node) is TreeNode:
+        return _TREE
+    if isinstance(node, (LazyListNode, LazyTreeNode)) and node._pristine():
+        return None
+    return _LIST if isinstance(node, ListNode) else _TREE
+
+
+def _nodes_of_table(classes, vals, firsts, seconds):
+    nodes = [val if cls is None else cls(val)
+             for cls, val in zip(classes, vals)]
+    lists = {cls for cls in set(classes) if cls is not None and
+             issubclass(cls, ListNode)}
+    for node, cls, first, second in zip(nodes, classes, firsts, seconds):
+        if second >= 0:
+            node.right = nodes[second]
+        if first < 0:
+            continue
+        if cls in lists:
+            node.next = nodes[first]
+        else:
+            node.left = nodes[first]
+    return nodes
+
+
+def _first_of_table(classes, vals, firsts, seconds):
+    return _nodes_of_table(classes, vals, firsts, seconds)[0]
+
+
+def _reduce_node(node):
+    # pickled as a table of nodes, deep structures don't hit the recursion
+    # limit, and nodes shared in the structure stay shared
+    table = _NodeTable()
+    table.add(node)
+    return _first_of_table, table.state()
+
+
+def _link_cycle(head, n):
+    # find the tail
+    tail = head
+    while tail.next:
+        tail = tail.next
+    # find nth node
+    target, cnt = head, 0
+    while target:
+        if cnt == n:
+            break
+        cnt += 1
+        target = target.next
+
+    # link them
+    tail.next = target
+    return head
+
+
+def _cycle_entry(head, length):
+    """index of the node where a cycle of `length` nodes starts"""
+    tortoise = hare = head
+    for _ in range(length):
+        hare = hare.next
+    pos = 0
+    while tortoise is not hare:
+        tortoise = tortoise.next
+        hare = hare.next
+        pos += 1
+    return pos
+
+
 class ListNode:
+    __slots__ = ('val', 'next')
+
     def __init__(self, x=None):
         self.val = x
         self.next = None
-        self.has_cycle = False
 
     def __iter__(self):
         p = self
@@ -39,18 +301,75 @@ class ListNode:
             yield p.val
             p = p.next
 
+    def cycle(self):
+        """find the cycle by Brent's algorithm, in O(n) time and O(1) memory
+
+        Examples:
+        >>> ListNode.make_cycle_list([3, 2, 0, -4], 1).cycle()
+        (1, 3)
+        >>> ListNode.make_linked_list([1, 2]).cycle()
+        (2, 0)
+
+        Returns:
+            (pos, length), the index of the node the tail links to, as
+            `pos` of LeetCode, and the number of nodes in the cycle. A list
+            of n nodes without a cycle gives (n, 0).
+        """
+        power = length = 1
+        tortoise, hare = self, self.next
+        steps = 1
+        while hare is not tortoise:
+            if hare is None:
+                return steps, 0
+            if power == length:
+                tortoise = hare
+                power *= 2
+                length = 0
+            hare = hare.next
+            length += 1
+            steps += 1
+        return _cycle_entry(self, length), length
+
+    @property
+    def has_cycle(self):
+        return self.cycle()[1] > 0
+
     def __str__(self):
-        if self.has_cycle:
-            return "->".join([str(v) for v in islice(self, 5)]) + '...'
-        else:
-            return "->".join([str(v) for v in self])
+        pos, length = self.cycle()
+        text = "->".join([str(v) for v in islice(self, pos + length)])
+        if length:
+            text += f'->(pos {pos})'
+        return text
 
     def __eq__(self, other):
-        if self.has_cycle:
-            raise TypeError('__eq__ is not supported for linked list who has cycle')
-        if not isinstance(other, self.__class__):
+        """equal values, and cycles starting at the same index"""
+        if not isinstance(other, ListNode):
             return False
-        return all(x == y for x, y in zip_longest(self, other, fillvalue=None))
+        p, q = self, other
+        # Brent's cycle detection on self, along the walk
+        tortoise, power, length = self, 1, 0
+        while p is not None and q is not None:
+            if p.val != q.val:
+                return False
+            p = p.next
+            q = q.next
+            length += 1
+            if p is tortoise:
+                break
+            if power == length:
+                tortoise = p
+                power *= 2
+                length = 0
+        else:
+            return p is None and q is None
+        cycle = self.cycle()
+        if other.cycle() != cycle:
+            return False
+        n = cycle[0] + cycle[1]
+        return all(x == y for x, y in zip(islice(self, n), islice(other, n)))
+
+    def __reduce__(self):
+        return _reduce_node(self)
 
     @staticmethod
     def make_linked_list(data):
@@ -67,15 +386,7 @@ class ListNode:
         Returns:
             the head of the linked list, class `LinkedLinkedListNode`.
         """
-        data = list(data)
-        if len(data) == 0:
-            return None
-        head = tail = ListNode(data[0])
-        for item in data[1:]:
-            node = ListNode(item)
-            tail.next = node
-            tail = node
-        return head
+        return _build_linked_list(ListNode, data)
 
     @staticmethod
     def make_cycle_list(data, n):
@@ -102,27 +413,12 @@ class ListNode:
 
         if n < 0:
             return head
-
-        # find the tail
-        tail = head
-        while tail.next:
-            tail.has_cycle = True
-            tail = tail.next
-        tail.has_cycle = True
-        # find nth node
-        target, cnt = head, 0
-        while target:
-            if cnt == n:
-                break
-            cnt += 1
-            target = target.next
-
-        # link them
-        tail.next = target
-        return head
+        return _link_cycle(head, n)
 
 
 class TreeNode:
+    __slots__ = ('val', 'left', 'right')
+
     def __init__(self, x=None):
         self.val = x
         self.left = None
@@ -132,23 +428,50 @@ class TreeNode:
         return "Tree({})".format("-".join([str(v) for v in self]))
 
     def __iter__(self):
-        remaining_nodes = [self]
+        """values in level order, `None` for missing nodes followed by
+        others, as LeetCode serializes trees
+        """
+        level = [self]
         fillup = 0
-        for node in remaining_nodes:
-            if node is None:
-                fillup += 1
-            else:
-                while fillup > 0:
-                    yield None
-                    fillup -= 1
+        while level:
+            next_level = []
+            append = next_level.append
+            for node in level:
+                if node is None:
+                    fillup += 1
+                    continue
+                if fillup:
+                    for _ in range(fillup):
+                        yield None
+                    fillup = 0
                 yield node.val
-                remaining_nodes.append(node.left)
-                remaining_nodes.append(node.right)
+                append(node.left)
+                append(node.right)
+            level = next_level
 
     def __eq__(self, other):
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, TreeNode):
             return False
-        return all(x == y for x, y in zip_longest(self, other, fillvalue=None))
+        # walk both trees together, a level at a time
+        xs, ys = [self], [other]
+        while xs:
+            next_xs, next_ys = [], []
+            for a, b in zip(xs, ys):
+                if a is None or b is None:
+                    if a is not b:
+                        return False
+                    continue
+                if a.val != b.val:
+                    return False
+                next_xs.append(a.left)
+                next_xs.append(a.right)
+                next_ys.append(b.left)
+                next_ys.append(b.right)
+            xs, ys = next_xs, next_ys
+        return True
+
+    def __reduce__(self):
+        return _reduce_node(self)
 
     @staticmethod
     def make_tree(data):
@@ -170,20 +493,546 @@ class TreeNode:
         Raises:
             ValueError: If the given data can't be made a vliad binary tree.
         """
-        if len(data) < 1:
+        return _build_tree(TreeNode, data)
+
+
+# storage of the attributes overridden by properties of lazy nodes
+_NEXT = ListNode.__dict__['next']
+_LEFT = TreeNode.__dict__['left']
+_RIGHT = TreeNode.__dict__['right']
+
+
+def _slot_or_make(node, slot, make):
+    try:
+        return slot.__get__(node)
+    except AttributeError:  # never accessed
+        child = make()
+        slot.__set__(node, child)
+        return child
+
+
+def _lazy_node(array, index, val):
+    node = array.node(index)
+    node.val = val
+    return node
+
+
+class LazyListNode(ListNode):
+    """a `ListNode` of a `ListArray`, the next node is made when it's first
+    accessed. Made without an array, it's a plain `ListNode`.
+    """
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, x=None, array=None, index=0):
+        self.val = x
+        self._array = array
+        self._index = index
+        if array is None:
+            _NEXT.__set__(self, None)
+
+    @property
+    def next(self):
+        return _slot_or_make(self, _NEXT,
+                             lambda: self._array.node(self._index + 1))
+
+    @next.setter
+    def next(self, node):
+        _NEXT.__set__(self, node)
+
+    def __reduce__(self):
+        if self._pristine():
+            return _lazy_node, (self._array, self._index, self.val)
+        return super().__reduce__()
+
+    def cycle(self):
+        if self._pristine():
+            return len(self._array) - self._index, 0
+        return super().cycle()
+
+    def _pristine(self):
+        """whether no node after it has been made or linked"""
+        try:
+            _NEXT.__get__(self)
+        except AttributeError:
+            return True
+        return False
+
+    def __iter__(self):
+        if not self._pristine():
+            yield from super().__iter__()
+            return
+        # `val` may be changed, the array keeps the original
+        yield self.val
+        yield from islice(self._array.vals, self._index + 1, None)
+
+
+class ListArray:
+    """a linked list kept as a list of values, `ListNode`s are made only
+    when they are visited from `head`
+
+    >>> ll = ListArray([1, 2, 3])
+    >>> print(ll.head.next)
+    2->3
+    """
+    __slots__ = ('vals',)
+
+    def __init__(self, vals):
+        self.vals = list(vals)
+
+    @classmethod
+    def from_linked_list(cls, head):
+        if head is not None and head.has_cycle:
+            raise ValueError('a linked list with a cycle is not supported')
+        return cls(head if head is not None else ())
+
+    @property
+    def head(self):
+        return self.node(0)
+
+    def node(self, index):
+        if index >= len(self.vals):
+            return None
+        return LazyListNode(self.vals[index], self, index)
+
+    def to_linked_list(self):
+        """plain `ListNode`s of all values"""
+        return ListNode.make_linked_list(self.vals)
+
+    def __len__(self):
+        return len(self.vals)
+
+    def __iter__(self):
+        return iter(self.vals)
+
+    def __eq__(self, other):
+        if not isinstance(other, ListArray):
+            return NotImplemented
+        return self.vals == other.vals
+
+
+class LazyTreeNode(TreeNode):
+    """a `TreeNode` of a `TreeArray`, children are made when they are first
+    accessed. Made without an array, it's a plain `TreeNode`.
+    """
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, x=None, array=None, index=0):
+        self.val = x
+        self._array = array
+        self._index = index
+        if array is None:
+            _LEFT.__set__(self, None)
+            _RIGHT.__set__(self, None)
+
+    @property
+    def left(self):
+        return _slot_or_make(
+            self, _LEFT, lambda: self._array.node(self._array.lefts[self._index]))
+
+    @left.setter
+    def left(self, node):
+        _LEFT.__set__(self, node)
+
+    @property
+    def right(self):
+        return _slot_or_make(
+            self, _RIGHT, lambda: self._array.node(self._array.rights[self._index]))
+
+    @right.setter
+    def right(self, node):
+        _RIGHT.__set__(self, node)
+
+    def __reduce__(self):
+        if self._pristine():
+            return _lazy_node, (self._array, self._index, self.val)
+        return super().__reduce__()
+
+    def _pristine(self):
+        """whether none of its children has been made or linked"""
+        for slot in (_LEFT, _RIGHT):
+            try:
+                slot.__get__(self)
+            except AttributeError:
+                continue
+            return False
+        return True
+
+    def __iter__(self):
+        if not self._pristine():
+            yield from super().__iter__()
+            return
+        values = self._array.level_order(self._index)
+        next(values)
+        yield self.val
+        yield from values
+
+    def __eq__(self, other):
+        if (isinstance(other, LazyTreeNode) and self._index == 0 and
+                other._index == 0 and self._pristine() and other._pristine()):
+            return self.val == other.val and self._array == other._array
+        return super().__eq__(other)
+
+
+class TreeArray:
+    """a binary tree kept in parallel arrays: node `i` has the value
+    `vals[i]` and children `lefts[i]` and `rights[i]`, -1 for none. Nodes
+    are numbered in level order and node 0 is the root. `TreeNode`s are
+    made only when they are visited from `root`, so huge inputs are
+    built, hashed and compared without objects per node.
+
+    >>> t = TreeArray.from_list([1, 2, 3, None, 4])
+    >>> list(t.lefts), list(t.rights)
+    ([1, -1, -1, -1], [2, 3, -1, -1])
+    >>> print(t.root.left)
+    Tree(2-None-4)
+    """
+    __slots__ = ('vals', 'lefts', 'rights')
+
+    def __init__(self, vals, lefts, rights):
+        self.vals = vals
+        self.lefts = lefts
+        self.rights = rights
+
+    @classmethod
+    def from_list(cls, data):
+        """like `TreeNode.make_tree`, from values in level order"""
+        vals, lefts, rights = [], array('i'), array('i')
+        it = iter(data)
+        for val in it:
+            vals.append(val)
+            break
+        # children are filled in when the values of their parents are read
+        parent = 0
+        for val in it:
+            if parent >= len(vals):
+                raise ValueError("bad data for binary tree")
+            lefts.append(-1 if val is None else len(vals))
+            if val is not None:
+                vals.append(val)
+            val = next(it, None)
+            rights.append(-1 if val is None else len(vals))
+            if val is not None:
+                vals.append(val)
+            parent += 1
+        lefts.extend([-1] * (len(vals) - len(lefts)))
+        rights.extend([-1] * (len(vals) - len(rights)))
+        return cls(vals, lefts, rights)
+
+    @classmethod
+    def from_tree(cls, root):
+        vals, lefts, rights = [], array('i'), array('i')
+        nodes = [] if root is None else [root]
+        for i, node in enumerate(nodes):
+            vals.append(node.val)
+            for child, children in ((node.left, lefts), (node.right, rights)):
+                if child is None:
+                    children.append(-1)
+                else:
+                    children.append(len(nodes))
+                    nodes.append(child)
+        return cls(vals, lefts, rights)
+
+    @property
+    def root(self):
+        return self.node(0 if self.vals else -1)
+
+    def node(self, index):
+        if index < 0:
             return None
-        root = TreeNode(data[0])
-        queue = deque([root])
-        i = 1
-        while i < len(data):
+        return LazyTreeNode(self.vals[index], self, index)
+
+    def to_tree(self):
+        """plain `TreeNode`s of all nodes"""
+        nodes = [TreeNode(v) for v in self.vals]
+        for node, left, right in zip(nodes, self.lefts, self.rights):
+            if left >= 0:
+                node.left = nodes[left]
+            if right >= 0:
+                node.right = nodes[right]
+        return nodes[0] if nodes else None
+
+    def level_order(self, index=0):
+        """values of the subtree at `index` as `TreeNode.__iter__` yields"""
+        vals = self.vals
+        # items of lists are faster to read than items of arrays
+        lefts, rights = self.lefts.tolist(), self.rights.tolist()
+        remaining = [index]
+        fillup = 0
+        for i in remaining:
+            if i < 0:
+                fillup += 1
+            else:
+                while fillup > 0:
+                    yield None
+                    fillup -= 1
+                yield vals[i]
+                remaining.append(lefts[i])
+                remaining.append(rights[i])
+
+    def __len__(self):
+        return len(self.vals)
+
+    def __eq__(self, other):
+        if not isinstance(other, TreeArray):
+            return NotImplemented
+        # both are numbered in level order
+        return (self.lefts == other.lefts and self.rights == other.rights
+                and self.vals == other.vals)
+
+
+def _graph_nodes(cls, adjacency):
+    """nodes of values 1..n, node i has the neighbors `adjacency[i - 1]`,
+    all nodes are made before any neighbor list
+    """
+    nodes = [cls(i) for i in range(1, len(adjacency) + 1)]
+    get = ([None] + nodes).__getitem__
+    for node, adj in zip(nodes, adjacency):
+        node.neighbors = list(map(get, adj))
+    return nodes
+
+
+def _rebuild_graph(cls, adjacency, val):
+    return _graph_nodes(cls, adjacency)[val - 1]
+
+
+class GraphNode:
+    """an undirected graph node, `Node` of problem 133"""
+    __slots__ = ('val', 'neighbors')
+
+    def __init__(self, val=0, neighbors=None):
+        self.val = val
+        self.neighbors = neighbors if neighbors is not None else []
+
+    def nodes(self):
+        """nodes reachable from this node, in BFS order"""
+        seen = {id(self)}
+        found = [self]
+        for node in found:
+            for nb in node.neighbors:
+                if id(nb) not in seen:
+                    seen.add(id(nb))
+                    found.append(nb)
+        return found
+
+    def to_adjacency(self):
+        """adjacency lists of the values of reachable nodes, as problem 133
+        gives them, values are 1..n and unique
+
+        >>> GraphNode.make_graph([[2, 3], [1], [1]]).to_adjacency()
+        [[2, 3], [1], [1]]
+        """
+        nodes = self.nodes()
+        # nodes not reachable are left without neighbors
+        adjacency = [[] for _ in range(max(node.val for node in nodes))]
+        for node in nodes:
+            adjacency[node.val - 1] = [nb.val for nb in node.neighbors]
+        return adjacency
+
+    def __str__(self):
+        return "Graph({})".format(self.to_adjacency())
+
+    def __eq__(self, other):
+        if not isinstance(other, GraphNode):
+            return False
+        return (self.val == other.val
+                and self.to_adjacency() == other.to_adjacency())
+
+    # nodes are compared by their graphs, but hashed by identity, so they
+    # can still be keys of the `visited` dicts of solutions
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        # pickled as adjacency lists, big graphs don't hit the recursion
+        # limit
+        return _rebuild_graph, (self.__class__, self.to_adjacency(),
+                                self.val)
+
+    @staticmethod
+    def make_graph(adjacency):
+        """make a graph from adjacency lists
+
+        Examples:
+        >>> g = GraphNode.make_graph([[2, 4], [1, 3], [2, 4], [1, 3]])
+        >>> [nb.val for nb in g.neighbors]
+        [2, 4]
+
+        Args:
+            adjacency: neighbors of node i + 1 at index i
+
+        Returns:
+            node 1 of the graph, class `GraphNode`, None if it's empty.
+        """
+        nodes = _graph_nodes(GraphNode, adjacency)
+        return nodes[0] if nodes else None
+
+
+def _build_nary_tree(cls, data):
+    """a tree of `cls` from LeetCode's level order with `None` ending the
+    children of each node, in O(n) time with a queue as wide as the tree
+    """
+    it = iter(data)
+    for val in it:
+        root = cls(val)
+        break
+    else:
+        return None
+    queue = deque([root])
+    children = None
+    for val in it:
+        if val is None:
             try:
-                upper_node = queue.popleft()
+                children = queue.popleft().children
             except IndexError:
-                raise ValueError("bad data for binary tree")
-            for val, child in zip(data[i:i+2], ('left', 'right')):
-                if val is not None:
-                    new_node = TreeNode(int(val))
-                    setattr(upper_node, child, new_node)
-                    queue.append(new_node)
-            i += 2
-        return root
+                raise ValueError("bad data for n-ary tree")
+            continue
+        if children is None:
+            raise ValueError("bad data for n-ary tree")
+        node = cls(val)
+        children.append(node)
+        queue.append(node)
+    return root
+
+
+class NaryNode:
+    """a node of n-ary trees, `Node` of problems 429, 559, 589 and 590"""
+    __slots__ = ('val', 'children')
+
+    def __init__(self, val=None, children=None):
+        self.val = val
+        self.children = children if children is not None else []
+
+    def __iter__(self):
+        """values in level order, each group of children is led by a
+        `None`, as LeetCode serializes n-ary trees
+        """
+        yield self.val
+        level = [self]
+        pending = 0
+        while level:
+            next_level = []
+            for node in level:
+                # Nones closing childless nodes only show up before values
+                pending += 1
+                if node.children:
+                    for _ in range(pending):
+                        yield None
+                    pending = 0
+                    for child in node.children:
+                        yield child.val
+                    next_level.extend(node.children)
+            level = next_level
+
+    def __str__(self):
+        return "NaryTree({})".format("-".join([str(v) for v in self]))
+
+    def __eq__(self, other):
+        if not isinstance(other, NaryNode):
+            return False
+        missing = object()
+        return all(x == y for x, y in zip_longest(self, other,
+                                                  fillvalue=missing))
+
+    # hashed by identity, to be kept in sets and dicts of solutions
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        # pickled as values, deep trees don't hit the recursion limit
+        return _build_nary_tree, (self.__class__, list(self))
+
+    @staticmethod
+    def make_tree(data):
+        """make an n-ary tree from a list
+
+        Examples:
+        >>> t = NaryNode.make_tree([1, None, 3, 2, 4, None, 5, 6])
+        >>> [c.val for c in t.children]
+        [3, 2, 4]
+        >>> list(t)
+        [1, None, 3, 2, 4, None, 5, 6]
+
+        Args:
+            data: values in level order, `None` before the children of
+                  each node
+
+        Returns:
+            the root of the tree, class `NaryNode`.
+
+        Raises:
+            ValueError: If the given data can't be made an n-ary tree.
+        """
+        return _build_nary_tree(NaryNode, data)
+
+
+# typecodes of `Grid` arrays by the types of cells
+_GRID_TYPECODES = {int: 'q', bool: 'q', float: 'd'}
+
+
+class Grid(list):
+    """a matrix kept as one row-major array, items are writable views of
+    its rows. `grid[r][c]`, `len(grid)` and `len(grid[0])` work as on
+    lists of lists, but a row is a `memoryview`, which is never equal to a
+    list, compare `grid[r].tolist()` or the whole grid instead
+
+    >>> g = Grid.from_list([[1, 0], [0, 1]])
+    >>> g[1][0] = 5
+    >>> g.buffer.tolist()
+    [1, 0, 5, 1]
+    >>> g[1] == [5, 1], g[1].tolist() == [5, 1], g == [[1, 0], [5, 1]]
+    (False, True, True)
+    """
+    __slots__ = ('buffer', 'cols')
+
+    def __init__(self, buffer, cols):
+        self.buffer = buffer
+        self.cols = cols
+        view = memoryview(buffer)
+        super().__init__(view[i:i + cols]
+                         for i in range(0, len(buffer), cols or 1))
+
+    @classmethod
+    def from_list(cls, rows, typecode=None):
+        """make a grid of a rectangular list of lists of numbers
+
+        Raises:
+            ValueError: If rows are of different lengths.
+            TypeError: If cells are not numbers.
+        """
+        if not rows or any(type(row) is not list for row in rows):
+            raise ValueError('not a matrix')
+        cols = len(rows[0])
+        if any(len(row) != cols for row in rows):
+            raise ValueError('rows are of different lengths')
+        cells = list(chain.from_iterable(rows))
+        if typecode is None:
+            try:
+                codes = {_GRID_TYPECODES[t] for t in set(map(type, cells))}
+            except KeyError:
+                raise TypeError('cells of a grid should be numbers')
+            typecode = 'd' if 'd' in codes else 'q'
+        grid = cls(array(typecode, cells), cols)
+        if not cols:
+            # keep the number of empty rows
+            grid[:] = [memoryview(grid.buffer)] * len(rows)
+        return grid
+
+    def tolist(self):
+        return [list(row) for row in self]
+
+    def __eq__(self, other):
+        if isinstance(other, Grid):
+            other = other.tolist()
+        if not isinstance(other, list):
+            return NotImplemented
+        return self.tolist() == other
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __str__(self):
+        return "Grid({})".format(self.tolist())
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        return Grid.from_list, (self.tolist(), self.buffer.typecode)
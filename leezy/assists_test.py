@@ -0,0 +1,265 @@
+import copy
+import pickle
+
+import pytest
+
+from .assists import (ListNode, TreeNode, ListArray, TreeArray,
+                      LazyListNode, LazyTreeNode, LazyTreeContext,
+                      LazyLinkedListContext, CycleListContext, TreeContext,
+                      GraphNode, GraphContext, NaryNode, NaryTreeContext,
+                      Grid, GridContext)
+from .fastcopy import fast_copy
+from .fingerprint import fingerprint
+
+
+def test_nodes_are_slotted():
+    for node in (ListNode(1), TreeNode(1)):
+        assert not hasattr(node, '__dict__')
+        with pytest.raises(AttributeError):
+            node.extra = 1
+    root = TreeNode.make_tree([1, None, 2])
+    assert (root.val, root.left, root.right.val) == (1, None, 2)
+
+
+def test_tree_array_is_lazy():
+    data = [3, 9, 20, None, None, 15, 7]
+    tree = TreeArray.from_list(data)
+    assert len(tree) == 5
+    root = tree.root
+    assert isinstance(root, TreeNode) and root._pristine()
+    assert root == TreeNode.make_tree(data)
+    assert TreeNode.make_tree(data) == root
+    assert fingerprint(root) == fingerprint(TreeNode.make_tree(data))
+    # children are made once, on first access
+    right = root.right
+    assert not root._pristine()
+    assert root.right is right and right.left.val == 15
+    assert root == TreeNode.make_tree(data)
+
+
+def test_tree_array_round_trip():
+    data = [1, 2, 3, None, 4, None, 5, 6]
+    tree = TreeArray.from_list(data)
+    assert TreeArray.from_tree(TreeNode.make_tree(data)) == tree
+    assert tree.to_tree() == TreeNode.make_tree(data)
+    assert TreeArray.from_list([]).root is None
+    with pytest.raises(ValueError):
+        TreeArray.from_list([1, None, None, 2])
+
+
+def test_lazy_nodes_are_mutable():
+    root = TreeArray.from_list([1, 2, 3]).root
+    root.val = 10
+    assert list(root) == [10, 2, 3]
+    root.left = None
+    assert list(root) == [10, None, 3]
+
+    head = ListArray([1, 2, 3]).head
+    head.val = 0
+    assert list(head) == [0, 2, 3]
+    head.next.next = None
+    assert str(head) == '0->2'
+
+
+def test_list_array():
+    head = ListArray(range(5)).head
+    assert isinstance(head, ListNode) and head._pristine()
+    assert head == ListNode.make_linked_list(range(5))
+    assert ListNode.make_linked_list(range(5)) == head
+    assert fingerprint(head) == fingerprint(
+        ListNode.make_linked_list(range(5)))
+    assert head.next.next.val == 2 and not head._pristine()
+    assert ListArray.from_linked_list(head) == ListArray(range(5))
+    with pytest.raises(ValueError):
+        ListArray.from_linked_list(ListNode.make_cycle_list([1, 2], 0))
+
+
+def test_copy_lazy_nodes():
+    tree = TreeArray.from_list(list(range(1000)))
+    root = tree.root
+    copied = fast_copy(root)
+    # not visited yet, the copy shares the arrays
+    assert copied is not root and copied._array is tree
+    copied.left.val = -1
+    assert root.left.val == 1
+
+    # visited nodes are copied node by node
+    copied = fast_copy(root)
+    assert copied == root and copied.left is not root.left
+    assert isinstance(copied, LazyTreeNode) and copied._array is None
+
+    head = ListArray([1, 2]).head
+    head.next
+    copied = fast_copy(head)
+    assert isinstance(copied, LazyListNode) and copied == head
+
+
+def test_lazy_contexts():
+    args, _ = LazyTreeContext.transform_args([[1, 2], 3], {})
+    assert isinstance(args[0], LazyTreeNode) and args[1] == 3
+    args, _ = LazyLinkedListContext.transform_args([[1, 2]], {})
+    assert isinstance(args[0], LazyListNode)
+
+
+def degenerate(n):
+    data = [0]
+    for i in range(1, n):
+        data.extend((None, i))
+    return data
+
+
+def test_builders_keep_values():
+    # values are kept as given, not coerced to int
+    root = TreeNode.make_tree(['a', None, 2.5, True])
+    assert list(root) == ['a', None, 2.5, True]
+    assert list(ListNode.make_linked_list(iter('xyz'))) == ['x', 'y', 'z']
+    assert TreeNode.make_tree([]) is None
+    assert ListNode.make_linked_list([]) is None
+    with pytest.raises(ValueError):
+        TreeNode.make_tree([1, None, None, 2])
+
+
+def test_deep_tree_without_recursion():
+    data = degenerate(10 ** 5)
+    root = TreeNode.make_tree(data)
+    assert list(root) == data
+    assert root == TreeNode.make_tree(data)
+    assert root != TreeNode.make_tree(data[:-2])
+    assert pickle.loads(pickle.dumps(root)) == root
+    assert copy.deepcopy(root) == root
+    assert fast_copy(root) == root
+
+
+def test_pickle_linked_lists():
+    head = ListNode.make_linked_list(range(10 ** 5))
+    assert pickle.loads(pickle.dumps(head)) == head
+    cycle = pickle.loads(pickle.dumps(ListNode.make_cycle_list([1, 2, 3], 1)))
+    assert cycle.cycle() == (1, 2) and cycle.next.next.next is cycle.next
+    # nodes shared in a structure stay shared
+    root = TreeNode.make_tree([1, 2])
+    root.right = root.left
+    copied = pickle.loads(pickle.dumps(root))
+    assert copied.left is copied.right and copied == root
+
+
+def test_cycle():
+    assert ListNode(1).cycle() == (1, 0)
+    for n in (1, 2, 3, 10, 100):
+        for pos in range(n):
+            head = ListNode.make_cycle_list(range(n), pos)
+            assert head.cycle() == (pos, n - pos) and head.has_cycle
+    head = ListArray(range(5)).head
+    assert head.cycle() == (5, 0) and not head.has_cycle
+    head.next.next.next.next.next = head.next
+    assert head.cycle() == (1, 4)
+    assert str(ListNode.make_cycle_list([3, 2, 0, -4], 1)) == \
+        '3->2->0->-4->(pos 1)'
+
+
+def test_cycle_equality():
+    def make(values, pos):
+        return ListNode.make_cycle_list(values, pos)
+
+    assert make([3, 2, 0, -4], 1) == make([3, 2, 0, -4], 1)
+    assert make([3, 2, 0, -4], 1) != make([3, 2, 0, -4], 0)
+    assert make([3, 2, 0, -4], 1) != make([3, 2, 0, -5], 1)
+    assert make([3, 2, 0, -4], 1) != ListNode.make_linked_list([3, 2, 0, -4])
+    assert ListNode.make_linked_list([3, 2, 0, -4]) != make([3, 2, 0, -4], 1)
+    # the same walk of values, but different lists
+    assert make([1, 1], 0) != make([1], 0)
+
+    n = 10 ** 5
+    a, b = make(range(n), n // 2), make(range(n), n // 2)
+    assert a == b and fast_copy(a) == a
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a) != fingerprint(make(range(n), n // 2 + 1))
+
+
+def test_cycle_list_context():
+    args, _ = CycleListContext.transform_args([[[3, 2, 0, -4], 1], [1, 2]],
+                                              {})
+    assert args[0] == ListNode.make_cycle_list([3, 2, 0, -4], 1)
+    assert args[1] == ListNode.make_linked_list([1, 2])
+
+
+def test_contexts_transform_kwargs():
+    args, kwargs = TreeContext.transform_args([[1, 2]], {'root': [1, 2],
+                                                         'k': 3})
+    assert args[0] == kwargs['root'] == TreeNode.make_tree([1, 2])
+    assert kwargs['k'] == 3
+
+
+def test_graph():
+    adjacency = [[2, 4], [1, 3], [2, 4], [1, 3]]
+    (node,), kwargs = GraphContext.transform_args([adjacency],
+                                                  {'other': [1, 2]})
+    assert isinstance(node, GraphNode) and kwargs['other'] == [1, 2]
+    assert node.val == 1 and [nb.val for nb in node.neighbors] == [2, 4]
+    assert node.neighbors[0].neighbors[0] is node
+    assert node.to_adjacency() == adjacency
+    assert node == GraphNode.make_graph(adjacency)
+    assert node != GraphNode.make_graph([[2], [1, 3], [2]])
+    assert GraphContext.transform_args([[]], {})[0] == [None]
+    # only the graph is converted, edge lists and empty lists are kept
+    edges = [[0, 1], [1, 2]]
+    (node, kept, empty), _ = GraphContext.transform_args(
+        [adjacency, edges, []], {})
+    assert isinstance(node, GraphNode) and kept == edges and empty == []
+    _, kwargs = GraphContext.transform_args([], {'node': adjacency,
+                                                 'edges': edges})
+    assert kwargs['node'] == node and kwargs['edges'] == edges
+    # hashed by identity, usable as keys of visited dicts
+    seen = {nb: nb.val for nb in node.nodes()}
+    assert seen[node] == 1 and len(seen) == 4
+
+    third = node.neighbors[0].neighbors[1]
+    for copied in (fast_copy(third), pickle.loads(pickle.dumps(third))):
+        assert copied.val == 3 and copied == third
+        assert copied.neighbors[0] is not node.neighbors[0]
+    assert fingerprint(node) == fingerprint(fast_copy(node))
+    assert fingerprint(node) != fingerprint(third)
+
+
+def test_nary_tree():
+    data = [1, None, 2, 3, 4, 5, None, None, 6, 7, None, 8, None, 9, 10,
+            None, None, 11, None, 12, None, 13, None, None, 14]
+    (root,), _ = NaryTreeContext.transform_args([data], {})
+    assert isinstance(root, NaryNode) and list(root) == data
+    assert [c.val for c in root.children] == [2, 3, 4, 5]
+    assert root == NaryNode.make_tree(data)
+    assert root != NaryNode.make_tree(data[:-1])
+    assert {root: 1}[root] == 1 and len(set(root.children)) == 4
+    assert fast_copy(root) == root and copy.deepcopy(root) == root
+    assert NaryNode.make_tree([]) is None
+    with pytest.raises(ValueError):
+        NaryNode.make_tree([1, 2])
+
+    # deep trees are built and compared without recursion
+    deep = [0, None]
+    for i in range(1, 10 ** 5):
+        deep.extend((i, None))
+    deep.pop()
+    root = NaryNode.make_tree(deep)
+    assert list(root) == deep and pickle.loads(pickle.dumps(root)) == root
+
+
+def test_grid():
+    rows = [[1, 0, 1], [0, 1, 0]]
+    (grid, chars), _ = GridContext.transform_args([rows, [['1', '0']]], {})
+    assert isinstance(grid, Grid) and chars == [['1', '0']]
+    assert len(grid) == 2 and len(grid[0]) == 3 and grid == rows
+    grid[1][2] = 7
+    assert grid.buffer.tolist() == [1, 0, 1, 0, 1, 7]
+    assert grid != rows and grid.tolist() == [[1, 0, 1], [0, 1, 7]]
+
+    copied = fast_copy(grid)
+    copied[0][0] = 9
+    assert grid[0][0] == 1 and copied.buffer.typecode == 'q'
+    assert pickle.loads(pickle.dumps(grid)) == grid
+    assert fingerprint(grid) != fingerprint(copied)
+
+    assert Grid.from_list([[0.5, 1]]).buffer.typecode == 'd'
+    assert Grid.from_list([[], []]).tolist() == [[], []]
+    assert grid[0] != [1, 0, 1] and grid[0].tolist() == [1, 0, 1]
+    for bad in ([[1], [2, 3]], [1, 2], [], [[2 ** 70]], [[-2 ** 64]]):
+        assert GridContext.transform_args([bad], {})[0] == [bad]
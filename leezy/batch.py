@@ -0,0 +1,154 @@
+import os
+import json
+import subprocess
+from time import perf_counter
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from leezy.core import TESTS_FAILED_EXIT
+from leezy.history import PROBLEM_DIR_RE
+
+
+# durations of the last runs of problem files, the slowest go first
+TIMINGS_FILE = '.leezy_batch.json'
+
+
+def local_problems(workdir):
+    """map ids of problems under `workdir` to their files, found by the
+    names `leezy pull` gives to folders and files, without the network
+
+    Returns:
+        a dict of int id -> (local id, path), e.g. 1 -> ('001', path)
+    """
+    found = {}
+    try:
+        folders = sorted(Path(workdir).iterdir())
+    except OSError:
+        return found
+    for folder in folders:
+        match = PROBLEM_DIR_RE.match(folder.name)
+        if match is None or not folder.is_dir():
+            continue
+        loc_id = match.group(1)
+        for py_path in sorted(folder.glob(f'{loc_id}_*.py')):
+            found[int(loc_id)] = (loc_id, py_path)
+            break
+    return found
+
+
+def local_problem_path(workdir, loc_id):
+    """the file of problem `loc_id` under `workdir`, None if not pulled"""
+    for py_path in sorted(Path(workdir).glob(f'{loc_id} - */{loc_id}_*.py')):
+        return py_path
+    return None
+
+
+class ProblemRun:
+    def __init__(self, loc_id, py_path):
+        self.loc_id = loc_id
+        self.py_path = py_path
+        self.outcome = 'passed'  # passed, failed, error or timeout
+        self.duration = 0
+        self.output = ''
+
+    def detail(self):
+        title = f' {self.py_path.name} {self.outcome} '
+        return f'{title:_^70}\n{self.output.rstrip()}'
+
+
+class BatchRunner:
+    """run problem files in a bounded pool of processes, the slowest in
+    the last runs first, and summarize their outcomes
+    """
+
+    def __init__(self, workdir, workers=0, timeout=None, env=None):
+        self.timings_file = Path(workdir) / TIMINGS_FILE
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.env = env
+
+    def _load_timings(self):
+        try:
+            with open(self.timings_file, encoding='utf8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_timings(self, runs):
+        timings = self._load_timings()
+        timings.update({r.loc_id: round(r.duration, 3) for r in runs
+                        if r.outcome != 'timeout'})
+        with open(self.timings_file, 'w', encoding='utf8') as f:
+            json.dump(timings, f, indent=0, sort_keys=True)
+
+    def schedule(self, problems):
+        """order (local id, path) pairs by durations of the last runs,
+        longest first. Problems never run go first, they may be slow too
+        """
+        timings = self._load_timings()
+        return sorted(problems,
+                      key=lambda p: -timings.get(p[0], float('inf')))
+
+    def _run_one(self, loc_id, py_path):
+        r = ProblemRun(loc_id, py_path)
+        t1 = perf_counter()
+        try:
+            proc = subprocess.run(['python', str(py_path)],
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT,
+                                  stdin=subprocess.DEVNULL,
+                                  cwd=py_path.parent,
+                                  env=self.env,
+                                  timeout=self.timeout)
+        except subprocess.TimeoutExpired as e:
+            r.outcome = 'timeout'
+            r.output = (e.output or b'').decode('utf8', 'replace')
+            r.output += f'\nTimeout({self.timeout:g}s)'
+        else:
+            r.output = proc.stdout.decode('utf8', 'replace')
+            if proc.returncode == TESTS_FAILED_EXIT:
+                r.outcome = 'failed'
+            elif proc.returncode != 0:
+                r.outcome = 'error'
+        r.duration = perf_counter() - t1
+        return r
+
+    def run(self, problems):
+        """run (local id, path) pairs, print a line as each one finishes
+        and a summary at the end
+
+        Returns:
+            the number of problems which didn't pass
+        """
+        t1 = perf_counter()
+        runs = []
+        width = len(str(len(problems)))
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._run_one, loc_id, py_path)
+                       for loc_id, py_path in self.schedule(problems)]
+            for future in as_completed(futures):
+                r = future.result()
+                runs.append(r)
+                print(f'[{len(runs):>{width}}/{len(problems)}] '
+                      f'{r.py_path.stem:<40} {r.outcome:<7} '
+                      f'{r.duration:.2f}s', flush=True)
+        self._save_timings(runs)
+        self.report(runs, perf_counter() - t1)
+        return sum(1 for r in runs if r.outcome != 'passed')
+
+    def report(self, runs, duration):
+        runs = sorted(runs, key=lambda r: r.loc_id)
+        for r in runs:
+            if r.outcome != 'passed':
+                print(r.detail())
+        slowest = sorted(runs, key=lambda r: -r.duration)[:5]
+        if slowest:
+            print('slowest: ' + ', '.join(f'{r.loc_id} {r.duration:.2f}s'
+                                          for r in slowest))
+        counts = []
+        for outcome in ('failed', 'error', 'timeout', 'passed'):
+            n = sum(1 for r in runs if r.outcome == outcome)
+            if n:
+                plural = 's' if outcome in ('error', 'timeout') and n > 1 else ''
+                counts.append(f'{n} {outcome}{plural}')
+        print(f"{', '.join(counts) or 'no problems'} in {duration:.2f}s")
@@ -0,0 +1,81 @@
+import os
+import json
+
+from leezy.batch import (BatchRunner, TIMINGS_FILE, local_problems,
+                         local_problem_path)
+from leezy.config import PATCH_ENV
+
+
+PROBLEM = '''
+from leezy import Solution, solution
+
+
+class Q(Solution):
+    @solution
+    def inc(self, x):
+        {body}
+
+
+def main():
+    q = Q()
+    q.add_case(q.case(1).assert_equal(2))
+    q.run()
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+
+def make_problem(workdir, loc_id, body):
+    folder = workdir / f'{loc_id} - Problem {loc_id}'
+    folder.mkdir()
+    py_path = folder / f'{loc_id}_problem-{loc_id}.py'
+    py_path.write_text(PROBLEM.format(body=body))
+    return py_path
+
+
+def make_runner(workdir, timeout=30):
+    patches = {'run': {'exit_on_failure': True},
+               'history': {'enabled': False}}
+    env = dict(os.environ, **{PATCH_ENV: json.dumps(patches)})
+    return BatchRunner(workdir, workers=2, timeout=timeout, env=env)
+
+
+def test_local_problems(tmp_path):
+    py_path = make_problem(tmp_path, '001', 'return x + 1')
+    make_problem(tmp_path, '012', 'return x + 1')
+    (tmp_path / 'notes').mkdir()
+    (tmp_path / '003 - Not Pulled').mkdir()
+    found = local_problems(tmp_path)
+    assert sorted(found) == [1, 12]
+    assert found[1] == ('001', py_path)
+    assert local_problem_path(tmp_path, '001') == py_path
+    assert local_problem_path(tmp_path, '003') is None
+
+
+def test_batch_outcomes(tmp_path, capsys):
+    make_problem(tmp_path, '001', 'return x + 1')
+    make_problem(tmp_path, '002', 'return x')
+    # a solution raising fails its case, a broken file is an error
+    make_problem(tmp_path, '003', 'return x').write_text('raise ValueError')
+    make_problem(tmp_path, '004', 'while True: pass')
+    runner = make_runner(tmp_path, timeout=1.5)
+    problems = [local_problems(tmp_path)[k] for k in (1, 2, 3, 4)]
+    assert runner.run(problems) == 3
+    out = capsys.readouterr().out
+    assert '1 failed, 1 error, 1 timeout, 1 passed' in out
+    assert ' 002_problem-002.py failed ' in out
+    assert 'ValueError' in out
+
+    timings = json.loads((tmp_path / TIMINGS_FILE).read_text())
+    # timed out problems are not recorded
+    assert sorted(timings) == ['001', '002', '003']
+
+
+def test_schedule_slowest_first(tmp_path):
+    runner = make_runner(tmp_path)
+    (tmp_path / TIMINGS_FILE).write_text(json.dumps({'001': 0.5,
+                                                     '002': 2.0}))
+    problems = [('001', None), ('002', None), ('003', None)]
+    assert [p[0] for p in runner.schedule(problems)] == ['003', '002', '001']
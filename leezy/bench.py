@@ -0,0 +1,101 @@
+import gc
+from time import perf_counter_ns
+from statistics import median, quantiles
+
+
+# a batch of loops is timed as one sample, keep growing the batch until it
+# takes at least this long so that sub-microsecond solutions are measurable
+BATCH_TARGET_NS = 1_000_000
+
+
+def format_ns(ns):
+    """
+    >>> format_ns(12.3456)
+    '12.3ns'
+    >>> format_ns(1234567)
+    '1.23ms'
+    """
+    for unit, scale in (('ns', 1), ('µs', 1e3), ('ms', 1e6)):
+        if ns < 1000 * scale:
+            return f'{ns / scale:.3g}{unit}'
+    return f'{ns / 1e9:.3g}s'
+
+
+class Stats:
+    """statistics of the time per call of a solution, measured in nanoseconds
+    """
+
+    def __init__(self, samples, loops=1):
+        self.samples = sorted(samples)
+        self.loops = loops
+        self.min = self.samples[0]
+        self.median = median(self.samples)
+        if len(self.samples) > 1:
+            self.q1, _, self.q3 = quantiles(self.samples, n=4)
+        else:
+            self.q1 = self.q3 = self.median
+        self.iqr = self.q3 - self.q1
+
+    def overlaps(self, other):
+        """whether the interquartile ranges of two measurements overlap,
+        which means the difference between them is not convincing
+        """
+        return self.q1 <= other.q3 and other.q1 <= self.q3
+
+    def __str__(self):
+        return (f'min {format_ns(self.min)} med {format_ns(self.median)} '
+                f'iqr {format_ns(self.iqr)}')
+
+
+def _time_batch(call, inputs):
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t1 = perf_counter_ns()
+        for args, kwargs in inputs:
+            output = call(*args, **kwargs)
+        duration = perf_counter_ns() - t1
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return duration, output
+
+
+def autorange(call, make_input):
+    """find a number of loops, in a 1, 2, 5, 10, 20, 50... sequence,
+    that makes a timed batch take at least `BATCH_TARGET_NS`
+    """
+    i = 1
+    while True:
+        for loops in (i, i * 2, i * 5):
+            inputs = [make_input() for _ in range(loops)]
+            duration, _ = _time_batch(call, inputs)
+            if duration >= BATCH_TARGET_NS:
+                return loops
+        i *= 10
+
+
+def benchmark(call, make_input, warmup=1, repeat=7):
+    """measure `call` on fresh inputs, GC is disabled during timed region
+
+    Args:
+        call: the function to be measured
+        make_input: a function returning a fresh (args, kwargs) every time,
+                    making inputs is not included in the measured duration
+        warmup: number of untimed runs before measuring
+        repeat: number of timed samples
+
+    Returns:
+        (output, `Stats`)
+    """
+    output = None
+    for _ in range(warmup):
+        args, kwargs = make_input()
+        output = call(*args, **kwargs)
+    loops = autorange(call, make_input)
+    samples = []
+    for _ in range(max(1, repeat)):
+        inputs = [make_input() for _ in range(loops)]
+        duration, output = _time_batch(call, inputs)
+        samples.append(duration / loops)
+    return output, Stats(samples, loops)
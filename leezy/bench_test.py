@@ -0,0 +1,24 @@
+from .bench import Stats, benchmark, format_ns
+
+
+def test_stats():
+    stats = Stats([5, 1, 3, 2, 4])
+    assert stats.min == 1
+    assert stats.median == 3
+    assert stats.iqr == stats.q3 - stats.q1 > 0
+    assert stats.overlaps(Stats([4, 5, 6]))
+    assert not stats.overlaps(Stats([100, 101, 102]))
+
+
+def test_format_ns():
+    assert format_ns(999) == '999ns'
+    assert format_ns(1500) == '1.5µs'
+    assert format_ns(2.5e9) == '2.5s'
+
+
+def test_benchmark_batches_fast_calls():
+    output, stats = benchmark(lambda x: x * 2, lambda: ([21], {}),
+                              warmup=2, repeat=3)
+    assert output == 42
+    assert len(stats.samples) == 3
+    assert stats.loops > 1
@@ -0,0 +1,156 @@
+import sys
+import pickle
+import inspect
+from hashlib import blake2b
+
+
+# bump it when the layout of cached fields changes
+CACHE_VERSION = 1
+
+
+def _feed_code(h, code):
+    """feed the normalised bytecode of `code` into `h`, line numbers and
+    file names are left out, so moving a function doesn't change its hash
+    """
+    h.update(code.co_code)
+    h.update(repr((code.co_names, code.co_varnames, code.co_freevars,
+                   code.co_argcount, code.co_kwonlyargcount,
+                   code.co_flags)).encode('utf8'))
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _feed_code(h, const)
+        else:
+            h.update(repr(const).encode('utf8'))
+
+
+def _names(code):
+    """global and attribute names used by `code` and its nested functions"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _names(const)
+    return names
+
+
+def _helpers(func, cls):
+    """functions and classes `func` may call: methods of `cls` reached by
+    `self.name`, and functions and classes defined in the problem file
+    """
+    module = func.__module__
+    found = []
+    for name in sorted(_names(func.__code__)):
+        obj = cls.__dict__.get(name)
+        if obj is None:
+            obj = func.__globals__.get(name)
+            if getattr(obj, '__module__', None) != module:
+                continue
+        obj = getattr(obj, '__func__', obj)  # staticmethod and classmethod
+        if inspect.isfunction(obj) or inspect.isclass(obj):
+            found.append(obj)
+    return found
+
+
+def _constants(func, cls):
+    """(name, repr) of the other globals of the problem file and class
+    attributes `func` uses, e.g. `MOD = 10 ** 9 + 7` or a table of
+    directions, so editing them changes the hash. Modules, and objects
+    imported from other modules, are left out
+    """
+    module = func.__module__
+    found = []
+    for name in sorted(_names(func.__code__)):
+        if name in cls.__dict__:
+            obj = cls.__dict__[name]
+        elif name in func.__globals__:
+            obj = func.__globals__[name]
+        else:
+            continue
+        if inspect.ismodule(obj) or inspect.isroutine(obj) or \
+                inspect.isclass(obj) or isinstance(obj, (staticmethod,
+                                                         classmethod,
+                                                         property)):
+            continue
+        if getattr(obj, '__module__', module) != module:
+            continue
+        found.append((name, repr(obj)))
+    return found
+
+
+def solution_hash(func, cls):
+    """hash of the bytecode of `func` and every helper it reaches"""
+    h = blake2b(digest_size=16)
+    h.update(repr(sys.version_info[:2]).encode('utf8'))
+    visited = set()
+    stack = [func]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in visited:
+            continue
+        visited.add(id(obj))
+        if inspect.isclass(obj):
+            h.update(obj.__qualname__.encode('utf8'))
+            stack.extend(v for v in vars(obj).values()
+                         if inspect.isfunction(v))
+            continue
+        h.update(obj.__qualname__.encode('utf8'))
+        h.update(repr(obj.__defaults__).encode('utf8'))
+        _feed_code(h, obj.__code__)
+        h.update(repr(_constants(obj, cls)).encode('utf8'))
+        stack.extend(_helpers(obj, cls))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """fields of `ResultUnit` of (solution, case) pairs on disk, keyed by
+    `solution_hash` and the fingerprint of the case. Fields are kept
+    pickled until they are used.
+
+    Only entries used or added since loading are saved, so entries of
+    edited solutions and removed cases don't pile up.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.used = {}
+        try:
+            with open(path, 'rb') as f:
+                version, entries = pickle.load(f)
+            if version == CACHE_VERSION:
+                self.entries = entries
+        except (OSError, EOFError, ValueError, TypeError,
+                AttributeError, ImportError, pickle.UnpicklingError):
+            pass
+
+    @staticmethod
+    def key(func_hash, case_fp):
+        return f'{func_hash}:{case_fp}'
+
+    def get(self, key):
+        data = self.entries.get(key)
+        if data is None:
+            return None
+        try:
+            fields = pickle.loads(data)
+        except Exception:
+            # e.g. a class of the output is renamed in the problem file
+            return None
+        self.used[key] = data
+        return fields
+
+    def put(self, key, fields):
+        try:
+            data = pickle.dumps(fields, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError,
+                RecursionError):
+            # an output which can't be pickled is not cached
+            return
+        self.used[key] = data
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump((CACHE_VERSION, self.used), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.path)
@@ -0,0 +1,96 @@
+import textwrap
+
+from leezy.cache import ResultCache, solution_hash
+
+
+def load(source, first_line=1):
+    namespace = {'__name__': 'problem'}
+    padding = '\n' * (first_line - 1)
+    exec(compile(padding + textwrap.dedent(source), 'problem.py', 'exec'),
+         namespace)
+    cls = namespace['Q']
+    return {name: solution_hash(f, cls) for name, f in vars(cls).items()
+            if callable(f) and not name.startswith('_')}
+
+
+SOURCE = '''
+def helper(x):
+    return x + {inc}
+
+class Q:
+    def by_helper(self, x):
+        return helper(x)
+
+    def by_method(self, x):
+        return self._twice(x)
+
+    def alone(self, x):
+        return x
+
+    def _twice(self, x):
+        return x * {times}
+'''
+
+
+def test_solution_hash_follows_helpers():
+    base = load(SOURCE.format(inc=1, times=2))
+    assert load(SOURCE.format(inc=1, times=2), first_line=20) == base
+    inc = load(SOURCE.format(inc=2, times=2))
+    assert inc['by_helper'] != base['by_helper']
+    assert inc['by_method'] == base['by_method']
+    assert inc['alone'] == base['alone']
+    times = load(SOURCE.format(inc=1, times=3))
+    assert times['by_method'] != base['by_method']
+    assert times['by_helper'] == base['by_helper']
+
+
+CONSTANTS = '''
+import math
+MOD = {mod}
+DIRS = [(0, 1), (1, 0)]
+
+def helper(x):
+    return x % MOD
+
+class Q:
+    LIMIT = {limit}
+
+    def by_helper(self, x):
+        return helper(x)
+
+    def by_table(self, x):
+        return [x + dx for dx, _ in DIRS if x < self.LIMIT]
+
+    def by_module(self, x):
+        return math.gcd(x, 6)
+'''
+
+
+def test_solution_hash_follows_constants():
+    base = load(CONSTANTS.format(mod=7, limit=10))
+    assert load(CONSTANTS.format(mod=7, limit=10)) == base
+    mod = load(CONSTANTS.format(mod=11, limit=10))
+    assert mod['by_helper'] != base['by_helper']
+    assert mod['by_table'] == base['by_table']
+    limit = load(CONSTANTS.format(mod=7, limit=20))
+    assert limit['by_table'] != base['by_table']
+    assert limit['by_module'] == base['by_module']
+    table = load(CONSTANTS.format(mod=7, limit=10).replace('(1, 0)', '(2, 0)'))
+    assert table['by_table'] != base['by_table']
+
+
+def test_result_cache_keeps_used_entries(tmp_path):
+    path = tmp_path / 'Q.results.pickle'
+    cache = ResultCache(path)
+    cache.put('a', {'output': [1, 2]})
+    cache.put('b', {'output': (x for x in [])})  # not picklable
+    cache.save()
+
+    cache = ResultCache(path)
+    assert cache.get('a') == {'output': [1, 2]}
+    assert cache.get('b') is None
+    cache.save()
+    cache = ResultCache(path)
+    assert set(cache.entries) == {'a'}
+    ResultCache(path).save()
+    assert ResultCache(path).entries == {}
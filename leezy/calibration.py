@@ -0,0 +1,209 @@
+import re
+import json
+from math import exp, log, sqrt
+from pathlib import Path
+from datetime import datetime
+
+from leezy.history import History, machine_info
+
+
+CALIBRATION_FILE = '.leezy_calibration.jsonl'
+
+# spread of log runtimes assumed when there are too few samples to
+# estimate it, and the least spread reported
+DEFAULT_SPREAD = log(2)
+MIN_SPREAD = log(1.2)
+
+RUNTIME_RE = re.compile(r'([\d.]+)\s*ms')
+
+
+def parse_runtime(text):
+    """milliseconds in `status_runtime` of a submission, None if unknown
+
+    >>> parse_runtime('40 ms')
+    40.0
+    >>> parse_runtime('N/A') is None
+    True
+    """
+    match = RUNTIME_RE.search(str(text))
+    return float(match.group(1)) if match else None
+
+
+def local_timing(history, problem_id, solution, since):
+    """total seconds of `solution` over the cases of a run recorded in
+    `history` since the ISO time `since`, and the number of cases
+    """
+    medians = {}
+    for record in history.load(problem_id):
+        if record['solution'] == solution and record['time'] >= since:
+            medians[record['case']] = record['median']
+    if not medians:
+        return None, 0
+    return sum(medians.values()), len(medians)
+
+
+class Fit:
+    """log(online ms) = intercept + slope * log(local seconds), with the
+    standard deviation `spread` of residuals
+    """
+
+    def __init__(self, intercept, slope, spread, n):
+        self.intercept = intercept
+        self.slope = slope
+        self.spread = spread
+        self.n = n
+
+    @classmethod
+    def from_samples(cls, xs, ys):
+        n = len(xs)
+        mx, my = sum(xs) / n, sum(ys) / n
+        var = sum((x - mx) ** 2 for x in xs)
+        slope = 1.0
+        if n >= 3 and var > 0:
+            slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var
+        if slope <= 0:
+            # noise of few samples, fall back to a constant ratio
+            slope = 1.0
+        intercept = my - slope * mx
+        dof = n - 2 if slope != 1.0 else n - 1
+        if dof > 0:
+            residuals = [y - intercept - slope * x for x, y in zip(xs, ys)]
+            spread = sqrt(sum(r * r for r in residuals) / dof)
+        else:
+            spread = DEFAULT_SPREAD
+        return cls(intercept, slope, max(spread, MIN_SPREAD), n)
+
+    def predict(self, local):
+        """predicted online runtime in ms, and the band of one spread"""
+        mid = exp(self.intercept + self.slope * log(local))
+        return mid, mid * exp(-self.spread), mid * exp(self.spread)
+
+
+def interpolate_percentile(points, runtime):
+    """percentile of `runtime` by linear interpolation between (runtime,
+    percentile) points, clamped at the ends
+
+    >>> interpolate_percentile([(40, 90), (80, 50)], 60)
+    70.0
+    >>> interpolate_percentile([(40, 90), (80, 50)], 20)
+    90
+    """
+    points = sorted(points)
+    if runtime <= points[0][0]:
+        return points[0][1]
+    if runtime >= points[-1][0]:
+        return points[-1][1]
+    for (r1, p1), (r2, p2) in zip(points, points[1:]):
+        if r1 <= runtime <= r2:
+            if r2 == r1:
+                return max(p1, p2)
+            return p1 + (p2 - p1) * (runtime - r1) / (r2 - r1)
+
+
+class Calibration:
+    """accepted submissions with their `status_runtime` and
+    `runtime_percentile`, next to local timings of the same solution on
+    the local cases, appended to a JSON Lines file in workdir
+    """
+
+    def __init__(self, workdir):
+        self.workdir = Path(workdir)
+        self.path = self.workdir / CALIBRATION_FILE
+
+    def load(self):
+        try:
+            f = open(self.path, encoding='utf8')
+        except FileNotFoundError:
+            return []
+        records = []
+        with f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def append(self, record):
+        with open(self.path, 'a', encoding='utf8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def record(self, problem_id, solution, local, n_cases, data):
+        """append an accepted submission, `data` is the checked result of
+        the submission, return False if its runtime is unknown
+        """
+        runtime = parse_runtime(data.get('status_runtime'))
+        if runtime is None or not local or runtime <= 0:
+            return False
+        self.append({
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'problem': problem_id,
+            'solution': solution,
+            'local': local,
+            'cases': n_cases,
+            'runtime': runtime,
+            'percentile': data.get('runtime_percentile'),
+            'machine': machine_info()
+        })
+        return True
+
+    def fit(self):
+        """fit records of this machine, or of all machines if there are
+        none, return None if there are no records
+        """
+        records = self.load()
+        machine = machine_info()
+        same = [r for r in records if r['machine'] == machine]
+        records = same or records
+        if not records:
+            return None
+        xs = [log(r['local']) for r in records]
+        ys = [log(r['runtime']) for r in records]
+        return Fit.from_samples(xs, ys)
+
+    def percentile_band(self, problem_id, low, high):
+        """percentiles of runtimes `low` and `high` among accepted
+        submissions of the problem, None if it has none
+        """
+        points = [(r['runtime'], r['percentile']) for r in self.load()
+                  if r['problem'] == problem_id
+                  and r.get('percentile') is not None]
+        if not points:
+            return None
+        return (interpolate_percentile(points, high),
+                interpolate_percentile(points, low))
+
+    def describe(self, problem_id, local):
+        """a line predicting the online runtime of a solution taking
+        `local` seconds over the local cases
+        """
+        fit = self.fit()
+        if fit is None:
+            return ('no prediction yet, it needs accepted submissions '
+                    'submitted by leezy')
+        mid, low, high = fit.predict(local)
+        plural = 's' if fit.n > 1 else ''
+        text = (f'predicted runtime: {mid:.0f} ms ({low:.0f}-{high:.0f} ms, '
+                f'fitted on {fit.n} submission{plural})')
+        band = self.percentile_band(problem_id, low, high)
+        if band is not None:
+            text += f', faster than {band[0]:.0f}%-{band[1]:.0f}%'
+        return text
+
+
+def measure(py_path, problem_id, solution, env, timeout=None):
+    """benchmark the problem file in a child process, return the total
+    seconds of `solution` over the local cases and the number of cases,
+    (None, 0) if it takes longer than `timeout` seconds
+    """
+    import subprocess
+    since = datetime.now().isoformat(timespec='seconds')
+    try:
+        subprocess.run(['python', str(py_path)], cwd=py_path.parent,
+                       env=env, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+                       timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, 0
+    history = History(py_path.parent.parent)
+    return local_timing(history, problem_id, solution, since)
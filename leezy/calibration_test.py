@@ -0,0 +1,127 @@
+import os
+import json
+from math import log
+
+import pytest
+
+from leezy.calibration import (Calibration, Fit, interpolate_percentile,
+                               local_timing, measure, parse_runtime)
+from leezy.config import PATCH_ENV
+from leezy.history import History, HISTORY_FILE
+
+
+def test_parse_runtime():
+    assert parse_runtime('40 ms') == 40.0
+    assert parse_runtime('1.5ms') == 1.5
+    assert parse_runtime('N/A') is None
+    assert parse_runtime(None) is None
+
+
+def test_fit_power_law():
+    # online = 3000 * local ** 0.8, exactly
+    locals_ = [1e-4, 3e-4, 1e-3, 5e-3]
+    xs = [log(x) for x in locals_]
+    ys = [log(3000) + 0.8 * x for x in xs]
+    fit = Fit.from_samples(xs, ys)
+    assert fit.slope == pytest.approx(0.8)
+    mid, low, high = fit.predict(2e-3)
+    assert mid == pytest.approx(3000 * 2e-3 ** 0.8)
+    assert low < mid < high
+
+
+def test_fit_few_samples_uses_ratio():
+    fit = Fit.from_samples([log(0.001)], [log(40)])
+    assert fit.slope == 1.0
+    assert fit.predict(0.002)[0] == pytest.approx(80)
+
+
+def test_interpolate_percentile():
+    points = [(80, 50), (40, 90), (60, 70)]
+    assert interpolate_percentile(points, 50) == pytest.approx(80)
+    assert interpolate_percentile(points, 10) == 90
+    assert interpolate_percentile(points, 100) == 50
+
+
+def accepted(runtime, percentile):
+    return {'status_code': 10, 'status_runtime': f'{runtime} ms',
+            'runtime_percentile': percentile}
+
+
+def test_record_and_describe(tmp_path):
+    calibration = Calibration(tmp_path)
+    assert 'no prediction yet' in calibration.describe('001', 0.001)
+    assert calibration.record('001', 'twoSum', 0.001, 3, accepted(40, 90))
+    assert calibration.record('001', 'hashed', 0.002, 3, accepted(80, 50))
+    assert not calibration.record('001', 'x', 0.002, 3,
+                                  {'status_runtime': 'N/A'})
+    assert len(calibration.load()) == 2
+
+    text = calibration.describe('001', 0.0015)
+    assert text.startswith('predicted runtime: 60 ms')
+    assert 'fitted on 2 submissions' in text
+    assert 'faster than' in text
+    # no percentiles of another problem are known
+    assert 'faster than' not in calibration.describe('002', 0.0015)
+
+
+def test_local_timing(tmp_path):
+    lines = []
+    for time, case, median in [('2020-01-01T00:00:00', 'a', 1.0),
+                               ('2020-01-02T00:00:00', 'a', 0.002),
+                               ('2020-01-02T00:00:00', 'b', 0.003)]:
+        lines.append({'time': time, 'problem': '001', 'solution': 'f',
+                      'case': case, 'median': median})
+    lines.append(dict(lines[-1], solution='g'))
+    (tmp_path / HISTORY_FILE).write_text(
+        ''.join(json.dumps(x) + '\n' for x in lines))
+    history = History(tmp_path)
+    total, n = local_timing(history, '001', 'f', '2020-01-02T00:00:00')
+    assert total == pytest.approx(0.005) and n == 2
+    since = '2021-01-01T00:00:00'
+    assert local_timing(history, '001', 'f', since) == (None, 0)
+
+
+PROBLEM = '''
+import time
+
+from leezy import Solution, solution
+
+
+class Q(Solution):
+    @solution
+    def f(self, x):
+        return sum(range(x))
+
+    @solution
+    def g(self, x):
+        time.sleep(2)
+        return sum(range(x))
+
+
+def main():
+    q = Q()
+    q.add_case(q.case(100))
+    q.add_case(q.case(1000))
+    q.run()
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+
+def test_measure(tmp_path):
+    folder = tmp_path / '001 - Q'
+    folder.mkdir()
+    py_path = folder / '001_q.py'
+    py_path.write_text(PROBLEM)
+    patches = {'run': {'bench': True, 'cache': False, 'only': 'f'},
+               'bench': {'repeat': 3}, 'history': {'enabled': True}}
+    env = dict(os.environ, **{PATCH_ENV: json.dumps(patches)})
+    total, n = measure(py_path, '001', 'f', env, timeout=30)
+    assert n == 2 and 0 < total < 1
+    # the slow solution isn't benchmarked along with `f`
+    assert measure(py_path, '001', 'g', env) == (None, 0)
+    patches['run']['only'] = 'g'
+    env[PATCH_ENV] = json.dumps(patches)
+    assert measure(py_path, '001', 'g', env, timeout=0.5) == (None, 0)
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from leezy.assists import TreeContext, TreeNode
+from leezy.casefile import read_cases, cache_path, load_binary
+from leezy import core
+from leezy.core import Solution, solution
+from leezy.errors import CaseFileError
+
+
+def write_lines(path, items):
+    path.write_text('\n'.join(json.dumps(x) for x in items) + '\n',
+                    encoding='utf8')
+
+
+def test_read_jsonl(tmp_path):
+    path = tmp_path / 'cases.jsonl'
+    write_lines(path, [
+        [[1, 2, 3], 4],
+        {'args': [[5]], 'kwargs': {'k': 1}, 'expected': None},
+    ])
+    assert read_cases(path, cache=False) == [
+        ([[1, 2, 3], 4], {}, False, None),
+        ([[5]], {'k': 1}, True, None),
+    ]
+
+
+def test_read_leetcode_testcases(tmp_path):
+    path = tmp_path / 'cases.txt'
+    write_lines(path, [[2, 7, 11, 15], 9, [3, 2, 4], 6])
+    assert read_cases(path, n_args=2, cache=False) == [
+        ([[2, 7, 11, 15], 9], {}, False, None),
+        ([[3, 2, 4], 6], {}, False, None),
+    ]
+    with pytest.raises(CaseFileError):
+        read_cases(path, n_args=3, cache=False)
+
+
+def test_binary_cache(tmp_path):
+    path = tmp_path / 'cases.jsonl'
+    big = list(range(-50000, 50000))
+    write_lines(path, [[big, [0.5] * 100, [2 ** 70] * 100, 'abc', None]])
+    parsed = read_cases(path, cache=False)
+    assert read_cases(path) == parsed
+    cached = cache_path(path, 1)
+    assert cached.is_file()
+    # the array is stored raw, not in the pickled header
+    assert cached.stat().st_size < len(big) * 8 + 4096
+    assert load_binary(cached) == parsed
+
+    # a truncated cache is a miss, it's made again
+    data = cached.read_bytes()
+    for size in (0, 4, 20, len(data) // 2, len(data) - 1):
+        cached.write_bytes(data[:size])
+        with pytest.raises(CaseFileError):
+            load_binary(cached)
+        assert read_cases(path) == parsed
+        assert cached.read_bytes() == data
+    # so is a header partly written
+    cached.write_bytes(data[:20] + bytes(len(data) - 20))
+    assert read_cases(path) == parsed
+
+    # a changed file is parsed again, the stale cache is removed
+    write_lines(path, [[[1]]])
+    assert read_cases(path) == [([[1]], {}, False, None)]
+    assert not cached.exists()
+
+
+class QTree(Solution):
+    @solution
+    def depth(self, root, extra):
+        def go(node):
+            return 0 if node is None else 1 + max(go(node.left),
+                                                  go(node.right))
+        return go(root) + extra
+
+
+def test_load_cases_with_context(tmp_path, monkeypatch):
+    monkeypatch.setattr(QTree, '_problem_dir', lambda self: tmp_path)
+    write_lines(tmp_path / 'cases.txt', [[1, 2, 3, 4], 0, [1], 10])
+    q = QTree()
+    q.set_context(TreeContext)
+    q.load_cases('cases.txt')
+    assert len(q.nontest_cases) == 2
+    root, extra = q.nontest_cases[0].args
+    assert isinstance(root, TreeNode) and extra == 0
+
+    write_lines(tmp_path / 'tests.jsonl',
+                [{'args': [[1, 2, None, 3], 1], 'expected': 4}])
+    q.load_cases('tests.jsonl')
+    case = q.test_cases[0]
+    assert case.test_kind() == core.TestKind.Output
+    assert q.depth(*case.args) == case.assert_output
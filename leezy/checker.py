@@ -0,0 +1,130 @@
+import json
+import traceback
+from time import perf_counter
+from textwrap import shorten
+
+from leezy.core import TestKind
+from leezy.fastcopy import copy_args
+from leezy.fingerprint import fingerprint
+
+
+class CaseResult:
+    def __init__(self, func_name, case_num, case):
+        self.func_name = func_name
+        self.case_num = case_num
+        self.case = case
+        self.output = None
+        self.outcome = 'passed'  # passed, failed or error
+        self.error = ''
+
+    def mark(self):
+        return {'passed': '.', 'failed': 'F', 'error': 'E'}[self.outcome]
+
+    def detail(self):
+        title = f' {self.func_name} case {self.case_num} '
+        lines = [f'{title:_^70}', str(self.case)]
+        if self.outcome == 'error':
+            lines.append(self.error)
+        elif self.case.test_kind() == TestKind.Output:
+            lines.append(f'expected: {shorten(str(self.case.assert_output), 200)}')
+            lines.append(f'  output: {shorten(str(self.output), 200)}')
+        else:
+            fn = getattr(self.case.assert_fn, '__name__', 'assert_fn')
+            lines.append(f'{fn}(output) is falsy, '
+                         f'output: {shorten(str(self.output), 200)}')
+        return '\n'.join(lines)
+
+
+class Checker:
+    """run test cases of a `Solution` in process and report like pytest
+
+    Cases failed in the last run are run first, the record of failures is
+    kept in `failure_file`.
+    """
+
+    def __init__(self, q, failure_file=None):
+        self.q = q
+        self.failure_file = failure_file
+        self.results = []
+
+    def _case_key(self, func_name, case):
+        return func_name + ':' + fingerprint((case.args, case.kwargs))
+
+    def _load_failures(self):
+        if self.failure_file is None:
+            return set()
+        try:
+            with open(self.failure_file, encoding='utf8') as f:
+                return set(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return set()
+
+    def _save_failures(self, failures):
+        if self.failure_file is None:
+            return
+        if not failures:
+            if self.failure_file.exists():
+                self.failure_file.unlink()
+            return
+        self.failure_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.failure_file, 'w', encoding='utf8') as f:
+            json.dump(sorted(failures), f)
+
+    def _plan(self):
+        last_failures = self._load_failures()
+        plan = []
+        for i, case in enumerate(self.q.test_cases):
+            for func in self.q.solutions:
+                key = self._case_key(func.__name__, case)
+                plan.append((key not in last_failures, i, func, case, key))
+        # stable sort, failed ones go first
+        plan.sort(key=lambda item: item[0])
+        return plan
+
+    def _check(self, func, case_num, case):
+        r = CaseResult(func.__name__, case_num, case)
+        args, kwargs = copy_args(case.args, case.kwargs)
+        try:
+            r.output = func.__call__(self.q, *args, **kwargs)
+            if case.test_kind() == TestKind.Output:
+                ok = r.output == case.assert_output
+            else:
+                ok = case.assert_fn(r.output)
+        except Exception:
+            r.outcome = 'error'
+            r.error = traceback.format_exc(limit=-3)
+            return r
+        if not ok:
+            r.outcome = 'failed'
+        return r
+
+    def run(self):
+        """run all test cases, print a summary, return the number of
+        failed and errored cases
+        """
+        t1 = perf_counter()
+        failures = set()
+        marks = []
+        for _, case_num, func, case, key in self._plan():
+            r = self._check(func, case_num, case)
+            self.results.append(r)
+            marks.append(r.mark())
+            if r.outcome != 'passed':
+                failures.add(key)
+        duration = perf_counter() - t1
+        self._save_failures(failures)
+        self.report(''.join(marks), duration)
+        return len(failures)
+
+    def report(self, marks, duration):
+        print(marks)
+        bad = [r for r in self.results if r.outcome != 'passed']
+        for r in bad:
+            print(r.detail())
+        counts = []
+        for outcome in ('failed', 'error', 'passed'):
+            n = sum(1 for r in self.results if r.outcome == outcome)
+            if n:
+                plural = 's' if outcome == 'error' and n > 1 else ''
+                counts.append(f'{n} {outcome}{plural}')
+        print(f"{', '.join(counts)} in {duration:.2f}s")
@@ -0,0 +1,45 @@
+from leezy.core import Solution, solution
+from leezy.checker import Checker
+
+
+class QDouble(Solution):
+    @solution
+    def double(self, x):
+        return x * 2
+
+    @solution
+    def double_wrong(self, x):
+        return x * 2 if x < 3 else x + 2
+
+
+def make_q():
+    q = QDouble()
+    q.add_case(q.case(1).assert_equal(2))
+    q.add_case(q.case(5).assert_equal(10))
+    q.add_case(q.case(4).assert_true_with(lambda out: out % 4 == 0))
+    q.add_case(q.case(None).assert_equal(0))
+    return q
+
+
+def test_checker_report(capsys):
+    assert Checker(make_q()).run() == 4
+    out = capsys.readouterr().out
+    lines = out.splitlines()
+    assert lines[0] == '...F.FEE'
+    assert 'expected: 10' in out and 'output: 7' in out
+    assert 'TypeError' in out
+    assert lines[-1].startswith('2 failed, 2 errors, 4 passed in')
+
+
+def test_checker_runs_last_failures_first(tmp_path, capsys):
+    failure_file = tmp_path / 'failures.json'
+    assert Checker(make_q(), failure_file).run() == 4
+    assert failure_file.exists()
+    capsys.readouterr()
+
+    checker = Checker(make_q(), failure_file)
+    checker.run()
+    order = [(r.func_name, r.case_num) for r in checker.results]
+    assert order[:4] == [('double_wrong', 1), ('double_wrong', 2),
+                         ('double', 3), ('double_wrong', 3)]
+    assert capsys.readouterr().out.splitlines()[0] == 'FFEE....'
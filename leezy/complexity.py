@@ -0,0 +1,146 @@
+from math import log, log2, isfinite, ldexp
+
+
+def _exp2(n):
+    return ldexp(1.0, n) if n < 1024 else float('inf')
+
+
+# ordered from the simplest to the most complex, with the least log-log
+# exponent measured values should show to be taken for the class
+COMPLEXITIES = [
+    ('O(1)', lambda n: 1.0, 0.0),
+    ('O(log n)', lambda n: log2(n), 0.0),
+    ('O(n)', lambda n: float(n), 0.5),
+    ('O(n log n)', lambda n: n * log2(n), 0.5),
+    ('O(n²)', lambda n: float(n * n), 0.5),
+    ('O(2ⁿ)', _exp2, 0.5),
+]
+
+# the growth over the measured sizes should be this many times the noise
+SIGNIFICANCE = 4
+
+
+def _weighted_fit(xs, ys):
+    """fit y = a + b*x, minimizing the relative error sum((y' - y) / y)^2
+
+    Returns:
+        (a, b, residual)
+    """
+    ws = [1 / (y * y) for y in ys]
+    sw = sum(ws)
+    sx = sum(w * x for w, x in zip(ws, xs))
+    sy = sum(w * y for w, y in zip(ws, ys))
+    sxx = sum(w * x * x for w, x in zip(ws, xs))
+    sxy = sum(w * x * y for w, x, y in zip(ws, xs, ys))
+    det = sw * sxx - sx * sx
+    if det <= 0 or not isfinite(det):
+        a, b = sy / sw, 0.0
+    else:
+        b = (sw * sxy - sx * sy) / det
+        a = (sy - b * sx) / sw
+    residual = sum(((a + b * x - y) / y) ** 2 for x, y in zip(xs, ys))
+    return a, b, residual
+
+
+def best_fit(sizes, values):
+    """find the complexity class that fits `values` measured on `sizes` best.
+
+    A more complex class is preferred only when it reduces the residual by
+    more than 10%, and its growth over the measured sizes stands out of the
+    noise, so that flat or noisy values are not over-fitted.
+
+    >>> best_fit([8, 16, 32, 64, 128], [3 * n * n + 5 for n in [8, 16, 32, 64, 128]])
+    'O(n²)'
+    """
+    values = [max(v, 1e-12) for v in values]
+    k = exponent(sizes, values)
+    best, best_residual = None, float('inf')
+    for name, g, min_exponent in COMPLEXITIES:
+        xs = [g(n) for n in sizes]
+        if not all(isfinite(x) for x in xs):
+            continue
+        a, b, residual = _weighted_fit(xs, values)
+        if b < 0:
+            continue
+        if best is not None and not _significant(xs, a, b, residual, k,
+                                                 min_exponent):
+            continue
+        if residual < best_residual * 0.9:
+            best, best_residual = name, residual
+    return best
+
+
+def _significant(xs, a, b, residual, k, min_exponent):
+    """whether the growth term of a fit a + b*x is more than noise"""
+    if k < min_exponent:
+        return False
+    start = a + b * min(xs)
+    if start <= 0:
+        return True
+    growth = b * (max(xs) - min(xs)) / start
+    noise = (residual / len(xs)) ** 0.5
+    return growth > SIGNIFICANCE * noise
+
+
+def exponent(sizes, values):
+    """slope of log(value) ~ log(size), i.e. k of value ∝ size^k
+
+    >>> round(exponent([10, 100, 1000], [2, 200, 20000]), 2)
+    2.0
+    """
+    pairs = [(log(n), log(v)) for n, v in zip(sizes, values) if v > 0]
+    if len(pairs) < 2:
+        return 0.0
+    mx = sum(x for x, _ in pairs) / len(pairs)
+    my = sum(y for _, y in pairs) / len(pairs)
+    sxx = sum((x - mx) ** 2 for x, _ in pairs)
+    sxy = sum((x - mx) * (y - my) for x, y in pairs)
+    return sxy / sxx if sxx else 0.0
+
+
+def sweep_sizes(min_size, max_size, factor=2):
+    """
+    >>> list(sweep_sizes(8, 64))
+    [8, 16, 32, 64]
+    """
+    n = max(1, min_size)
+    while n <= max_size:
+        yield n
+        n = max(n + 1, int(n * factor))
+
+
+class Scaling:
+    """measurements of a solution over growing input sizes"""
+
+    def __init__(self, func_name):
+        self.func_name = func_name
+        self.sizes = []
+        self.times = []
+        self.peaks = []
+
+    def add(self, n, seconds, peak):
+        self.sizes.append(n)
+        self.times.append(seconds)
+        self.peaks.append(peak)
+
+    def predict_next(self, factor):
+        """a rough guess of the time on the next size, assuming the growth
+        keeps the same pace as the last step
+        """
+        if len(self.times) < 2:
+            return 0.0
+        t0, t1 = self.times[-2], self.times[-1]
+        growth = t1 / t0 if t0 > 0 else factor
+        return t1 * max(growth, 1.0)
+
+    def time_summary(self):
+        return self._summary(self.times)
+
+    def memory_summary(self):
+        return self._summary(self.peaks)
+
+    def _summary(self, values):
+        if len(self.sizes) < 3:
+            return 'too few sizes'
+        return (f'{best_fit(self.sizes, values)} '
+                f'(n^{exponent(self.sizes, values):.2f})')
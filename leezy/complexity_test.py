@@ -0,0 +1,46 @@
+import random
+from math import log2
+
+import pytest
+
+from .complexity import best_fit, exponent, Scaling
+
+
+SIZES = [8, 16, 32, 64, 128, 256, 512, 1024]
+
+
+@pytest.mark.parametrize('expected, f, sizes', [
+    ('O(1)', lambda n: 5, SIZES),
+    ('O(log n)', lambda n: log2(n) + 1, SIZES),
+    ('O(n)', lambda n: n + 3, SIZES),
+    ('O(n log n)', lambda n: n * log2(n) + 10, SIZES),
+    ('O(n²)', lambda n: n * n, SIZES),
+    ('O(2ⁿ)', lambda n: 2 ** n, SIZES[:4]),
+])
+def test_best_fit_with_noise(expected, f, sizes):
+    noisy = [f(n) * (1 + 0.03 * (i % 3 - 1)) for i, n in enumerate(sizes)]
+    assert best_fit(sizes, noisy) == expected
+
+
+def test_best_fit_flat_with_noise():
+    # flat values with a random ±5% noise aren't taken for a growth
+    for seed in range(50):
+        rng = random.Random(seed)
+        noisy = [5 * (1 + rng.uniform(-0.05, 0.05)) for _ in SIZES]
+        assert best_fit(SIZES, noisy) == 'O(1)'
+    # a peak memory growing from 192B to 348B, far slower than n
+    sizes = [8 * 4 ** i for i in range(7)]
+    assert best_fit(sizes, [192, 200, 210, 240, 280, 320, 348]) != 'O(n)'
+
+
+def test_exponent():
+    assert exponent(SIZES, [n ** 1.5 for n in SIZES]) == pytest.approx(1.5)
+
+
+def test_scaling_predicts_next_time():
+    s = Scaling('f')
+    s.add(8, 0.001, 0)
+    assert s.predict_next(2) == 0.0
+    s.add(16, 0.004, 0)
+    assert s.predict_next(2) == pytest.approx(0.016)
+    assert s.time_summary() == 'too few sizes'
@@ -1,11 +1,6 @@
+import os
 import json
-import logging
-from pathlib import Path
 from collections import abc
-from functools import partial
-from datetime import datetime
-from types import SimpleNamespace
-from requests.cookies import RequestsCookieJar
 
 from leezy.errors import ConfigError
 
@@ -16,7 +11,9 @@ __all__ = ['config']
 DEFAULT = {
     "table": {
         "max_col_width": 30,
-        "max_content_length": 100
+        "max_content_length": 100,
+        "fingerprint_over": 1000,
+        "stream": True
     },
     "core": {
         "workdir": ".",
@@ -27,18 +24,129 @@ DEFAULT = {
     },
     "timeout": {
         "submit": 10,
-        "net": 5
+        "net": 5,
+        "run": 5
+    },
+    "run": {
+        "parallel": False,
+        "workers": 0,
+        "bench": False,
+        "scale": False,
+        "sandbox": False,
+        "verify_mutation": False,
+        "memory": False,
+        "profile": False,
+        "fuzz": False,
+        "cache": True,
+        "exit_on_failure": False,
+        "only": ""
+    },
+    "fuzz": {
+        "runs": 1000,
+        "seed": 0,
+        "min_size": 0,
+        "max_size": 16,
+        "max_failures": 5
+    },
+    "watch": {
+        "interval": 0.5
+    },
+    "design": {
+        "repeat": 5
+    },
+    "submit": {
+        "calibrate": False
+    },
+    "profile": {
+        "top": 10
+    },
+    "history": {
+        "enabled": True
+    },
+    "memory": {
+        "runs": 3
+    },
+    "bench": {
+        "warmup": 1,
+        "repeat": 7
+    },
+    "scale": {
+        "min_size": 8,
+        "max_size": 65536,
+        "repeat": 3,
+        "time_limit": 1
+    },
+    "test": {
+        "reporter": "native"
+    },
+    "sandbox": {
+        "time_limit": 5,
+        "cpu_limit": 5,
+        "memory_limit": 1024
     }
 }
 
 
+TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+FALSE_STRINGS = ('0', 'false', 'no', 'off')
+
+
+def _check_bool(value):
+    if str(value).lower() not in TRUE_STRINGS + FALSE_STRINGS:
+        raise ValueError(value)
+
+
+def _check_reporter(value):
+    if value not in ('native', 'pytest'):
+        raise ValueError(value)
+
+
 CHECK_FUNCTIONS = {
     "table.max_col_width": int,
-    "table.max_content_length": int
+    "table.max_content_length": int,
+    "table.fingerprint_over": int,
+    "table.stream": _check_bool,
+    "run.parallel": _check_bool,
+    "run.workers": int,
+    "run.bench": _check_bool,
+    "bench.warmup": int,
+    "bench.repeat": int,
+    "run.scale": _check_bool,
+    "scale.min_size": int,
+    "scale.max_size": int,
+    "scale.repeat": int,
+    "scale.time_limit": float,
+    "run.sandbox": _check_bool,
+    "sandbox.time_limit": float,
+    "sandbox.cpu_limit": float,
+    "sandbox.memory_limit": float,
+    "timeout.run": float,
+    "run.verify_mutation": _check_bool,
+    "test.reporter": _check_reporter,
+    "run.memory": _check_bool,
+    "memory.runs": int,
+    "run.profile": _check_bool,
+    "profile.top": int,
+    "history.enabled": _check_bool,
+    "run.fuzz": _check_bool,
+    "run.cache": _check_bool,
+    "run.exit_on_failure": _check_bool,
+    "run.only": str,
+    "watch.interval": float,
+    "design.repeat": int,
+    "submit.calibrate": _check_bool,
+    "fuzz.runs": int,
+    "fuzz.seed": int,
+    "fuzz.min_size": int,
+    "fuzz.max_size": int,
+    "fuzz.max_failures": int
 }
 
 CONFIG_FILE = '~/.leezy'
 
+# in-memory patches are passed to child processes through this variable
+PATCH_ENV = 'LEEZY_CONFIG_PATCH'
+
 
 class Config:
     """
@@ -51,16 +159,26 @@ class Config:
     >>> config.get('user')
     {'name': 'x', 'email': 'x@example.com'}
     >>> config.reset()
+
+    The config file is read at the first access to config data, not when
+    the instance is created, so importing `config` costs no file I/O.
     """
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls.init(cls._instance)
         return cls._instance
 
+    def __getattr__(self, name):
+        # only called when the attribute is missing, i.e. not initialized
+        if name in ('cfg_path', 'default_data', 'mem_data', 'file_data'):
+            self.init()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
     def init(self):
+        from pathlib import Path
         self.cfg_path = Path(CONFIG_FILE).expanduser()
         self.default_data = DEFAULT
         self.mem_data = {}
@@ -69,6 +187,9 @@ class Config:
             self.file_data = json.loads(content)
         except FileNotFoundError:
             self.reset()
+        patch = os.environ.get(PATCH_ENV)
+        if patch:
+            self.mem_data = json.loads(patch)
 
     def reset(self):
         self.mem_data = {}
@@ -104,6 +225,13 @@ class Config:
                                           self.file_data,
                                           self.default_data))
 
+    def get_bool(self, key):
+        """get a config entry as bool, accepting 'true', 'off', 1, etc."""
+        value = self.get(key)
+        if isinstance(value, bool):
+            return value
+        return str(value).lower() in TRUE_STRINGS
+
     def _get_all(self, mapping, prefix):
         for key, value in mapping.items():
             next_prefix = prefix+'.'+key if prefix else key
@@ -144,6 +272,14 @@ class Config:
         """update config entry in memory"""
         self._put(key, value, self.mem_data)
 
+    def patch_env(self):
+        """environment variables that carry in-memory patches to a child
+        process, whose `config` will apply them during initialization
+        """
+        env = dict(os.environ)
+        env[PATCH_ENV] = json.dumps(self.mem_data)
+        return env
+
     def _del(self, key, src_data):
         parts = key.split('.')
         next_item = src_data
@@ -213,15 +349,18 @@ class SessionToken:
         return self.expires is not None and self.token is not None
 
     def is_expired(self):
+        from datetime import datetime
         return datetime.timestamp(datetime.now()) > self.expires
 
     def get_token(self):
+        from requests.cookies import RequestsCookieJar
         jar = RequestsCookieJar()
         if self.token:
             jar.set('LEETCODE_SESSION', self.token, domain=self.domain)
         return jar
 
     def get_csrf(self):
+        from requests.cookies import RequestsCookieJar
         jar = RequestsCookieJar()
         if self.csrf:
             jar.set('csrftoken', self.csrf, domain=self.domain)
@@ -1,7 +1,6 @@
 from .config import Config
 from .errors import ConfigError
 import pytest
-from pathlib import Path
 from unittest import mock
 
 
@@ -10,9 +9,10 @@ test_config_file = '.leeezy'
 
 
 @pytest.fixture(scope='function')
-def config():
+def config(tmp_path):
     Config._instance = None
-    Config.init.__globals__['CONFIG_FILE'] = test_config_file
+    # written under the temporary directory, not the current one
+    Config.init.__globals__['CONFIG_FILE'] = str(tmp_path / test_config_file)
     config = Config()
     return config
 
@@ -35,7 +35,7 @@ def test_config_put(config):
     sess = config.get('session')
     assert sess['expires'] == expires
 
-    file = Path(test_config_file)
+    file = config.cfg_path
     content = file.read_text()
     assert token in content
     assert str(expires) in content
@@ -1,21 +1,20 @@
-import os
-import inspect
-
-from pathlib import Path
-from collections import defaultdict
+# Every problem file imports this module, keep the import cheap:
+# modules only needed by some running modes are imported where they're used,
+# and `config` doesn't read the config file until it is used.
+from math import exp, log
 from time import perf_counter
-from copy import deepcopy
 from enum import Enum
-from io import StringIO
-from textwrap import shorten, dedent
-
-import pytest
 
-from leezy.utils import Table
+from leezy.fastcopy import copy_args
 from leezy.config import config
 from leezy.assists import Context
 
 
+# a problem file exits with this code when its test cases fail, if the
+# config `run.exit_on_failure` is on
+TESTS_FAILED_EXIT = 3
+
+
 def solution(func):
     """Attach the `func` a solution marker
     """
@@ -23,6 +22,15 @@ def solution(func):
     return func
 
 
+def reference(func):
+    """Attach the `func` a solution marker, and mark it as the reference
+    whose outputs other solutions are checked against when fuzzing
+    """
+    func.__dict__['solution'] = True
+    func.__dict__['reference'] = True
+    return func
+
+
 def timeit(func):
     """Attach the `func` a time marker
     """
@@ -39,6 +47,13 @@ def timeit_with_precision(precision):
     return inject
 
 
+def memit(func):
+    """Attach the `func` a memory marker
+    """
+    func.__dict__['memit'] = True
+    return func
+
+
 class ResultUnit:
     def __init__(self, **kwargs):
         self.case_num = 0
@@ -48,14 +63,68 @@ class ResultUnit:
         self.kwargs = None
         self.output = None
         self.duration = 0
+        self.stats = None
+        self.relative = None
+        self.significant = True
+        self.status = 'OK'
+        self.error = None
+        self.rusage = None
+        self.mutated = False
+        self.memory = None
+        self.fingerprint = None
+        self.summarized = False
+        self.cached = False
         self.__dict__.update(kwargs)
 
-    def __str__(self):
-        if hasattr(self.func_object, 'timeit'):
-            return (f'({self.duration:.{self.func_object.precision}f}s)'
-                    f'{self.output}')
+    def _output_text(self):
+        if self.summarized:
+            return f'<fingerprint {self.fingerprint[:16]}>'
         return f'{self.output}'
 
+    def __str__(self):
+        if self.status != 'OK':
+            return f'{self.status}({self.error})' if self.error else self.status
+        marks = []
+        if self.stats is not None:
+            mark = '' if self.significant else '≈'
+            marks.append(f'{self.stats}, {mark}{self.relative:.2f}x')
+        elif self.rusage is not None:
+            marks.append(f'wall {self.duration:.4f}s')
+        elif hasattr(self.func_object, 'timeit'):
+            marks.append(f'{self.duration:.{self.func_object.precision}f}s')
+        if self.rusage is not None:
+            marks.append(str(self.rusage))
+        if self.mutated:
+            marks.append('mutates input')
+        if self.cached:
+            marks.append('cached')
+        if marks:
+            return f'({", ".join(marks)}){self._output_text()}'
+        return self._output_text()
+
+
+class MemoryUsage:
+    """memory traced by tracemalloc during a run of a solution
+
+    Attributes:
+        peak: peak of memory allocated during the run
+        net: memory still allocated after the run, including the output
+        leak: growth per run of memory held by the solution after repeated
+              runs, e.g. by appending to its `self` state
+    """
+
+    def __init__(self, peak, net, leak=0):
+        self.peak = peak
+        self.net = net
+        self.leak = leak
+
+    def __str__(self):
+        from leezy.utils import format_bytes
+        text = f'peak {format_bytes(self.peak)} net {format_bytes(self.net)}'
+        if self.leak:
+            text += f' leak +{format_bytes(self.leak)}/run'
+        return text
+
 
 FnTempl = """
 def test_{func}_case_{case_num}(solution_obj, case{case_num}):
@@ -87,8 +156,9 @@ class Testcase:
         self._test_kind = TestKind.Null
 
     def __str__(self):
+        from textwrap import shorten
         args = [str(arg) for arg in self.args]
-        for k, v in self.kwargs:
+        for k, v in self.kwargs.items():
             args.append(f"{k}={v}")
         sig = ','.join(args)
         return f"Testcase({shorten(sig, 100)})"
@@ -114,9 +184,16 @@ class Solution:
     def __init__(self):
         self.solutions = [item for item in self.__class__.__dict__.values()
                           if hasattr(item, 'solution')]
+        only = config.get('run.only')
+        if only:
+            self.solutions = [f for f in self.solutions
+                              if f.__name__ == only]
         self.nontest_cases = []
         self.test_cases = []
         self.context = Context
+        self.generator = None
+        self.checker = None
+        self.ordered_output = True
 
     def __str__(self):
         n = len(self.solutions)
@@ -129,9 +206,37 @@ class Solution:
     def set_context(self, context_cls):
         self.context = context_cls
 
+    def set_generator(self, generator):
+        """register a callable which takes a size `n` and returns the args
+        of a case, a tuple is treated as multiple positional args
+        """
+        self.generator = generator
+
+    def set_checker(self, checker):
+        """register a callable `checker(output, expected, *args, **kwargs)`
+        used by fuzzing for problems with multiple valid answers. It returns
+        True if `output` is acceptable for the input, `expected` is the
+        output of the reference solution
+        """
+        self.checker = checker
+
+    def set_output_order(self, ordered):
+        """whether the order of items in outputs matters when outputs of
+        solutions are compared in the agreement column of the table
+        """
+        self.ordered_output = ordered
+
+    def reference_solution(self):
+        """the solution marked by `reference`, or the first solution"""
+        for f in self.solutions:
+            if hasattr(f, 'reference'):
+                return f
+        return self.solutions[0] if self.solutions else None
+
     def case(self, *args, **kwargs):
         args, kwargs = self.context.transform_args(args, kwargs)
-        return Testcase(deepcopy(args), deepcopy(kwargs))
+        # no copy here, every run copies the case before calling solutions
+        return Testcase(args, kwargs)
 
     def add_case(self, case):
         if case.test_kind() == TestKind.Null:
@@ -139,52 +244,533 @@ class Solution:
         else:
             self.test_cases.append(case)
 
+    def load_cases(self, path, n_args=None, cache=True):
+        """add cases from a JSON Lines file or a LeetCode testcase file,
+        see `leezy.casefile` for the formats. The context applies to
+        loaded cases as to cases made by `case`.
+
+        Args:
+            path: path of the file, relative to the problem folder
+            n_args: number of args of a case in a LeetCode testcase file,
+                    `None` means the number of args of the first solution
+            cache: keep the parsed cases in a binary file for fast loading
+        """
+        import inspect
+        from leezy.casefile import read_cases
+        if n_args is None:
+            n_args = 1
+            if self.solutions:
+                params = inspect.signature(self.solutions[0]).parameters
+                n_args = max(1, len(params) - 1)
+        path = self._problem_dir() / path
+        for args, kwargs, has_expected, expected in read_cases(path, n_args,
+                                                                 cache):
+            case = self.case(*args, **kwargs)
+            if has_expected:
+                case.assert_equal(expected)
+            self.add_case(case)
+
     # deprecated method. use add_case instead.
     def add_args(self, *args, **kwargs):
         self.add_case(self.case(*args, **kwargs))
 
-    def _run_solution(self, solution, args, kwargs):
-        ags, kws = deepcopy(args), deepcopy(kwargs)
+    def _run_solution(self, solution, args, kwargs, copy=True):
+        if copy:
+            ags, kws = copy_args(args, kwargs)
+        else:
+            ags, kws = args, kwargs
         t1 = perf_counter()
         output = solution.__call__(self, *ags, **kws)
         duration = perf_counter() - t1
         return output, duration
 
-    def run_cases_to_table(self):
-        result_by_case = []
-        for i, case in enumerate(self.nontest_cases):
-            case_row = []
-            for f in self.solutions:
-                output, duration = self._run_solution(
-                    f, case.args, case.kwargs)
-                r = ResultUnit(
-                    case_num=i,
-                    func_name=f.__name__,
-                    func_object=f,
-                    args=case.args,
-                    kwargs=case.kwargs,
-                    output=output,
-                    duration=duration)
-                case_row.append(r)
-            result_by_case.append(case_row)
-
-        # draw table
-        if not result_by_case:
+    def _bench_solution(self, solution, args, kwargs, warmup, repeat,
+                        copy=True):
+        from leezy.bench import benchmark
+
+        def call(*ags, **kws):
+            return solution.__call__(self, *ags, **kws)
+
+        def make_input():
+            if copy:
+                return copy_args(args, kwargs)
+            return args, kwargs
+
+        return benchmark(call, make_input, warmup, repeat)
+
+    def _measure(self, solution, args, kwargs, options, copy=True):
+        """run `solution` on a case, return fields of its `ResultUnit`"""
+        bench = options.get('bench')
+        if bench:
+            output, stats = self._bench_solution(solution, args, kwargs,
+                                                 copy=copy, **bench)
+            fields = dict(output=output, duration=stats.median / 1e9,
+                          stats=stats)
+        else:
+            output, duration = self._run_solution(solution, args, kwargs,
+                                                  copy)
+            fields = dict(output=output, duration=duration)
+        memory_runs = options.get('memory')
+        if memory_runs or hasattr(solution, 'memit'):
+            # measured apart from timing, tracemalloc slows solutions down
+            fields['memory'] = self._measure_memory(solution, args, kwargs,
+                                                    memory_runs or 3)
+        return fields
+
+    def _run_outputs(self, args, kwargs):
+        """run every solution on a copy of the input, return a list of
+        ('OK', output) or ('RE', repr of the exception) in solution order
+        """
+        row = []
+        for f in self.solutions:
+            ags, kws = copy_args(args, kwargs)
+            try:
+                row.append(('OK', f.__call__(self, *ags, **kws)))
+            except Exception as e:
+                row.append(('RE', repr(e)))
+        return row
+
+    def _measure_shared(self, case, options):
+        """run all solutions on one shared copy of `case`. Instead of copying
+        for every run, the input is fingerprinted before and after a run,
+        and copied again only if a solution is found mutating it
+        """
+        from leezy.fingerprint import fingerprint
+        args, kwargs = copy_args(case.args, case.kwargs)
+        before = fingerprint((args, kwargs))
+        row = []
+        for f in self.solutions:
+            fields = self._measure(f, args, kwargs, options, copy=False)
+            if fingerprint((args, kwargs)) != before:
+                fields['mutated'] = True
+                args, kwargs = copy_args(case.args, case.kwargs)
+            row.append(fields)
+        return row
+
+    def _run_options(self, bench, memory=False):
+        options = {}
+        if bench:
+            options['bench'] = {
+                'warmup': int(config.get('bench.warmup')),
+                'repeat': int(config.get('bench.repeat'))
+            }
+        if memory:
+            options['memory'] = max(1, int(config.get('memory.runs')))
+        return options
+
+    def _sandbox_limits(self):
+        return {
+            'time': float(config.get('sandbox.time_limit')),
+            'cpu': float(config.get('sandbox.cpu_limit')),
+            'memory': float(config.get('sandbox.memory_limit'))
+        }
+
+    def _iter_grid(self, parallel, options, sandbox=False, verify=False,
+                   known=None):
+        """yield rows of `ResultUnit` fields in the order of cases, every row
+        as soon as all solutions finish its case. Pairs with fields in the
+        grid `known` are not run, it's ignored by sandbox and verify modes
+        """
+        if sandbox and self.nontest_cases and self.solutions:
+            from leezy.runner import run_grid_sandboxed, pool_size
+            workers = 1
+            if parallel:
+                workers = pool_size(int(config.get('run.workers')))
+            return run_grid_sandboxed(self, options, self._sandbox_limits(),
+                                      workers)
+        if parallel and self.nontest_cases and self.solutions:
+            from leezy.runner import run_grid_parallel
+            return run_grid_parallel(self, options,
+                                     int(config.get('run.workers')), known)
+        if verify:
+            return (self._measure_shared(case, options)
+                    for case in self.nontest_cases)
+        if known is None:
+            known = [[None] * len(self.solutions) for _ in self.nontest_cases]
+        return ([self._measure(f, case.args, case.kwargs, options)
+                 if fields is None else fields
+                 for f, fields in zip(self.solutions, known_row)]
+                for case, known_row in zip(self.nontest_cases, known))
+
+    def _run_grid(self, parallel, options, sandbox=False, verify=False):
+        return list(self._iter_grid(parallel, options, sandbox, verify))
+
+    @staticmethod
+    def _compare_stats(case_row):
+        """set `relative` of every benchmarked result to its ratio against
+        the fastest solution of the same case
+        """
+        measured = [r for r in case_row if r.stats is not None]
+        if not measured:
             return
-        table_settings = config.get('table')
-        table = Table(**table_settings)
+        fastest = min(measured, key=lambda r: r.stats.median)
+        for r in measured:
+            r.relative = r.stats.median / max(fastest.stats.median, 1e-9)
+            r.significant = (r is fastest or
+                             not r.stats.overlaps(fastest.stats))
+
+    def _relative_summary(self, result_by_case):
+        """geometric means of the relative ratios of every solution"""
+        log_sums = [0.0] * len(self.solutions)
+        counts = [0] * len(self.solutions)
+        for case_row in result_by_case:
+            for j, r in enumerate(case_row):
+                if r.relative is None:
+                    continue
+                log_sums[j] += log(r.relative)
+                counts[j] += 1
+        return [f'{exp(x / n):.2f}x' if n else '-'
+                for x, n in zip(log_sums, counts)]
+
+    def run_cases_to_table(self, parallel=None, bench=None, sandbox=None,
+                           verify=None, memory=None, cache=None):
+        """run all solutions on non-test cases and print a table
+
+        Args:
+            parallel: spread (solution, case) pairs across a process pool.
+                      `None` means using the config `run.parallel`
+            bench: benchmark every solution with repeated runs and show
+                   min/median/IQR and relative speedups.
+                   `None` means using the config `run.bench`
+            sandbox: run every (solution, case) pair in its own process
+                     under the limits of `sandbox.*` configs, and show
+                     TLE/MLE and resource usage in cells.
+                     `None` means using the config `run.sandbox`
+            verify: share one input between solutions of a case, verify
+                    no solution mutates it by fingerprints instead of
+                    copying it for every run. Works without `parallel`
+                    and `sandbox`, whose workers own a copy of every case.
+                    `None` means using the config `run.verify_mutation`
+            memory: trace peak and net memory of every solution, and
+                    detect growth across repeated runs, show them in a
+                    sub-table. Solutions marked by `memit` are always traced.
+                    `None` means using the config `run.memory`
+            cache: serve (solution, case) pairs whose solution code and case
+                   are unchanged from results cached in the problem folder.
+                   Only plain runs are cached, measuring modes always run.
+                   `None` means using the config `run.cache`
+        """
+        if parallel is None:
+            parallel = config.get_bool('run.parallel')
+        if bench is None:
+            bench = config.get_bool('run.bench')
+        if sandbox is None:
+            sandbox = config.get_bool('run.sandbox')
+        if verify is None:
+            verify = config.get_bool('run.verify_mutation')
+        if memory is None:
+            memory = config.get_bool('run.memory')
+        if cache is None:
+            cache = config.get_bool('run.cache')
+        if not self.nontest_cases:
+            return
+        options = self._run_options(bench, memory)
+        result_cache = keys = known = None
+        if cache and not (options or sandbox or verify):
+            result_cache, keys, known = self._load_cache()
+        grid = self._iter_grid(parallel, options, sandbox, verify, known)
+        table = self._make_table()
+        try:
+            agreement = len(self.solutions) > 1
+            result_by_case = []
+            cases = zip(self.nontest_cases, grid)
+            for i, (case, outputs) in enumerate(cases):
+                case_row = []
+                units = zip(self.solutions, outputs)
+                for j, (f, fields) in enumerate(units):
+                    r = ResultUnit(
+                        case_num=i,
+                        func_name=f.__name__,
+                        func_object=f,
+                        args=case.args,
+                        kwargs=case.kwargs,
+                        **fields)
+                    if result_cache is not None:
+                        r.cached = known[i][j] is not None
+                        if not r.cached:
+                            result_cache.put(keys[i][j], fields)
+                    case_row.append(r)
+                self._fingerprint_outputs(case_row)
+                if bench:
+                    self._compare_stats(case_row)
+                result_by_case.append(case_row)
+                row = [f'case {i}']
+                row.extend(case_row)
+                if agreement:
+                    row.append(self._agreement(case_row))
+                table.add_row(row)
+            if result_cache is not None:
+                result_cache.save()
+            if result_by_case and config.get_bool('history.enabled'):
+                self._record_history(result_by_case)
+
+            if bench:
+                table.add_row(['relative'] +
+                              self._relative_summary(result_by_case) +
+                              [''] * agreement)
+            if hasattr(table, 'finish'):
+                table.finish()
+            else:
+                print(table)
+        finally:
+            # the streams watched by a streamed table are restored even if
+            # the run is interrupted
+            if hasattr(table, 'close'):
+                table.close()
+        self._draw_memory_table(result_by_case)
+
+    def _make_table(self):
+        """a table with the header of solutions, whose rows are printed as
+        soon as they are added if `table.stream` is on and the output is a
+        terminal, otherwise it's printed at the end
+        """
+        import sys
+        from leezy.utils import Table, StreamTable
         header = ['']
         header.extend([func.__name__ for func in self.solutions])
+        if len(self.solutions) > 1:
+            header.append('agreement')
+        settings = config.get('table')
+        if config.get_bool('table.stream') and sys.stdout.isatty():
+            # contents are unknown yet, leave every solution the max width
+            n = len(self.nontest_cases)
+            widths = [max(len('relative'), len(f'case {n}'))]
+            widths += [max(len(h), int(settings.get('max_col_width', 30)))
+                       for h in header[1:]]
+            if len(self.solutions) > 1:
+                widths[-1] = len('agreement')
+            table = StreamTable(widths, **settings)
+        else:
+            table = Table(**settings)
         table.add_header(header)
+        return table
+
+    def _load_cache(self):
+        """return the result cache, and grids of keys and cached fields of
+        (solution, case) pairs
+        """
+        from leezy.cache import ResultCache, solution_hash
+        from leezy.fingerprint import fingerprint
+        result_cache = ResultCache(self._problem_dir() / '.leezy' /
+                                   f'{self.__class__.__name__}.results.pickle')
+        func_hashes = [solution_hash(f, self.__class__)
+                       for f in self.solutions]
+        keys = []
+        for case in self.nontest_cases:
+            case_fp = fingerprint((case.args, case.kwargs))
+            keys.append([result_cache.key(h, case_fp) for h in func_hashes])
+        known = [[result_cache.get(key) for key in row] for row in keys]
+        return result_cache, keys, known
+
+    def _fingerprint_outputs(self, case_row):
+        """fingerprint outputs for comparing them, outputs too large to be
+        shown are summarized by their fingerprints in the table
+        """
+        from leezy.fingerprint import fingerprint, is_large
+        limit = int(config.get('table.fingerprint_over'))
+        for r in case_row:
+            if r.status != 'OK':
+                continue
+            r.fingerprint = fingerprint(r.output, self.ordered_output,
+                                        equal_numbers=True)
+            r.summarized = limit >= 0 and is_large(r.output, limit)
+
+    @staticmethod
+    def _agreement(case_row):
+        """'✓' if all solutions give the same output, otherwise a letter per
+        solution, solutions with the same letter agree, e.g. '✗ AAB'
+        """
+        fps = [r.fingerprint for r in case_row]
+        if None not in fps and len(set(fps)) == 1:
+            return '✓'
+        letters = {}
+        marks = []
+        for fp in fps:
+            if fp is None:
+                marks.append('-')
+                continue
+            marks.append(letters.setdefault(fp, chr(ord('A') + len(letters))))
+        return '✗ ' + ''.join(marks)
+
+    def _record_history(self, result_by_case):
+        from leezy.fingerprint import fingerprint
+        from leezy.history import History, problem_id_of
+        problem_dir = self._problem_dir()
+        problem_id = problem_id_of(problem_dir, self.__class__.__name__)
+        case_fps = [fingerprint((case.args, case.kwargs))
+                    for case in self.nontest_cases]
+        history = History(problem_dir.parent)
+        history.append(history.make_records(problem_id, result_by_case,
+                                            case_fps))
+
+    def _draw_memory_table(self, result_by_case):
+        if not any(r.memory for case_row in result_by_case
+                   for r in case_row):
+            return
+        from leezy.utils import Table
+        table = Table(**config.get('table'))
+        table.add_header(['memory'] + [f.__name__ for f in self.solutions])
         for case_num, case_row in enumerate(result_by_case):
             row = [f'case {case_num}']
-            row.extend(case_row)
+            row.extend(r.memory or '-' for r in case_row)
             table.add_row(row)
         print(table)
 
-    def run_cases_to_test(self):
-        if not self.test_cases:
+    def _measure_memory(self, solution, args, kwargs, runs):
+        """trace memory of `runs` runs of `solution` on the same instance
+
+        Returns:
+            a `MemoryUsage`, whose leak is the average growth per run of
+            memory still held after a run, if it grows after every run
+        """
+        import tracemalloc
+        # copies are made before tracing, they are not allocated by solution
+        inputs = [copy_args(args, kwargs) for _ in range(runs)]
+        peak = net = 0
+        retained = []
+        tracemalloc.start()
+        try:
+            for ags, kws in inputs:
+                reset_peak = getattr(tracemalloc, 'reset_peak', None)
+                if reset_peak:
+                    reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                output = solution.__call__(self, *ags, **kws)
+                current, top = tracemalloc.get_traced_memory()
+                peak = max(peak, top - base)
+                net = current - base
+                del output
+                retained.append(tracemalloc.get_traced_memory()[0])
+        finally:
+            tracemalloc.stop()
+        growths = [b - a for a, b in zip(retained, retained[1:])]
+        leak = 0
+        if growths and all(g > 0 for g in growths):
+            leak = sum(growths) / len(growths)
+        return MemoryUsage(peak, net, leak)
+
+    def _peak_memory(self, solution, args, kwargs):
+        return self._measure_memory(solution, args, kwargs, 1).peak
+
+    def _generate_case(self, n):
+        args = self.generator(n)
+        if not isinstance(args, tuple):
+            args = (args,)
+        return self.case(*args)
+
+    def run_scale(self):
+        """run solutions over geometrically growing input sizes made by the
+        registered generator, and fit the time and peak memory of every
+        solution to common complexity classes
+        """
+        from leezy.bench import format_ns
+        from leezy.complexity import Scaling, sweep_sizes
+        from leezy.utils import Table, format_bytes
+        if self.generator is None:
+            print('No generator is registered, use `set_generator` first')
             return
+        repeat = int(config.get('scale.repeat'))
+        time_limit = float(config.get('scale.time_limit'))
+        factor = 2
+        scalings = {f: Scaling(f.__name__) for f in self.solutions}
+        active = list(self.solutions)
+        rows = []
+        for n in sweep_sizes(int(config.get('scale.min_size')),
+                             int(config.get('scale.max_size')), factor):
+            # stop solutions whose next run would exceed the time limit
+            active = [f for f in active
+                      if scalings[f].predict_next(factor) <= time_limit]
+            if not active:
+                break
+            case = self._generate_case(n)
+            row = [f'n={n}']
+            for f in self.solutions:
+                if f not in active:
+                    row.append('-')
+                    continue
+                _, stats = self._bench_solution(f, case.args, case.kwargs,
+                                                warmup=0, repeat=repeat)
+                peak = self._peak_memory(f, case.args, case.kwargs)
+                scalings[f].add(n, stats.median / 1e9, peak)
+                row.append(f'{format_ns(stats.median)} {format_bytes(peak)}')
+            rows.append(row)
+
+        table = Table(**config.get('table'))
+        table.add_header([''] + [f.__name__ for f in self.solutions])
+        for row in rows:
+            table.add_row(row)
+        table.add_row(['time'] +
+                      [scalings[f].time_summary() for f in self.solutions])
+        table.add_row(['memory'] +
+                      [scalings[f].memory_summary() for f in self.solutions])
+        print(table)
+
+    def _problem_dir(self):
+        import inspect
+        from pathlib import Path
+        return Path(inspect.getfile(self.__class__)).parent
+
+    def run_profile(self, top=None):
+        """profile every solution on every non-test case, write a file of
+        collapsed stacks for each solution into the problem folder, and
+        print the functions taking the most time
+        """
+        import inspect
+        from leezy.bench import format_ns
+        from leezy.profiling import StackProfiler
+        from leezy.utils import Table
+        if top is None:
+            top = int(config.get('profile.top'))
+        problem_file = inspect.getfile(self.__class__)
+        for f in self.solutions:
+            profiler = StackProfiler(problem_file)
+            for case in self.nontest_cases:
+                args, kwargs = copy_args(case.args, case.kwargs)
+                profiler.call(f.__get__(self), *args, **kwargs)
+            out_file = self._problem_dir() / f'{f.__name__}.collapsed'
+            profiler.write_collapsed(out_file)
+
+            table = Table(**config.get('table'))
+            table.add_header([f.__name__, 'category', 'calls', 'self',
+                              'total'])
+            for stat in profiler.top(top):
+                table.add_row([stat.label, stat.category, stat.calls,
+                               format_ns(stat.self_ns),
+                               format_ns(stat.total_ns)])
+            print(table)
+            print(f'collapsed stacks: {out_file}')
+
+    def run_cases_to_test(self, reporter=None):
+        """check outputs of all solutions on test cases
+
+        Args:
+            reporter: 'native' runs cases in process, cases failed last time
+                      go first. 'pytest' generates a test file for pytest.
+                      `None` means using the config `test.reporter`
+
+        Returns:
+            the number of failed cases
+        """
+        if not self.test_cases:
+            return 0
+        if reporter is None:
+            reporter = config.get('test.reporter')
+        if reporter == 'pytest':
+            return self._run_cases_with_pytest()
+        from leezy.checker import Checker
+        failure_file = (self._problem_dir() / '.leezy' /
+                        f'{self.__class__.__name__}.failures.json')
+        return Checker(self, failure_file).run()
+
+    def _run_cases_with_pytest(self):
+        import os
+        import inspect
+        from io import StringIO
+        from pathlib import Path
+        from textwrap import dedent
+
+        import pytest
+
         test_code = StringIO()
         for i, case in enumerate(self.test_cases):
             for func in self.solutions:
@@ -213,20 +799,63 @@ class Solution:
         for i in range(len(self.test_cases)):
             plugin_text += case_text.format(case_num=i)
 
-        exec(dedent(plugin_text))
+        namespace = {'pytest': pytest}
+        exec(dedent(plugin_text), namespace)
 
-        fixture_class = locals()['FixturePlugin']
+        fixture_class = namespace['FixturePlugin']
 
         project_dir = Path(inspect.getfile(self.__class__)).parent.parent
-        test_filename = f'test_{self.__class__.__name__}.py'
+        # pid in the name keeps concurrent runs from clobbering each other
+        test_filename = f'test_{self.__class__.__name__}_{os.getpid()}.py'
         test_file = project_dir / test_filename
         with open(test_file, 'w') as f:
             f.write(test_code.getvalue())
         try:
-            pytest.main(['-q', str(test_file)], plugins=[fixture_class(self)])
+            exit_code = pytest.main(['-q', str(test_file)],
+                                    plugins=[fixture_class(self)])
         finally:
             os.remove(test_file)
+        return 0 if exit_code == 0 else 1
+
+    def run_fuzz(self, runs=None, seed=None):
+        """run all solutions on random inputs made by the registered
+        generator and report inputs where they disagree with the reference
 
-    def run(self):
-        self.run_cases_to_table()
-        self.run_cases_to_test()
+        Args:
+            runs: number of inputs, `None` means using the config `fuzz.runs`
+            seed: seed of the first input, the i-th input uses `seed + i`.
+                  `None` means using the config `fuzz.seed`
+
+        Returns:
+            the number of disagreements found
+        """
+        from leezy.fuzz import Fuzzer
+        if self.generator is None:
+            print('No generator is registered, use `set_generator` first')
+            return 0
+        if runs is None:
+            runs = int(config.get('fuzz.runs'))
+        if seed is None:
+            seed = int(config.get('fuzz.seed'))
+        fuzzer = Fuzzer(self,
+                        min_size=int(config.get('fuzz.min_size')),
+                        max_size=int(config.get('fuzz.max_size')),
+                        max_failures=int(config.get('fuzz.max_failures')),
+                        workers=int(config.get('run.workers')))
+        return fuzzer.run(runs, seed)
+
+    def run(self, parallel=None, bench=None, sandbox=None, verify=None,
+            memory=None, cache=None):
+        if config.get_bool('run.fuzz'):
+            self.run_fuzz()
+            return
+        if config.get_bool('run.scale'):
+            self.run_scale()
+            return
+        self.run_cases_to_table(parallel, bench, sandbox, verify, memory,
+                                cache)
+        if config.get_bool('run.profile'):
+            self.run_profile()
+        failed = self.run_cases_to_test()
+        if failed and config.get_bool('run.exit_on_failure'):
+            raise SystemExit(TESTS_FAILED_EXIT)
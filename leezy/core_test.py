@@ -0,0 +1,321 @@
+import os
+import sys
+
+import pytest
+
+from leezy.core import Solution, solution
+from leezy.config import config
+from leezy.assists import ListNode
+from leezy.runner import (dump_shared, load_shared, load_solution_class,
+                          solution_location)
+
+
+class QSum(Solution):
+    @solution
+    def add(self, a, b):
+        return a + b
+
+    @solution
+    def add_by_loop(self, a, b):
+        for _ in range(b):
+            a += 1
+        return a
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects(monkeypatch):
+    monkeypatch.setitem(config.mem_data, 'history', {'enabled': False})
+    monkeypatch.setitem(config.mem_data, 'run', {'cache': False})
+
+
+@pytest.fixture
+def q():
+    q = QSum()
+    for a, b in [(1, 2), (3, 4), (10, 20)]:
+        q.add_case(q.case(a, b))
+    return q
+
+
+def test_load_solution_class_by_path():
+    path, cls_name = solution_location(QSum)
+    loaded = load_solution_class(path, cls_name)
+    assert loaded.__class__.__name__ == 'QSum'
+    assert loaded.__class__ is not QSum
+    assert [f.__name__ for f in loaded.solutions] == ['add', 'add_by_loop']
+
+
+def test_run_grid_parallel_keeps_order(q):
+    sequential = q._run_grid(parallel=False, options={})
+    parallel = q._run_grid(parallel=True, options={})
+    assert [[r['output'] for r in row] for row in parallel] == \
+        [[r['output'] for r in row] for row in sequential] == \
+        [[3, 3], [7, 7], [30, 30]]
+
+
+class QIntersection(Solution):
+    @solution
+    def intersection(self, head_a, head_b):
+        a, b = head_a, head_b
+        while a is not b:
+            a = a.next if a else head_b
+            b = b.next if b else head_a
+        return a.val if a else None
+
+
+def test_run_grid_parallel_keeps_shared_nodes():
+    # problem 160, two lists intersecting at 8
+    tail = ListNode.make_linked_list([8, 4, 5])
+    head_a = ListNode(4)
+    head_a.next = ListNode(1)
+    head_a.next.next = tail
+    head_b = ListNode(5)
+    head_b.next = ListNode(6)
+    head_b.next.next = ListNode(1)
+    head_b.next.next.next = tail
+    q = QIntersection()
+    q.add_case(q.case(head_a, head_b))
+    (a, b), _ = load_shared(dump_shared((q.nontest_cases[0].args, {})))
+    assert a.next.next is b.next.next.next and list(a) == [4, 1, 8, 4, 5]
+    [[parallel]] = q._run_grid(parallel=True, options={})
+    [[sequential]] = q._run_grid(parallel=False, options={})
+    assert parallel['output'] == sequential['output'] == 8
+
+
+def test_run_cases_to_table_parallel(q, capsys):
+    q.run_cases_to_table(parallel=False)
+    sequential = capsys.readouterr().out
+    q.run_cases_to_table(parallel=True)
+    assert capsys.readouterr().out == sequential
+
+
+def test_run_cases_to_table_bench(q, capsys):
+    q.run_cases_to_table(bench=True)
+    out = capsys.readouterr().out
+    assert 'med' in out and 'iqr' in out
+    assert 'relative' in out
+
+
+class QRunaway(Solution):
+    @solution
+    def fine(self, n):
+        return n * 2
+
+    @solution
+    def forever(self, n):
+        while True:
+            pass
+
+    @solution
+    def broken(self, n):
+        return n // 0
+
+
+def test_run_grid_sandboxed_keeps_other_results(monkeypatch):
+    q = QRunaway()
+    q.add_case(q.case(21))
+    monkeypatch.setattr(q, '_sandbox_limits',
+                        lambda: {'time': 1, 'cpu': 1, 'memory': 1024})
+    [[fine, forever, broken]] = q._run_grid(parallel=True, options={},
+                                            sandbox=True)
+    assert fine['output'] == 42
+    assert fine['rusage'].maxrss > 0
+    assert forever['status'] == 'TLE'
+    assert broken['status'] == 'RE'
+    assert 'ZeroDivisionError' in broken['error']
+
+
+class QMutation(Solution):
+    @solution
+    def sort_in_place(self, nums):
+        nums.sort()
+        return nums[0]
+
+    @solution
+    def min_of(self, nums):
+        return min(nums)
+
+
+def test_run_grid_verify_mutation():
+    q = QMutation()
+    q.add_case(q.case([3, 1, 2]))
+    [[sort_in_place, min_of]] = q._run_grid(parallel=False, options={},
+                                            verify=True)
+    assert sort_in_place['mutated'] and 'mutated' not in min_of
+    assert sort_in_place['output'] == min_of['output'] == 1
+    assert q.nontest_cases[0].args == [[3, 1, 2]]
+
+
+class QMemory(Solution):
+    @solution
+    def squares(self, n):
+        return len([i * i for i in range(n)])
+
+    @solution
+    def cached(self, n):
+        self.__dict__.setdefault('history', []).append(list(range(n)))
+        return n
+
+
+def test_measure_memory_detects_leak():
+    q = QMemory()
+    squares, cached = q.solutions
+    usage = q._measure_memory(squares, [10000], {}, runs=3)
+    assert usage.peak > 10000 * 8
+    assert usage.leak == 0
+    usage = q._measure_memory(cached, [10000], {}, runs=3)
+    assert usage.leak > 10000 * 8
+    assert 'leak' in str(usage)
+
+
+class QEvens(Solution):
+    @solution
+    def by_filter(self, n):
+        return [x for x in range(n) if x % 2 == 0]
+
+    @solution
+    def by_step(self, n):
+        return list(range(0, n, 2))
+
+    @solution
+    def reversed(self, n):
+        return list(range(0, n, 2))[::-1]
+
+
+def test_run_cases_to_table_agreement(monkeypatch, capsys):
+    monkeypatch.setitem(config.mem_data, 'table', {'fingerprint_over': 100})
+    q = QEvens()
+    q.add_case(q.case(1))
+    q.add_case(q.case(6))
+    q.add_case(q.case(1000))
+    q.run_cases_to_table()
+    out = capsys.readouterr().out
+    assert 'agreement' in out
+    assert '✓' in out and '✗ AAB' in out
+    # the large outputs are shown by fingerprints
+    assert out.count('<fingerprint') == 3
+
+    q.set_output_order(False)
+    q.run_cases_to_table()
+    assert '✗' not in capsys.readouterr().out
+
+
+class QHalf(Solution):
+    @solution
+    def by_div(self, x):
+        return [x / 2, x % 4 == 0]
+
+    @solution
+    def by_floordiv(self, x):
+        return [x // 2, int(x % 4 == 0)]
+
+
+def test_agreement_of_equal_numbers(capsys):
+    q = QHalf()
+    q.add_case(q.case(8))
+    q.run_cases_to_table()
+    out = capsys.readouterr().out
+    assert '✓' in out and '✗' not in out
+
+
+class FakeTerminal:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        return self.stream.write(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return True
+
+
+def test_run_cases_to_table_streams_rows(q, monkeypatch, capsys):
+    q.run_cases_to_table()
+    buffered = capsys.readouterr().out
+
+    printed = []
+    measure = q._measure
+
+    def spy(*args, **kwargs):
+        printed.append(capsys.readouterr().out)
+        return measure(*args, **kwargs)
+
+    with monkeypatch.context() as m:
+        m.setattr(q, '_measure', spy)
+        m.setattr('sys.stdout', FakeTerminal(sys.stdout))
+        q.run_cases_to_table()
+    # every case is printed before the next case starts
+    seen = [''.join(printed[:i + 1]).count('case ') for i in range(6)]
+    assert seen == [0, 0, 1, 1, 2, 2]
+    monkeypatch.setitem(config.mem_data, 'table', {'stream': False})
+    capsys.readouterr()
+    q.run_cases_to_table()
+    assert capsys.readouterr().out == buffered
+
+
+class QNoisy(Solution):
+    @solution
+    def add(self, a, b):
+        print('debugging')
+        return a + b
+
+
+def test_stream_table_keeps_other_output(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdout', FakeTerminal(sys.stdout))
+    monkeypatch.setattr('shutil.get_terminal_size',
+                        lambda: os.terminal_size((300, 100)))
+    q = QSum()
+    q.add_case(q.case(1, 2))
+    q.run_cases_to_table()
+    # re-flowed in place
+    assert '\x1b[' in capsys.readouterr().out
+
+    q = QNoisy()
+    q.add_case(q.case(1, 2))
+    q.run_cases_to_table()
+    out = capsys.readouterr().out
+    assert 'debugging' in out and '\x1b[' not in out
+    assert isinstance(sys.stdout, FakeTerminal)
+
+
+def test_stream_table_restores_streams_on_error(monkeypatch):
+    stdout, stderr = FakeTerminal(sys.stdout), sys.stderr
+    monkeypatch.setattr('sys.stdout', stdout)
+    q = QSum()
+    q.add_case(q.case(1, 2))
+    q.add_case(q.case(3, 4))
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(q, '_fingerprint_outputs', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        q.run_cases_to_table()
+    assert sys.stdout is stdout and sys.stderr is stderr
+
+
+def test_run_cases_to_table_cache(q, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(QSum, '_problem_dir', lambda self: tmp_path)
+    calls = []
+    measure = q._measure
+
+    def spy(f, *args, **kwargs):
+        calls.append(f.__name__)
+        return measure(f, *args, **kwargs)
+
+    monkeypatch.setattr(q, '_measure', spy)
+    q.run_cases_to_table(cache=True)
+    assert len(calls) == 6
+    assert 'cached' not in capsys.readouterr().out
+
+    q.add_case(q.case(5, 6))
+    calls.clear()
+    q.run_cases_to_table(cache=True)
+    assert calls == ['add', 'add_by_loop']
+    out = capsys.readouterr().out
+    assert out.count('cached') == 6 and '11' in out
+
+    calls.clear()
+    q.run_cases_to_table(cache=False)
+    assert len(calls) == 8
@@ -397,6 +397,20 @@ class ProblemProvider:
         return new
 
 
+# providers shared by problems, one per zone
+_providers = {}
+
+
+def shared_provider():
+    """the `ProblemProvider` of the current zone, with its session and the
+    problem index kept for later problems
+    """
+    zone = config.get('core.zone')
+    if zone not in _providers:
+        _providers[zone] = ProblemProvider()
+    return _providers[zone]
+
+
 def _find_func_names(text):
     return re.findall(r'^[^#]*def\s+(\S+)\s*\(', text, re.M)  # def in non-comment
 
@@ -406,7 +420,7 @@ class Problem:
         # id_ is frontend_id of a problem
         self.query_id = id_
         self.context = context
-        self.provider = provider or ProblemProvider()
+        self.provider = provider or shared_provider()
 
         _info = self.provider.info_by_id(id_)
         self.basic_info = _info
@@ -448,10 +462,20 @@ class Problem:
         self.py_path.write_text(
             self._generate_solution_tmpl(), encoding='utf8')
 
-    def submit(self, n):
+    def _extractor(self):
         if not self.py_path.is_file():
             raise LeezyError(f'File not found: {self.py_path}')
-        extractor = SolutionExtractor(self.py_path.read_text(encoding='utf8'))
+        return SolutionExtractor(self.py_path.read_text(encoding='utf8'))
+
+    def solution_name(self, n):
+        """name of the n-th solution in the local file"""
+        return self._extractor().submission(n)[0]
+
+    def submit(self, n, note=None):
+        """submit the n-th solution after a confirmation showing `note`,
+        return the checked result, None if it's not submitted
+        """
+        extractor = self._extractor()
         func, code = extractor.submission(n)
         # if there are multiple solutions,
         # we need to change function name before submitting
@@ -462,6 +486,8 @@ class Problem:
             code = code.replace(func+'(', origin_func_name+'(')
 
         prelude = f"Is it OK to submit solution {func!r}?:\n{code}\n"
+        if note:
+            prelude += f"{note}\n"
         if not YesNoDialog(prelude).collect():
             return
 
@@ -499,6 +525,7 @@ class Problem:
                 'submission_detail': Urls.submission_detail(submission_id),
             })
             SubmissionReporter(rjson).report()
+            return rjson
         else:
             raise LeezyError(f'Bad submission: {r.text}')
 
@@ -0,0 +1,410 @@
+"""an optional daemon serving leezy commands over a Unix domain socket
+
+`leezy daemon` keeps a warm interpreter: requests and leezy imported, the
+config read, the session and the problem index of `crawler` built, and
+problem files compiled. The `leezy` command hands `show`, `pull`, `run`
+and `submit` to it when it's running, and runs them in process otherwise.
+
+The client passes its stdin, stdout and stderr to the daemon with the
+request, so prompts, colors and terminal detection work as in process.
+`run` is served in a forked child, which can be killed on timeout or when
+the client is interrupted, without losing the warm state of the daemon.
+
+This module is imported by every `leezy` command, keep its imports cheap.
+"""
+import os
+import sys
+import json
+import stat
+import socket
+import struct
+import tempfile
+from array import array
+
+
+SERVED_COMMANDS = ('show', 'pull', 'run', 'submit')
+# global options taking a value
+VALUE_OPTIONS = ('--zone', '--dir')
+MAX_REQUEST = 1 << 20
+
+# the `Daemon` serving a request, None in other processes
+current = None
+
+
+def _is_private(path):
+    """whether `path` is a directory of this user, closed to others"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid()
+            and not st.st_mode & 0o077)
+
+
+def socket_path():
+    """the socket in a directory only this user can access, under
+    $XDG_RUNTIME_DIR or a 0700 directory in the temp dir. The client
+    hands its terminal to whoever listens there, so None is returned if
+    there is no such directory, e.g. another user made it first
+    """
+    if not hasattr(os, 'getuid'):
+        return None
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and _is_private(runtime):
+        folder = os.path.join(runtime, 'leezy')
+    else:
+        folder = os.path.join(tempfile.gettempdir(), f'leezy-{os.getuid()}')
+    try:
+        os.mkdir(folder, 0o700)
+    except FileExistsError:
+        pass
+    except OSError:
+        return None
+    if not _is_private(folder):
+        return None
+    return os.path.join(folder, 'daemon.sock')
+
+
+def _peer_uid(sock):
+    """uid of the process on the other end, None if it's unknown"""
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                struct.calcsize('3i'))
+    except (AttributeError, OSError):
+        return None
+    return struct.unpack('3i', creds)[1]
+
+
+def _connect(path):
+    """a socket connected to the daemon listening at `path`, None if there
+    is none, or the socket or the daemon is not of this user
+    """
+    if path is None:
+        return None
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    uid = _peer_uid(sock)
+    if uid is not None and uid != os.getuid():
+        sock.close()
+        return None
+    return sock
+
+
+def _command_of(argv):
+    it = iter(argv)
+    for arg in it:
+        if arg in VALUE_OPTIONS:
+            next(it, None)
+        elif not arg.startswith('-'):
+            return arg
+    return None
+
+
+def should_forward(argv):
+    """whether the command line may be served by a daemon"""
+    if _command_of(argv) not in SERVED_COMMANDS:
+        return False
+    # help and watch mode stay in process
+    return not any(arg in ('-h', '--help', '-w', '--watch') for arg in argv)
+
+
+def _send_line(sock, obj, fds=()):
+    data = (json.dumps(obj) + '\n').encode('utf8')
+    ancillary = []
+    if fds:
+        ancillary = [(socket.SOL_SOCKET, socket.SCM_RIGHTS,
+                      array('i', fds))]
+    sock.sendmsg([data], ancillary)
+
+
+def _recv_line(sock, with_fds=False):
+    """read a JSON line, and the file descriptors sent along with it"""
+    chunks, fds = [], []
+    fds_size = socket.CMSG_LEN(3 * array('i').itemsize) if with_fds else 0
+    received = 0
+    while True:
+        data, ancillary, _, _ = sock.recvmsg(4096, fds_size)
+        for level, kind, payload in ancillary:
+            if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                arr = array('i')
+                arr.frombytes(payload[:len(payload) -
+                                      len(payload) % arr.itemsize])
+                fds.extend(arr)
+        if not data:
+            break
+        chunks.append(data)
+        received += len(data)
+        if data.endswith(b'\n') or received > MAX_REQUEST:
+            break
+    text = b''.join(chunks).decode('utf8')
+    return (json.loads(text) if text else None), fds
+
+
+def forward(argv):
+    """send the command line to a running daemon
+
+    Returns:
+        the exit code of the command, or None if no daemon serves it
+    """
+    if not hasattr(socket, 'AF_UNIX') or not should_forward(argv):
+        return None
+    sock = _connect(socket_path())
+    if sock is None:
+        return None
+    with sock:
+        sys.stdout.flush()
+        request = {'argv': argv, 'cwd': os.getcwd()}
+        try:
+            _send_line(sock, request, fds=[0, 1, 2])
+            reply, _ = _recv_line(sock)
+        except KeyboardInterrupt:
+            # closing the connection tells the daemon to stop the command
+            return 130
+        except OSError:
+            return None
+    if reply is None:
+        return 1
+    return reply.get('exit', 0)
+
+
+def is_running(path=None):
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return False
+    with sock:
+        _send_line(sock, {'ping': True})
+        _recv_line(sock)
+    return True
+
+
+def stop_daemon(path=None):
+    """ask a running daemon to exit, return False if there is none"""
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return False
+    with sock:
+        _send_line(sock, {'stop': True})
+        _recv_line(sock)
+    return True
+
+
+def _exit_code(e):
+    if e.code is None:
+        return 0
+    return e.code if isinstance(e.code, int) else 1
+
+
+class Daemon:
+    """serve command lines one at a time with `dispatch(argv)`"""
+
+    def __init__(self, dispatch, path=None):
+        self.dispatch = dispatch
+        self.path = path or socket_path()
+        self.codes = {}  # problem file -> ((mtime, size), code object)
+        self.conn = None
+        self.config_stamp = None
+
+    def _compile(self, py_path):
+        stat = os.stat(py_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self.codes.get(py_path)
+        if cached is None or cached[0] != stamp:
+            with open(py_path, 'rb') as f:
+                code = compile(f.read(), py_path, 'exec')
+            self.codes[py_path] = (stamp, code)
+            self._warm_imports(code)
+        return self.codes[py_path][1]
+
+    @staticmethod
+    def _warm_imports(code):
+        """import modules the problem file imports, so forked runs find
+        them in `sys.modules` already
+        """
+        import dis
+        import importlib
+        for ins in dis.get_instructions(code):
+            if ins.opname == 'IMPORT_NAME':
+                try:
+                    importlib.import_module(ins.argval)
+                except Exception:
+                    pass
+
+    def _client_gone(self):
+        import select
+        readable, _, _ = select.select([self.conn], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self.conn.recv(1, socket.MSG_PEEK) == b''
+        except OSError:
+            return True
+
+    def run_file(self, py_path, timeout=None):
+        """run a problem file as `python <file>` would, in a forked child
+        of the warm daemon
+        """
+        from signal import SIGKILL
+        from time import monotonic, sleep
+        py_path = str(py_path)
+        code = self._compile(py_path)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            self._run_child(py_path, code)
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return
+            if self._client_gone():
+                os.kill(pid, SIGKILL)
+                os.waitpid(pid, 0)
+                return
+            if deadline is not None and monotonic() > deadline:
+                os.kill(pid, SIGKILL)
+                os.waitpid(pid, 0)
+                print(f'Timeout({timeout:g}s). '
+                      'Is there an infinite loop in the solution? '
+                      'Try --sandbox to limit every solution separately')
+                return
+            sleep(0.01)
+
+    def _run_child(self, py_path, code):
+        import types
+        import signal
+        import traceback
+        from leezy import runner
+        status = 0
+        try:
+            self.conn.close()
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            runner._loaded_solutions.clear()
+            directory = os.path.dirname(py_path)
+            os.chdir(directory)
+            sys.path.insert(0, directory)
+            sys.argv = [py_path]
+            module = types.ModuleType('__main__')
+            module.__file__ = py_path
+            module.__builtins__ = __builtins__
+            sys.modules['__main__'] = module
+            exec(code, module.__dict__)
+        except SystemExit as e:
+            status = _exit_code(e)
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def _reload_config(self):
+        """read the config file again if it's changed by others"""
+        from leezy.config import config
+        try:
+            stamp = os.stat(config.cfg_path).st_mtime_ns
+        except OSError:
+            stamp = None
+        if self.config_stamp is not None and stamp != self.config_stamp:
+            config.init()
+        self.config_stamp = stamp
+
+    def handle(self, conn):
+        """serve a request on the connection `conn`, return False if it
+        asks the daemon to stop
+        """
+        import traceback
+        from copy import deepcopy
+        from leezy.config import config
+        request, fds = _recv_line(conn, with_fds=True)
+        if request is None or request.get('stop') or len(fds) != 3:
+            for fd in fds:
+                os.close(fd)
+            stop = bool(request and request.get('stop'))
+            ok = stop or bool(request and request.get('ping'))
+            _send_line(conn, {'exit': 0 if ok else 1})
+            return not stop
+
+        self._reload_config()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = [os.dup(i) for i in range(3)]
+        for i, fd in enumerate(fds):
+            os.dup2(fd, i)
+            os.close(fd)
+        saved_cwd = os.getcwd()
+        saved_config = deepcopy(config.mem_data)
+        code = 0
+        try:
+            os.chdir(request['cwd'])
+            self.conn = conn
+            self.dispatch(request['argv'])
+        except SystemExit as e:
+            code = _exit_code(e)
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        finally:
+            self.conn = None
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for i, fd in enumerate(saved_fds):
+                os.dup2(fd, i)
+                os.close(fd)
+            os.chdir(saved_cwd)
+            config.mem_data = saved_config
+        try:
+            _send_line(conn, {'exit': code})
+        except OSError:
+            pass  # the client is gone
+        return True
+
+    def serve(self):
+        global current
+        if self.path is None:
+            print('no private directory for the socket, set '
+                  '$XDG_RUNTIME_DIR or check the permissions of '
+                  f'{tempfile.gettempdir()}/leezy-<uid>')
+            return
+        if os.path.exists(self.path):
+            if is_running(self.path):
+                print(f'a daemon is already serving on {self.path}')
+                return
+            os.unlink(self.path)  # left by a dead daemon
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o077)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(umask)
+        server.listen()
+        print(f'leezy daemon is serving on {self.path}, '
+              'press Ctrl-C to stop')
+        current = self
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    uid = _peer_uid(conn)
+                    if uid is not None and uid != os.getuid():
+                        continue
+                    if not self.handle(conn):
+                        break
+        except KeyboardInterrupt:
+            print()
+        finally:
+            current = None
+            server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
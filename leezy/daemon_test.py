@@ -0,0 +1,136 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from leezy import daemon
+from leezy.daemon import Daemon, should_forward, _send_line, _recv_line
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'),
+    reason='the daemon needs Unix domain sockets and fork')
+
+
+def test_should_forward():
+    assert should_forward(['run', '1'])
+    assert should_forward(['--zone', 'us', '-v', 'show', '1'])
+    assert should_forward(['--dir', 'run', 'pull', '1'])
+    assert not should_forward(['run', '1', '--watch'])
+    assert not should_forward(['show', '-h'])
+    assert not should_forward(['config', '-l'])
+    assert not should_forward(['daemon'])
+    assert not should_forward([])
+
+
+def test_forward_without_daemon(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, 'socket_path', lambda: str(tmp_path / 's'))
+    assert daemon.forward(['run', '1']) is None
+    assert not daemon.is_running()
+    assert not daemon.stop_daemon()
+
+
+def test_socket_path_is_private(tmp_path, monkeypatch):
+    runtime = tmp_path / 'run'
+    runtime.mkdir(0o700)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(runtime))
+    path = daemon.socket_path()
+    assert path == str(runtime / 'leezy' / 'daemon.sock')
+    assert os.stat(runtime / 'leezy').st_mode & 0o777 == 0o700
+
+    # a runtime dir open to others is not used, nor a dir made by others
+    runtime.chmod(0o755)
+    monkeypatch.setattr(daemon.tempfile, 'gettempdir', lambda: str(tmp_path))
+    assert daemon.socket_path() == str(
+        tmp_path / f'leezy-{os.getuid()}' / 'daemon.sock')
+    (tmp_path / f'leezy-{os.getuid()}').chmod(0o777)
+    assert daemon.socket_path() is None
+
+
+def test_refuse_socket_of_others(tmp_path, monkeypatch):
+    path = str(tmp_path / 's')
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with server:
+        server.bind(path)
+        server.listen()
+        sock = daemon._connect(path)
+        assert sock is not None
+        sock.close()
+        # as if the socket was made by another user
+        uid = os.getuid()
+        monkeypatch.setattr(daemon.os, 'getuid', lambda: uid + 1)
+        assert daemon._connect(path) is None
+        monkeypatch.setattr(daemon, 'socket_path', lambda: path)
+        assert daemon.forward(['run', '1']) is None
+
+
+def request(d, argv, out):
+    """serve `argv` by `d` with `out` as stdout, return the exit code"""
+    client, server = socket.socketpair()
+    with client, server, open(out, 'wb') as f:
+        _send_line(client, {'argv': argv, 'cwd': str(out.parent)},
+                   fds=[0, f.fileno(), 2])
+        assert d.handle(server)
+        reply, _ = _recv_line(client)
+    return reply['exit']
+
+
+def test_handle(tmp_path):
+    def dispatch(argv):
+        os.write(1, ' '.join(argv + [os.getcwd()]).encode())
+        if argv[0] == 'fail':
+            raise SystemExit(3)
+
+    d = Daemon(dispatch, path=str(tmp_path / 's'))
+    out = tmp_path / 'out'
+    cwd = os.getcwd()
+    assert request(d, ['run', '1'], out) == 0
+    assert out.read_text() == f'run 1 {tmp_path}'
+    assert request(d, ['fail'], out) == 3
+    assert out.read_text() == f'fail {tmp_path}'
+    assert os.getcwd() == cwd
+
+
+def test_run_file(tmp_path, capsys, monkeypatch):
+    script = tmp_path / 'p.py'
+    script.write_text("import os\n"
+                      "os.write(1, __name__.encode())\n"
+                      "if os.environ.get('LOOP'):\n"
+                      "    while True: pass\n")
+    d = Daemon(lambda argv: d.run_file(script, timeout=0.5),
+               path=str(tmp_path / 's'))
+    out = tmp_path / 'out'
+    assert request(d, ['run', '1'], out) == 0
+    assert out.read_text() == '__main__'
+    assert str(script) in d.codes
+
+    monkeypatch.setenv('LOOP', '1')
+    assert request(d, ['run', '1'], out) == 0
+    assert 'Timeout(0.5s)' in capsys.readouterr().out
+
+
+def test_serve(tmp_path, monkeypatch):
+    path = str(tmp_path / 's')
+    monkeypatch.setattr(daemon, 'socket_path', lambda: path)
+    seen = []
+
+    def dispatch(argv):
+        seen.append((argv, os.getcwd()))
+        raise SystemExit(2)
+
+    d = Daemon(dispatch)
+    thread = threading.Thread(target=d.serve, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.is_running():
+            break
+        thread.join(0.01)
+    assert daemon.forward(['show', '1']) == 2
+    assert seen == [(['show', '1'], os.getcwd())]
+    # commands not served are run in process
+    assert daemon.forward(['config', '-l']) is None
+
+    assert daemon.stop_daemon()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not os.path.exists(path)
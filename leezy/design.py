@@ -0,0 +1,257 @@
+import traceback
+from math import ceil
+from time import perf_counter, perf_counter_ns
+from textwrap import shorten
+
+from leezy.core import TESTS_FAILED_EXIT
+from leezy.config import config
+from leezy.fastcopy import copy_args
+
+
+def percentile(sorted_samples, p):
+    """nearest-rank percentile of sorted samples
+
+    >>> percentile([1, 2, 3, 4], 50)
+    2
+    >>> percentile([1, 2, 3, 4], 99)
+    4
+    """
+    rank = max(1, ceil(p * len(sorted_samples) / 100))
+    return sorted_samples[rank - 1]
+
+
+def format_rate(per_second):
+    """
+    >>> format_rate(1234567)
+    '1.23M ops/s'
+    """
+    for unit, scale in (('G', 1e9), ('M', 1e6), ('k', 1e3)):
+        if per_second >= scale:
+            return f'{per_second / scale:.3g}{unit} ops/s'
+    return f'{per_second:.3g} ops/s'
+
+
+class DesignCase:
+    """a sequence of operations in the LeetCode format, e.g.
+    `["LRUCache", "put", "get"], [[2], [1, 1], [1]]`. The first operation
+    constructs the object if it's not a method of the class.
+    """
+
+    def __init__(self, operations, operands, expected=None):
+        if len(operations) != len(operands):
+            raise ValueError(f'{len(operations)} operations but '
+                             f'{len(operands)} operands')
+        if expected is not None and len(expected) != len(operations):
+            raise ValueError(f'{len(operations)} operations but '
+                             f'{len(expected)} expected outputs')
+        self.operations = list(operations)
+        self.operands = [list(x) for x in operands]
+        self.expected = expected
+
+    def __str__(self):
+        return f'{len(self.operations)} operations'
+
+    def call_text(self, i):
+        args = ', '.join(repr(x) for x in self.operands[i])
+        return shorten(f'{self.operations[i]}({args})', 200)
+
+
+class Replay:
+    """outputs and per-call durations of an implementation on a case"""
+
+    def __init__(self):
+        self.outputs = []
+        self.durations = {}  # method name -> [ns]
+        self.error = None  # (index of the operation, traceback)
+
+    def record(self, method, ns):
+        self.durations.setdefault(method, []).append(ns)
+
+
+class Design:
+    """replay operations of design problems on several implementations,
+    check that their outputs agree, and time every method
+
+        d = Design(LRUCache, LRUCacheOrderedDict)
+        d.add_case(["LRUCache", "put", "get"], [[2], [1, 1], [1]])
+        d.run()
+    """
+
+    def __init__(self, *impls):
+        self.impls = list(impls)
+        self.cases = []
+
+    def __str__(self):
+        names = ', '.join(impl.__name__ for impl in self.impls)
+        return f'Design of {names}'
+
+    def __repr__(self):
+        return f'<{self}>'
+
+    def add_impl(self, impl):
+        self.impls.append(impl)
+
+    def add_case(self, operations, operands, expected=None):
+        """add a case, `expected` is the list of outputs of operations,
+        `None` for the constructor, as given by LeetCode
+        """
+        self.cases.append(DesignCase(operations, operands, expected))
+
+    @staticmethod
+    def _constructs(impl, case):
+        return not callable(getattr(impl, case.operations[0], None))
+
+    def _replay(self, impl, case, replay):
+        """run `case` on a new object of `impl`, record durations of calls
+        in `replay`, and outputs if it has none yet
+        """
+        keep_outputs = not replay.outputs
+        operands = [copy_args(opd, {})[0] for opd in case.operands]
+        i = 0
+        try:
+            if self._constructs(impl, case):
+                t = perf_counter_ns()
+                obj = impl(*operands[0])
+                # timed under the name in the case, the same for all classes
+                replay.record(case.operations[0], perf_counter_ns() - t)
+                if keep_outputs:
+                    replay.outputs.append(None)
+                i = 1
+            else:
+                obj = impl()
+            while i < len(operands):
+                method = getattr(obj, case.operations[i])
+                t = perf_counter_ns()
+                out = method(*operands[i])
+                replay.record(case.operations[i], perf_counter_ns() - t)
+                if keep_outputs:
+                    replay.outputs.append(out)
+                i += 1
+        except Exception:
+            replay.error = (i, traceback.format_exc(limit=-3))
+
+    def _check(self, case_num, case, replays):
+        """return the detail of the failure of a case, or None"""
+        from leezy.fingerprint import fingerprint
+        names = [impl.__name__ for impl in self.impls]
+        title = f' case {case_num} '
+        lines = [f'{title:_^70}', str(case)]
+        for name, replay in zip(names, replays):
+            if replay.error is not None:
+                i, tb = replay.error
+                lines.append(f'{name} raised at operation {i}: '
+                             f'{case.call_text(i)}')
+                lines.append(tb)
+                return '\n'.join(lines)
+        n = len(case.operations)
+        fps = [[fingerprint(out, equal_numbers=True) for out in r.outputs]
+               for r in replays]
+        for i in range(n):
+            wrong = len({row[i] for row in fps}) > 1
+            if case.expected is not None:
+                wrong = wrong or any(r.outputs[i] != case.expected[i]
+                                     for r in replays)
+            if not wrong:
+                continue
+            lines.append(f'operation {i}: {case.call_text(i)}')
+            width = max(len(name) for name in names + ['expected'])
+            for name, r in zip(names, replays):
+                lines.append(f'{name:>{width}}: '
+                             f'{shorten(repr(r.outputs[i]), 200)}')
+            if case.expected is not None:
+                lines.append(f'{"expected":>{width}}: '
+                             f'{shorten(repr(case.expected[i]), 200)}')
+            return '\n'.join(lines)
+        return None
+
+    def _draw_timing_table(self, replays_by_case):
+        from leezy.bench import format_ns
+        from leezy.utils import Table
+        table = Table(**config.get('table'))
+        table.add_header(['p50 / p99'] + [impl.__name__
+                                          for impl in self.impls])
+        merged = []
+        for j in range(len(self.impls)):
+            durations = {}
+            for replays in replays_by_case:
+                for method, ns in replays[j].durations.items():
+                    durations.setdefault(method, []).extend(ns)
+            merged.append(durations)
+        methods = []
+        for case in self.cases:
+            for op in case.operations:
+                if op not in methods and any(op in d for d in merged):
+                    methods.append(op)
+        for method in methods:
+            row = [method]
+            for durations in merged:
+                samples = sorted(durations.get(method, ()))
+                if not samples:
+                    row.append('-')
+                    continue
+                row.append(f'{format_ns(percentile(samples, 50))} / '
+                           f'{format_ns(percentile(samples, 99))}')
+            table.add_row(row)
+        row = ['throughput']
+        for durations in merged:
+            calls = sum(len(ns) for ns in durations.values())
+            total = sum(sum(ns) for ns in durations.values())
+            row.append(format_rate(calls / total * 1e9) if total else '-')
+        table.add_row(row)
+        print(table)
+
+    def run(self, repeat=None):
+        """replay every case `repeat` times on each implementation, print
+        latency percentiles of methods and the throughput, then check that
+        implementations agree with each other and with expected outputs
+
+        Args:
+            repeat: `None` means using the config `design.repeat`
+
+        Returns:
+            the number of failed cases, the process exits instead if the
+            config `run.exit_on_failure` is on
+        """
+        if not self.impls:
+            print('No implementation is registered')
+            return 0
+        if repeat is None:
+            repeat = int(config.get('design.repeat'))
+        t1 = perf_counter()
+        replays_by_case = []
+        for case in self.cases:
+            replays = [Replay() for _ in self.impls]
+            for _ in range(max(1, repeat)):
+                # interleave implementations to spread out noise
+                for impl, replay in zip(self.impls, replays):
+                    if replay.error is None:
+                        self._replay(impl, case, replay)
+            replays_by_case.append(replays)
+        duration = perf_counter() - t1
+        if self.cases:
+            self._draw_timing_table(replays_by_case)
+
+        marks, details = [], []
+        for case_num, (case, replays) in enumerate(zip(self.cases,
+                                                       replays_by_case)):
+            detail = self._check(case_num, case, replays)
+            if detail is None:
+                marks.append('.')
+                continue
+            errored = any(r.error is not None for r in replays)
+            marks.append('E' if errored else 'F')
+            details.append(detail)
+        print(''.join(marks))
+        for detail in details:
+            print(detail)
+        counts = []
+        for mark, outcome in (('F', 'failed'), ('E', 'error'),
+                              ('.', 'passed')):
+            n = marks.count(mark)
+            if n:
+                plural = 's' if outcome == 'error' and n > 1 else ''
+                counts.append(f'{n} {outcome}{plural}')
+        print(f"{', '.join(counts) or 'no cases'} in {duration:.2f}s")
+        if details and config.get_bool('run.exit_on_failure'):
+            raise SystemExit(TESTS_FAILED_EXIT)
+        return len(details)
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from leezy.design import Design, percentile
+from leezy.render import Render, TemplateType
+
+
+class LRUCache:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = OrderedDict()
+
+    def get(self, key):
+        if key not in self.data:
+            return -1
+        self.data.move_to_end(key)
+        return self.data[key]
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+
+
+class LRUCacheList:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = []
+
+    def get(self, key):
+        for i, (k, v) in enumerate(self.items):
+            if k == key:
+                self.items.append(self.items.pop(i))
+                return v
+        return -1
+
+    def put(self, key, value):
+        self.items = [(k, v) for k, v in self.items if k != key]
+        self.items.append((key, value))
+        if len(self.items) > self.capacity:
+            self.items.pop(0)
+
+
+class FIFOCache(LRUCacheList):
+    def get(self, key):
+        return dict(self.items).get(key, -1)
+
+
+class BrokenCache(LRUCache):
+    # neither refreshes keys nor handles missing ones
+    def get(self, key):
+        return self.data[key]
+
+
+OPERATIONS = ["LRUCache", "put", "put", "get", "put", "get", "put", "get",
+              "get", "get"]
+OPERANDS = [[2], [1, 1], [2, 2], [1], [3, 3], [2], [4, 4], [1], [3], [4]]
+EXPECTED = [None, None, None, 1, None, -1, None, -1, 3, 4]
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([7], 99) == 7
+
+
+def test_agree(capsys):
+    d = Design(LRUCache, LRUCacheList)
+    d.add_case(OPERATIONS, OPERANDS, EXPECTED)
+    assert d.run(repeat=3) == 0
+    out = capsys.readouterr().out
+    for row in ('LRUCache', 'put', 'get', 'throughput'):
+        assert row in out
+    assert 'ops/s' in out
+    assert '1 passed' in out
+
+
+def test_disagree(capsys):
+    d = Design(LRUCache, FIFOCache)
+    d.add_case(OPERATIONS, OPERANDS)
+    assert d.run(repeat=1) == 1
+    out = capsys.readouterr().out
+    # the first operation where they differ
+    assert 'operation 5: get(2)' in out
+    assert '1 failed' in out
+
+
+def test_expected_and_error(capsys):
+    d = Design(BrokenCache)
+    d.add_case(OPERATIONS, OPERANDS, EXPECTED)
+    d.add_case(["LRUCache", "put", "get"], [[1], [1, 1], [1]],
+               [None, None, 2])
+    assert d.run(repeat=2) == 2
+    out = capsys.readouterr().out
+    assert 'BrokenCache raised at operation 7: get(1)' in out
+    assert 'KeyError' in out
+    assert 'expected: 2' in out
+    assert 'EF' in out
+
+
+class Counter:
+    def __init__(self):
+        self.n = 0
+
+    def add(self, items):
+        items.append(0)
+        self.n += len(items)
+        return self.n
+
+
+def test_no_constructor_and_copy(capsys):
+    d = Design(Counter)
+    d.add_case(["add", "add"], [[[1]], [[1, 2]]], [2, 5])
+    # operands are copied for each replay, mutations don't pile up
+    assert d.run(repeat=3) == 0
+    assert d.cases[0].operands == [[[1]], [[1, 2]]]
+
+
+def test_render_design(capsys):
+    snippet = ('class LRUCache:\n\n'
+               '    def __init__(self, capacity: int):\n'
+               '        pass\n\n'
+               '    def get(self, key: int) -> int:\n'
+               '        return -1\n\n'
+               '    def put(self, key: int, value: int) -> None:\n'
+               '        pass\n')
+    problem = SimpleNamespace(code_snippet=snippet, context=None,
+                              loc_id='0146',
+                              sample_testcase=[OPERATIONS, OPERANDS])
+    render = Render(problem)
+    assert render.template_type() == TemplateType.Design
+    code = render.render()
+    assert 'd = Design(LRUCache)' in code
+    namespace = {'__name__': 'rendered'}
+    exec(code, namespace)
+    namespace['main']()
+    # the stub returns -1 for every get
+    assert '1 passed' in capsys.readouterr().out
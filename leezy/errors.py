@@ -1,7 +1,6 @@
 
 import sys
 import logging
-import requests
 
 LOG = logging.getLogger(__name__)
 Info = LOG.info
@@ -15,6 +14,7 @@ def show_error_and_exit(err):
 
 
 def raise_for_status(response, description):
+    import requests
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError as e:
@@ -68,3 +68,7 @@ class Locked(LeezyError):
 
 class ConfigError(LeezyError):
     pass
+
+
+class CaseFileError(LeezyError):
+    pass
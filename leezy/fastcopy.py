@@ -0,0 +1,166 @@
+from copy import copy, deepcopy
+
+from leezy.assists import (ListNode, TreeNode, LazyListNode, LazyTreeNode,
+                           GraphNode, NaryNode, Grid, _cycle_entry,
+                           _rebuild_graph, _build_nary_tree)
+
+
+ATOMIC_TYPES = frozenset([int, float, complex, bool, str, bytes, type(None)])
+
+
+def _is_atomic_list(lst):
+    return set(map(type, lst)) <= ATOMIC_TYPES
+
+
+def _copy_shared_linked_list(head, memo):
+    new_head = tail = None
+    p = head
+    while p is not None:
+        if id(p) in memo:
+            # reach a shared or visited node, link to its copy and stop
+            if tail is None:
+                return memo[id(p)]
+            tail.next = memo[id(p)]
+            break
+        node = p.__class__(p.val)
+        memo[id(p)] = node
+        if tail is None:
+            new_head = tail = node
+        else:
+            tail.next = node
+            tail = node
+        p = p.next
+    return new_head
+
+
+def _copy_linked_list(head, memo):
+    if memo is not None:
+        return _copy_shared_linked_list(head, memo)
+    new_head = tail = head.__class__(head.val)
+    p = head.next
+    # Brent's cycle detection along the walk, nothing kept per node
+    tortoise, power, length = head, 1, 1
+    while p is not None:
+        if p is tortoise:
+            break
+        node = p.__class__(p.val)
+        tail.next = node
+        tail = node
+        if power == length:
+            tortoise = p
+            power *= 2
+            length = 0
+        p = p.next
+        length += 1
+    else:
+        return new_head
+    # the copy has run past the cycle, cut it after `length` nodes of the
+    # cycle and link back to the entry
+    pos = _cycle_entry(head, length)
+    entry = new_head
+    for _ in range(pos):
+        entry = entry.next
+    last = entry
+    for _ in range(length - 1):
+        last = last.next
+    last.next = entry
+    return new_head
+
+
+def _copy_tree(root, memo):
+    if memo is not None and id(root) in memo:
+        return memo[id(root)]
+    new_root = root.__class__(root.val)
+    if memo is not None:
+        memo[id(root)] = new_root
+    stack = [(root, new_root)]
+    while stack:
+        src, dst = stack.pop()
+        for child in ('left', 'right'):
+            node = getattr(src, child)
+            if node is None:
+                continue
+            if memo is not None and id(node) in memo:
+                setattr(dst, child, memo[id(node)])
+                continue
+            new_node = node.__class__(node.val)
+            if memo is not None:
+                memo[id(node)] = new_node
+            setattr(dst, child, new_node)
+            stack.append((node, new_node))
+    return new_root
+
+
+def _copy_grid(grid):
+    if grid.cols and all(type(row) is memoryview for row in grid):
+        # rows are still views of the array, copy the array at once
+        return grid.__class__(copy(grid.buffer), grid.cols)
+    return Grid.from_list(grid.tolist(), grid.buffer.typecode)
+
+
+def _copy_lazy(node):
+    """a node over the same array, for nodes with nothing made after them
+    """
+    new_node = node._array.node(node._index)
+    new_node.val = node.val
+    return new_node
+
+
+def fast_copy(obj, memo=None):
+    """copy `obj` as `deepcopy` does, but faster for common inputs.
+
+    Lists of primitives are copied by slicing, `ListNode`, `TreeNode`,
+    `GraphNode` and `NaryNode` are copied by loops instead of recursion,
+    `Grid`s by copying their arrays, nodes of `ListArray` and
+    `TreeArray` not visited yet share the arrays, everything else falls
+    back to `deepcopy`.
+
+    Args:
+        memo: a dict keeping nodes already copied, only needed when nodes
+              may be shared between different parts of the input
+    """
+    cls = type(obj)
+    if cls in ATOMIC_TYPES:
+        return obj
+    if cls is list:
+        if _is_atomic_list(obj):
+            return obj[:]
+        return [fast_copy(x, memo) for x in obj]
+    if isinstance(obj, (LazyListNode, LazyTreeNode)) and obj._pristine():
+        return _copy_lazy(obj)
+    if isinstance(obj, ListNode):
+        return _copy_linked_list(obj, memo)
+    if isinstance(obj, TreeNode):
+        return _copy_tree(obj, memo)
+    if isinstance(obj, Grid):
+        return _copy_grid(obj)
+    if isinstance(obj, GraphNode):
+        return _rebuild_graph(cls, obj.to_adjacency(), obj.val)
+    if isinstance(obj, NaryNode):
+        return _build_nary_tree(cls, obj)
+    if cls is tuple and set(map(type, obj)) <= ATOMIC_TYPES:
+        return obj
+    return deepcopy(obj)
+
+
+def _count_structures(values):
+    n = 0
+    for v in values:
+        if isinstance(v, (ListNode, TreeNode)):
+            n += 1
+        elif type(v) is list and not _is_atomic_list(v):
+            n += _count_structures(v)
+    return n
+
+
+def copy_args(args, kwargs):
+    """copy args and kwargs of a case
+
+    A memo is used only if there are more than one linked list or tree,
+    which may share nodes, e.g. two lists intersecting in problem 160
+    """
+    values = list(args) + list(kwargs.values())
+    memo = {} if _count_structures(values) > 1 else None
+    ags = [fast_copy(x, memo) for x in args]
+    kws = {k: fast_copy(v, memo) for k, v in kwargs.items()}
+    return ags, kws
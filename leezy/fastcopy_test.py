@@ -0,0 +1,60 @@
+from .assists import ListNode, TreeNode
+from .fastcopy import fast_copy, copy_args
+from .fingerprint import fingerprint
+
+
+def test_fast_copy_lists():
+    flat = [1, 2.0, 'x', None]
+    nested = [[1, 2], [3, [4]]]
+    assert fast_copy(flat) == flat and fast_copy(flat) is not flat
+    copied = fast_copy(nested)
+    assert copied == nested
+    assert copied[1][1] is not nested[1][1]
+
+
+def test_fast_copy_nodes():
+    ll = ListNode.make_linked_list(range(100000))
+    copied = fast_copy(ll)
+    assert copied == ll and copied is not ll
+    assert copied.next is not ll.next
+
+    # a degenerated tree deeper than the recursion limit
+    root = tail = TreeNode(0)
+    for i in range(1, 100000):
+        tail.right = TreeNode(i)
+        tail = tail.right
+    copied = fast_copy(root)
+    assert copied is not root
+    assert fingerprint(copied) == fingerprint(root)
+
+
+def test_fast_copy_cycle_list():
+    cl = ListNode.make_cycle_list([1, 2, 3], 1)
+    copied = fast_copy(cl)
+    assert copied is not cl
+    assert copied.next.next.next is copied.next
+    for n in (1, 2, 5, 17):
+        for pos in range(n):
+            cl = ListNode.make_cycle_list(range(n), pos)
+            copied = fast_copy(cl)
+            assert copied.cycle() == (pos, n - pos) and copied == cl
+
+
+def test_copy_args_keeps_shared_nodes():
+    tail = ListNode.make_linked_list([8, 4, 5])
+    a = ListNode.make_linked_list([4, 1])
+    b = ListNode.make_linked_list([5, 6, 1])
+    a.next.next = tail
+    b.next.next.next = tail
+    (ca, cb), _ = copy_args([a, b], {})
+    assert ca.next.next is cb.next.next.next
+    assert ca.next.next is not tail
+
+
+def test_fingerprint():
+    t1 = TreeNode.make_tree([1, 2, 3, None, 4])
+    t2 = TreeNode.make_tree([1, 2, 3, 4])
+    assert fingerprint(t1) != fingerprint(t2)
+    assert fingerprint(t1) == fingerprint(fast_copy(t1))
+    assert fingerprint({'a': [1]}) != fingerprint({'a': [2]})
+    assert fingerprint([1, 2]) != fingerprint((1, 2))
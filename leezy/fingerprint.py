@@ -0,0 +1,257 @@
+from hashlib import blake2b
+
+from leezy.assists import (ListNode, TreeNode, LazyListNode, LazyTreeNode,
+                           GraphNode, NaryNode, Grid)
+from leezy.fastcopy import ATOMIC_TYPES
+
+
+# values of a long structure are hashed chunk by chunk
+CHUNK = 4096
+
+
+# values of these types may equal ints, e.g. True == 1 and 2.0 == 2
+_INT_LIKE = frozenset([bool, float])
+
+
+def _normal(v):
+    """`v` as an int if it's a bool or a float equal to an int, so equal
+    numbers are hashed the same
+    """
+    cls = type(v)
+    if cls is bool or (cls is float and v.is_integer()):
+        return int(v)
+    return v
+
+
+def _normal_list(items):
+    if _INT_LIKE.isdisjoint(map(type, items)):
+        return items
+    return [_normal(v) for v in items]
+
+
+class _Hasher:
+    def __init__(self, equal_numbers=False):
+        self.h = blake2b(digest_size=16)
+        self.buffer = []
+        self.equal_numbers = equal_numbers
+
+    def normal_list(self, items):
+        return _normal_list(items) if self.equal_numbers else items
+
+    def token(self, tag):
+        self.flush()
+        self.h.update(tag)
+
+    def value(self, v):
+        if self.equal_numbers and type(v) in _INT_LIKE:
+            v = _normal(v)
+        self.buffer.append(v)
+        if len(self.buffer) >= CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.h.update(repr(self.buffer).encode('utf8'))
+            self.buffer = []
+
+    def hexdigest(self):
+        self.flush()
+        return self.h.hexdigest()
+
+
+def _feed_linked_list(hasher, head):
+    hasher.token(b'<ListNode>')
+    if isinstance(head, LazyListNode) and head._pristine():
+        for v in head:
+            hasher.value(v)
+        hasher.token(b'</ListNode>')
+        return
+    pos, length = head.cycle()
+    p = head
+    for _ in range(pos + length):
+        hasher.value(p.val)
+        p = p.next
+    if length:
+        hasher.token(b'<cycle>')
+        hasher.value(pos)
+    hasher.token(b'</ListNode>')
+
+
+def _feed_tree_array(hasher, root):
+    """the same as `_feed_tree`, on the arrays of a `TreeArray`"""
+    tree = root._array
+    vals = tree.vals
+    lefts, rights = tree.lefts.tolist(), tree.rights.tolist()
+    hasher.token(b'<TreeNode>')
+    hasher.value(root.val)
+    level = [lefts[root._index], rights[root._index]]
+    while level:
+        next_level = []
+        for i in level:
+            if i < 0:
+                hasher.token(b'#')
+            else:
+                hasher.value(vals[i])
+                next_level.append(lefts[i])
+                next_level.append(rights[i])
+        level = next_level
+    hasher.token(b'</TreeNode>')
+
+
+def _feed_tree(hasher, root):
+    if isinstance(root, LazyTreeNode) and root._pristine():
+        _feed_tree_array(hasher, root)
+        return
+    hasher.token(b'<TreeNode>')
+    level = [root]
+    while level:
+        next_level = []
+        for node in level:
+            if node is None:
+                hasher.token(b'#')
+            else:
+                hasher.value(node.val)
+                next_level.append(node.left)
+                next_level.append(node.right)
+        level = next_level
+    hasher.token(b'</TreeNode>')
+
+
+def _feed_grid(hasher, grid):
+    hasher.token(b'<Grid>')
+    hasher.value(len(grid))
+    hasher.value(grid.cols)
+    if (grid.buffer.typecode == 'q' or not hasher.equal_numbers) and \
+            all(type(row) is memoryview for row in grid):
+        # rows are still views of the array
+        hasher.token(grid.buffer.typecode.encode())
+        hasher.h.update(grid.buffer.tobytes())
+    else:
+        for row in grid:
+            hasher.value(hasher.normal_list(list(row)))
+    hasher.token(b'</Grid>')
+
+
+def _feed(hasher, obj):
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        cls = type(obj)
+        if cls in ATOMIC_TYPES:
+            hasher.value(obj)
+        elif cls is list or cls is tuple:
+            if set(map(type, obj)) <= ATOMIC_TYPES:
+                hasher.token(b'[' if cls is list else b'(')
+                hasher.h.update(repr(hasher.normal_list(obj)).encode('utf8'))
+            else:
+                hasher.token(b'[' if cls is list else b'(')
+                hasher.value(len(obj))
+                stack.extend(reversed(obj))
+        elif cls is dict:
+            hasher.token(b'{')
+            hasher.value(len(obj))
+            for k, v in reversed(list(obj.items())):
+                stack.append(v)
+                stack.append(k)
+        elif isinstance(obj, ListNode):
+            _feed_linked_list(hasher, obj)
+        elif isinstance(obj, TreeNode):
+            _feed_tree(hasher, obj)
+        elif isinstance(obj, Grid):
+            _feed_grid(hasher, obj)
+        elif isinstance(obj, NaryNode):
+            hasher.token(b'<NaryNode>')
+            for v in obj:
+                hasher.value(v)
+            hasher.token(b'</NaryNode>')
+        elif isinstance(obj, GraphNode):
+            hasher.token(b'<GraphNode>')
+            hasher.value(obj.val)
+            for adj in obj.to_adjacency():
+                hasher.value(adj)
+            hasher.token(b'</GraphNode>')
+        else:
+            hasher.token(b'<repr>')
+            hasher.value(repr(obj))
+
+
+def _feed_unordered(hasher, obj):
+    cls = type(obj)
+    if cls is not list and cls is not tuple:
+        _feed(hasher, obj)
+        return
+    hasher.token(b'<bag>')
+    hasher.value(len(obj))
+    if set(map(type, obj)) <= ATOMIC_TYPES:
+        obj = hasher.normal_list(obj)
+        try:
+            items = sorted(obj)
+        except TypeError:
+            items = sorted(obj, key=repr)
+        hasher.h.update(repr(items).encode('utf8'))
+    else:
+        for digest in sorted(fingerprint(x, False, hasher.equal_numbers)
+                             for x in obj):
+            hasher.value(digest)
+    hasher.token(b'</bag>')
+
+
+def fingerprint(obj, ordered=True, equal_numbers=False):
+    """structural hash of `obj`, equal objects have the same fingerprint
+
+    >>> fingerprint([1, [2, 3]]) == fingerprint([1, [2, 3]])
+    True
+    >>> fingerprint([1, [2, 3]]) == fingerprint([1, [3, 2]])
+    False
+
+    Args:
+        ordered: if False, lists and tuples are hashed as multisets, at any
+                 depth of nesting lists, for answers in any order
+    >>> fingerprint([[3, 2], 1], False) == fingerprint([1, [2, 3]], False)
+    True
+
+        equal_numbers: if True, numbers comparing equal are hashed the
+                 same, e.g. 2, 2.0 and True == 1, for comparing outputs.
+                 Inputs are hashed exactly, f(2) may differ from f(2.0)
+    >>> fingerprint([2.0, True], equal_numbers=True) == \\
+    ...     fingerprint([2, 1], equal_numbers=True)
+    True
+    """
+    hasher = _Hasher(equal_numbers)
+    if ordered:
+        _feed(hasher, obj)
+    else:
+        _feed_unordered(hasher, obj)
+    return hasher.hexdigest()
+
+
+def is_large(obj, limit):
+    """whether `obj` has more than `limit` items or nodes, counting only
+    up to `limit + 1` items
+    """
+    if isinstance(obj, ListNode):
+        visited = set()
+        p = obj
+        while p is not None and id(p) not in visited:
+            visited.add(id(p))
+            if len(visited) > limit:
+                return True
+            p = p.next
+        return False
+    if isinstance(obj, TreeNode):
+        count = 0
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            count += 1
+            if count > limit:
+                return True
+            stack.append(node.left)
+            stack.append(node.right)
+        return False
+    try:
+        return len(obj) > limit
+    except TypeError:
+        return False
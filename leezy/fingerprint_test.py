@@ -0,0 +1,54 @@
+from leezy.assists import ListNode, TreeNode
+from leezy.fingerprint import fingerprint, is_large
+
+
+def test_fingerprint_structures():
+    a = TreeNode.make_tree([1, 2, 3, None, 4])
+    b = TreeNode.make_tree([1, 2, 3, None, 4])
+    c = TreeNode.make_tree([1, 2, 3, 4])
+    assert fingerprint(a) == fingerprint(b) != fingerprint(c)
+    assert fingerprint(ListNode.make_linked_list([1, 2])) != \
+        fingerprint([1, 2])
+    cycle = ListNode.make_cycle_list([1, 2, 3], 1)
+    assert fingerprint(cycle) == fingerprint(ListNode.make_cycle_list(
+        [1, 2, 3], 1))
+
+
+def test_fingerprint_equal_numbers():
+    # outputs comparing equal have the same fingerprint
+    for a, b in [(2, 2.0), (1, True), ([2], [2.0]), ([0, 1], [False, True]),
+                 ((3, [4.0]), (3, [4])), ({1: 2.0}, {True: 2}),
+                 (-0.0, 0)]:
+        assert a == b
+        for ordered in (True, False):
+            assert fingerprint(a, ordered, equal_numbers=True) == \
+                fingerprint(b, ordered, equal_numbers=True)
+    assert fingerprint(TreeNode.make_tree([1.0, 2]), equal_numbers=True) == \
+        fingerprint(TreeNode.make_tree([1, 2]), equal_numbers=True)
+    assert fingerprint(2.5, equal_numbers=True) != \
+        fingerprint(2, equal_numbers=True)
+    assert fingerprint('2', equal_numbers=True) != \
+        fingerprint(2, equal_numbers=True)
+    # inputs are hashed exactly, as cache keys
+    assert fingerprint(2) != fingerprint(2.0)
+
+
+def test_fingerprint_unordered():
+    groups = [['eat', 'tea'], ['bat']]
+    shuffled = [['bat'], ['tea', 'eat']]
+    assert fingerprint(groups) != fingerprint(shuffled)
+    assert fingerprint(groups, ordered=False) == \
+        fingerprint(shuffled, ordered=False)
+    assert fingerprint([1, 1, 2], ordered=False) != \
+        fingerprint([1, 2, 2], ordered=False)
+    assert fingerprint([1, 'a', None], ordered=False) == \
+        fingerprint([None, 1, 'a'], ordered=False)
+
+
+def test_is_large():
+    assert is_large(list(range(11)), 10)
+    assert not is_large(list(range(10)), 10)
+    assert is_large(ListNode.make_linked_list(range(100)), 10)
+    assert not is_large(ListNode.make_cycle_list([1, 2, 3], 0), 10)
+    assert is_large(TreeNode.make_tree(list(range(20))), 10)
+    assert not is_large(42, 10)
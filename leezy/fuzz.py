@@ -0,0 +1,138 @@
+import random
+from time import perf_counter
+from textwrap import shorten
+
+from leezy.runner import pool_size, run_outputs_parallel
+
+
+class Disagreement:
+    """a solution disagreeing with the reference on a generated input"""
+
+    def __init__(self, seed, size, case, func_name, expected, got, reason):
+        self.seed = seed
+        self.size = size
+        self.case = case
+        self.func_name = func_name
+        self.expected = expected
+        self.got = got
+        self.reason = reason
+
+    def detail(self, ref_name):
+        title = f' {self.func_name} on seed {self.seed} (n={self.size}) '
+        lines = [f'{title:_^70}', str(self.case)]
+        if self.reason:
+            lines.append(self.reason)
+        lines.append(f'{ref_name}: {shorten(str(self.expected), 200)}')
+        if self.func_name != ref_name:
+            lines.append(f'{self.func_name}: {shorten(str(self.got), 200)}')
+        return '\n'.join(lines)
+
+
+class Fuzzer:
+    """differential fuzzing of the solutions of a `Solution`
+
+    Every input is made by the registered generator with a size drawn from
+    [min_size, max_size], both the size and the generator are driven by
+    the seed of the input, so any input can be made again by its seed.
+    Outputs of solutions are compared with the output of the reference
+    solution, or judged by the registered checker if there is one.
+    """
+
+    # inputs made and run at a time, checked between chunks to stop early
+    CHUNK = 512
+
+    def __init__(self, q, min_size=0, max_size=16, max_failures=5,
+                 workers=0):
+        self.q = q
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.max_failures = max_failures
+        self.workers = pool_size(workers)
+        self.reference = q.reference_solution()
+        self.failures = []
+        self.n_inputs = 0
+
+    def make_input(self, seed):
+        """return (size, case) of the input of `seed`"""
+        size = random.Random(seed).randint(self.min_size, self.max_size)
+        # generators use the module level functions of `random`
+        random.seed(seed)
+        return size, self.q._generate_case(size)
+
+    def _run_chunk(self, cases):
+        inputs = [(case.args, case.kwargs) for case in cases]
+        if self.workers == 1 or len(inputs) == 1:
+            return [self.q._run_outputs(args, kwargs)
+                    for args, kwargs in inputs]
+        return run_outputs_parallel(self.q, inputs, self.workers)
+
+    def _judge(self, case, expected, got):
+        """return None if `got` is acceptable, or the reason why not"""
+        checker = self.q.checker
+        try:
+            if checker is None:
+                return None if got == expected else ''
+            if checker(got, expected, *case.args, **case.kwargs):
+                return None
+        except Exception as e:
+            return f'comparing raised {e!r}'
+        name = getattr(checker, '__name__', 'checker')
+        return f'{name}(output, expected, ...) is falsy'
+
+    def _check(self, seed, size, case, row):
+        ref_index = self.q.solutions.index(self.reference)
+        ref_status, expected = row[ref_index]
+        if ref_status != 'OK':
+            return [Disagreement(seed, size, case, self.reference.__name__,
+                                 expected, None, 'the reference raised')]
+        found = []
+        for f, (status, got) in zip(self.q.solutions, row):
+            if f is self.reference:
+                continue
+            if status != 'OK':
+                reason = 'raised'
+            else:
+                reason = self._judge(case, expected, got)
+                if reason is None:
+                    continue
+            found.append(Disagreement(seed, size, case, f.__name__,
+                                      expected, got, reason))
+        return found
+
+    def run(self, runs, seed=0):
+        """fuzz with `runs` inputs of seeds `seed`, `seed + 1`, ..., print
+        a report and return the number of disagreements found
+        """
+        if self.reference is None:
+            return 0
+        state = random.getstate()
+        t1 = perf_counter()
+        try:
+            for start in range(seed, seed + runs, self.CHUNK):
+                seeds = range(start, min(start + self.CHUNK, seed + runs))
+                made = [self.make_input(s) for s in seeds]
+                rows = self._run_chunk([case for _, case in made])
+                self.n_inputs += len(rows)
+                for s, (size, case), row in zip(seeds, made, rows):
+                    self.failures.extend(self._check(s, size, case, row))
+                if len(self.failures) >= self.max_failures:
+                    break
+        finally:
+            random.setstate(state)
+        self.report(perf_counter() - t1)
+        return len(self.failures)
+
+    def report(self, duration):
+        ref_name = self.reference.__name__
+        shown = self.failures[:self.max_failures]
+        for failure in shown:
+            print(failure.detail(ref_name))
+        summary = (f'fuzzed {len(self.q.solutions)} solutions on '
+                   f'{self.n_inputs} inputs against {ref_name} '
+                   f'in {duration:.2f}s')
+        if not self.failures:
+            print(f'{summary}, no disagreement')
+            return
+        print(f'{summary}, {len(self.failures)} disagreements, '
+              f'first {len(shown)} shown')
+        print(f'reproduce the first one with `--seed {shown[0].seed} -n 1`')
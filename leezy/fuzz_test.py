@@ -0,0 +1,92 @@
+import random
+
+from leezy.core import Solution, solution, reference
+from leezy.fuzz import Fuzzer
+
+
+class QMax(Solution):
+    @reference
+    def by_builtin(self, nums):
+        return max(nums)
+
+    @solution
+    def by_loop(self, nums):
+        ans = nums[0]
+        for x in nums:
+            ans = max(ans, x)
+        return ans
+
+    @solution
+    def skip_last(self, nums):
+        return max(nums[:-1])
+
+
+def random_nums(n):
+    return [random.randint(-9, 9) for _ in range(n + 1)]
+
+
+def make_q():
+    q = QMax()
+    q.set_generator(random_nums)
+    return q
+
+
+def test_reference_solution():
+    q = make_q()
+    assert q.reference_solution().__name__ == 'by_builtin'
+    assert [f.__name__ for f in q.solutions] == \
+        ['by_builtin', 'by_loop', 'skip_last']
+
+
+def test_make_input_by_seed():
+    fuzzer = Fuzzer(make_q(), max_size=8)
+    size, case = fuzzer.make_input(7)
+    assert fuzzer.make_input(7)[0] == size
+    assert fuzzer.make_input(7)[1].args == case.args
+    assert len(case.args[0]) == size + 1
+
+
+def test_fuzz_finds_disagreements(capsys):
+    fuzzer = Fuzzer(make_q(), max_size=8, max_failures=3, workers=1)
+    assert fuzzer.run(200, seed=100) >= 3
+    assert {f.func_name for f in fuzzer.failures} == {'skip_last'}
+    out = capsys.readouterr().out
+    first = fuzzer.failures[0].seed
+    assert f'--seed {first} -n 1' in out
+
+    # the input of the reported seed reproduces the disagreement
+    again = Fuzzer(make_q(), max_size=8, workers=1)
+    assert again.run(1, seed=first) == 1
+
+
+def test_fuzz_parallel_agrees_with_sequential(capsys):
+    sequential = Fuzzer(make_q(), max_size=8, max_failures=1000, workers=1)
+    parallel = Fuzzer(make_q(), max_size=8, max_failures=1000, workers=2)
+    sequential.run(300)
+    parallel.run(300)
+    assert [f.seed for f in parallel.failures] == \
+        [f.seed for f in sequential.failures]
+
+
+class QAnyIndex(Solution):
+    @reference
+    def first(self, nums, x):
+        return nums.index(x)
+
+    @solution
+    def last(self, nums, x):
+        return len(nums) - 1 - nums[::-1].index(x)
+
+
+def test_fuzz_with_checker(capsys):
+    q = QAnyIndex()
+    q.set_generator(lambda n: ([random.randint(0, 2) for _ in range(n)] +
+                               [1], 1))
+    assert Fuzzer(q, workers=1).run(100) > 0
+
+    def check(output, expected, nums, x):
+        return nums[output] == x
+
+    q.set_checker(check)
+    assert Fuzzer(q, workers=1).run(100) == 0
+    assert 'no disagreement' in capsys.readouterr().out
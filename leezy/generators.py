@@ -0,0 +1,244 @@
+"""seeded random inputs at the sizes of LeetCode's constraints
+
+Every generator takes a keyword `seed`. Without one it draws from the
+module `random`, which `leezy fuzz` seeds for every input, so they can be
+registered by `set_generator` as they are:
+
+    q.set_generator(lambda n: generators.ints(n, -10 ** 4, 10 ** 4))
+
+Values are made from bytes of `randbytes` read as arrays a chunk at a
+time, rather than by a call of `randrange` per value.
+"""
+import sys
+import random
+from array import array
+from math import isqrt
+from string import ascii_lowercase
+
+from leezy.assists import ListNode, TreeNode
+
+
+def _rng(seed):
+    return random if seed is None else random.Random(seed)
+
+
+# random words are made this many at a time, not all at once
+CHUNK = 1 << 16
+
+
+def _words(rng, n):
+    """arrays of n random unsigned 64-bit ints in total, in chunks, the
+    same on any platform for a seed
+    """
+    for start in range(0, n, CHUNK):
+        words = array('Q', rng.randbytes(8 * min(CHUNK, n - start)))
+        if sys.byteorder == 'big':
+            words.byteswap()
+        yield words
+
+
+def _indexes(rng, n, k):
+    """n random ints in [0, k)"""
+    if k > 1 << 32:
+        return [rng.randrange(k) for _ in range(n)]
+    # the bias of a 64-bit word modulo k is less than 2^-32
+    nums = []
+    for words in _words(rng, n):
+        nums += [w % k for w in words]
+    return nums
+
+
+def ints(n, lo=-10 ** 9, hi=10 ** 9, seed=None):
+    """n random ints in [lo, hi], with duplicates
+
+    >>> ints(5, 0, 9, seed=1) == ints(5, 0, 9, seed=1)
+    True
+    """
+    if hi < lo:
+        raise ValueError(f'empty range [{lo}, {hi}]')
+    rng = _rng(seed)
+    span = hi - lo + 1
+    if span > 1 << 32:
+        return [rng.randrange(lo, hi + 1) for _ in range(n)]
+    nums = []
+    for words in _words(rng, n):
+        nums += [lo + w % span for w in words]
+    return nums
+
+
+def sorted_ints(n, lo=-10 ** 9, hi=10 ** 9, seed=None):
+    """n random ints in [lo, hi] in ascending order"""
+    nums = ints(n, lo, hi, seed=seed)
+    nums.sort()
+    return nums
+
+
+def distinct_ints(n, lo=-10 ** 9, hi=10 ** 9, seed=None):
+    """n different random ints in [lo, hi], in random order"""
+    if n > hi - lo + 1:
+        raise ValueError(f'{n} distinct ints are not in [{lo}, {hi}]')
+    return _rng(seed).sample(range(lo, hi + 1), n)
+
+
+def repeated_ints(n, k, lo=-10 ** 9, hi=10 ** 9, seed=None):
+    """n random ints taking at most k different values in [lo, hi]"""
+    rng = _rng(seed)
+    if n and not k:
+        raise ValueError('no values to repeat')
+    values = distinct_ints(k, lo, hi, seed=rng.getrandbits(64))
+    return [values[i] for i in _indexes(rng, n, k)]
+
+
+def permutation(n, seed=None):
+    """0..n - 1 in random order"""
+    nums = list(range(n))
+    _rng(seed).shuffle(nums)
+    return nums
+
+
+def string(n, alphabet=ascii_lowercase, seed=None):
+    """a random string of n letters of `alphabet`
+
+    >>> set(string(100, 'ab', seed=1)) == {'a', 'b'}
+    True
+    """
+    rng = _rng(seed)
+    k = len(alphabet)
+    if not k:
+        raise ValueError('empty alphabet')
+    if k > 256 or not alphabet.isascii():
+        return ''.join(rng.choices(alphabet, k=n))
+    # map random bytes to letters in bulk, bytes past the last multiple of
+    # k are dropped, so every letter is equally likely
+    limit = 256 - 256 % k
+    table = bytes(ord(alphabet[i % k]) for i in range(256))
+    dropped = bytes(range(limit, 256))
+    letters = bytearray()
+    while len(letters) < n:
+        need = n - len(letters)
+        letters += rng.randbytes(need + need // 4 + 8).translate(table,
+                                                                 dropped)
+    return letters[:n].decode('ascii')
+
+
+def linked_list(n, lo=-10 ** 9, hi=10 ** 9, sort=False, seed=None):
+    """a `ListNode` list of n random values, None if n is 0"""
+    nums = sorted_ints(n, lo, hi, seed) if sort else ints(n, lo, hi, seed)
+    return ListNode.make_linked_list(nums)
+
+
+def _tree_of_ranges(vals, pick):
+    """a tree of `vals` in order, the root of `vals[lo:hi]` is at the index
+    `pick(lo, hi)`, built with a stack as deep as the tree
+    """
+    nodes = [TreeNode(v) for v in vals]
+    if not nodes:
+        return None
+    top = pick(0, len(nodes))
+    stack = [(top, 0, len(nodes))]
+    while stack:
+        i, lo, hi = stack.pop()
+        node = nodes[i]
+        if lo < i:
+            j = pick(lo, i)
+            node.left = nodes[j]
+            stack.append((j, lo, i))
+        if i + 1 < hi:
+            j = pick(i + 1, hi)
+            node.right = nodes[j]
+            stack.append((j, i + 1, hi))
+    return nodes[top]
+
+
+def _middle(lo, hi):
+    return (lo + hi) // 2
+
+
+def complete_tree(n, lo=-10 ** 4, hi=10 ** 4, seed=None):
+    """a complete `TreeNode` tree of n random values"""
+    return TreeNode.make_tree(ints(n, lo, hi, seed))
+
+
+def balanced_tree(n, lo=-10 ** 4, hi=10 ** 4, seed=None):
+    """a `TreeNode` tree of n random values, sizes of the subtrees of any
+    node differ by at most one
+    """
+    return _tree_of_ranges(ints(n, lo, hi, seed), _middle)
+
+
+def skewed_tree(n, lo=-10 ** 4, hi=10 ** 4, side='right', seed=None):
+    """a `TreeNode` tree of n random values in a chain, every node has
+    only a `side` child, 'left', 'right' or 'random'
+    """
+    rng = _rng(seed)
+    nodes = [TreeNode(v) for v in ints(n, lo, hi, seed=rng.getrandbits(64))]
+    if side == 'random':
+        sides = _indexes(rng, max(n - 1, 0), 2)
+    elif side in ('left', 'right'):
+        sides = [side == 'right'] * max(n - 1, 0)
+    else:
+        raise ValueError("side should be 'left', 'right' or 'random'")
+    for parent, child, right in zip(nodes, nodes[1:], sides):
+        if right:
+            parent.right = child
+        else:
+            parent.left = child
+    return nodes[0] if nodes else None
+
+
+def random_tree(n, lo=-10 ** 4, hi=10 ** 4, seed=None):
+    """a `TreeNode` tree of n random values, shaped as a BST of random
+    insertions, about 4.3 ln n deep
+    """
+    rng = _rng(seed)
+    vals = ints(n, lo, hi, seed=rng.getrandbits(64))
+    rand = rng.random
+    return _tree_of_ranges(vals, lambda i, j: i + int(rand() * (j - i)))
+
+
+def bst(n, lo=-10 ** 9, hi=10 ** 9, balanced=False, seed=None):
+    """a binary search tree of n distinct random values, height balanced
+    or shaped as random insertions
+
+    >>> list(bst(3, 1, 3, balanced=True, seed=0))
+    [2, 1, 3]
+    """
+    rng = _rng(seed)
+    vals = sorted(distinct_ints(n, lo, hi, seed=rng.getrandbits(64)))
+    if balanced:
+        return _tree_of_ranges(vals, _middle)
+    rand = rng.random
+    return _tree_of_ranges(vals, lambda i, j: i + int(rand() * (j - i)))
+
+
+def dag(n, m, seed=None):
+    """m different random edges [u, v] of a directed acyclic graph on
+    nodes 0..n - 1, in random order. A random order of the nodes is
+    topological, every edge goes forward in it
+    """
+    pairs = n * (n - 1) // 2
+    if m > pairs:
+        raise ValueError(f'a DAG of {n} nodes has at most {pairs} edges')
+    rng = _rng(seed)
+    order = permutation(n, seed=rng.getrandbits(64))
+    edges = []
+    for k in rng.sample(range(pairs), m):
+        # the k-th pair (i, j), i < j, counted as (0, 1), (0, 2), (1, 2), ..
+        j = (1 + isqrt(8 * k + 1)) // 2
+        i = k - j * (j - 1) // 2
+        edges.append([order[i], order[j]])
+    return edges
+
+
+def grid(rows, cols, lo=0, hi=1, seed=None):
+    """a matrix of random ints in [lo, hi], as a list of lists"""
+    cells = ints(rows * cols, lo, hi, seed)
+    return [cells[r * cols:(r + 1) * cols] for r in range(rows)]
+
+
+def char_grid(rows, cols, alphabet='01', seed=None):
+    """a matrix of random letters of `alphabet`, as a list of lists of
+    one-letter strings, e.g. the islands of problem 200
+    """
+    cells = string(rows * cols, alphabet, seed)
+    return [list(cells[r * cols:(r + 1) * cols]) for r in range(rows)]
@@ -0,0 +1,112 @@
+import random
+from collections import Counter
+
+import pytest
+
+from leezy import generators as g
+
+
+def inorder(root):
+    vals, stack, node = [], [], root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        vals.append(node.val)
+        node = node.right
+    return vals
+
+
+def height(root):
+    level, h = [root], 0
+    while level:
+        h += 1
+        level = [c for node in level for c in (node.left, node.right) if c]
+    return h
+
+
+def test_seeded():
+    assert g.ints(100, seed=7) == g.ints(100, seed=7) != g.ints(100, seed=8)
+    assert g.string(50, seed=7) == g.string(50, seed=7)
+    assert g.dag(20, 30, seed=7) == g.dag(20, 30, seed=7)
+    # without a seed, the module `random` seeded by fuzzing is used
+    random.seed(3)
+    a = g.ints(10)
+    random.seed(3)
+    assert g.ints(10) == a
+
+
+def test_arrays():
+    nums = g.ints(g.CHUNK + 10, -3, 3, seed=1)
+    assert len(nums) == g.CHUNK + 10 and set(nums) == set(range(-3, 4))
+    big = g.ints(10, 0, 10 ** 18, seed=1)
+    assert all(0 <= x <= 10 ** 18 for x in big)
+    nums = g.sorted_ints(1000, seed=1)
+    assert nums == sorted(nums)
+    nums = g.distinct_ints(100, 1, 100, seed=1)
+    assert sorted(nums) == list(range(1, 101))
+    nums = g.repeated_ints(1000, 5, seed=1)
+    assert len(nums) == 1000 and len(set(nums)) <= 5
+    assert sorted(g.permutation(50, seed=1)) == list(range(50))
+    with pytest.raises(ValueError):
+        g.distinct_ints(11, 1, 10)
+    with pytest.raises(ValueError):
+        g.ints(1, 2, 1)
+
+
+def test_string():
+    s = g.string(26000, seed=1)
+    counts = Counter(s)
+    assert len(s) == 26000 and set(counts) <= set('abcdefghijklmnopqrstuvwxyz')
+    assert min(counts.values()) > 800 and max(counts.values()) < 1200
+    assert set(g.string(100, 'λμ', seed=1)) == {'λ', 'μ'}
+    assert g.string(0) == ''
+
+
+def test_lists_and_trees():
+    assert list(g.linked_list(100, sort=True, seed=1)) == \
+        sorted(g.ints(100, seed=1))
+    assert g.linked_list(0) is None
+
+    n = 1000
+    assert len(list(g.complete_tree(n, seed=1))) == n
+    assert height(g.balanced_tree(n, seed=1)) == 10
+    assert height(g.skewed_tree(n, side='left', seed=1)) == n
+    assert height(g.skewed_tree(n, side='random', seed=1)) == n
+    assert len(inorder(g.random_tree(n, seed=1))) == n
+
+    for balanced in (True, False):
+        vals = inorder(g.bst(n, seed=1, balanced=balanced))
+        assert vals == sorted(set(vals)) and len(vals) == n
+    assert height(g.bst(n, balanced=True, seed=1)) == 10
+    assert height(g.bst(n, seed=1)) < 40
+
+
+def test_dag():
+    n = 30
+    edges = g.dag(n, 200, seed=1)
+    assert len({tuple(e) for e in edges}) == 200
+    # Kahn's algorithm visits every node of a DAG
+    indegree = Counter(v for _, v in edges)
+    out = {u: [] for u in range(n)}
+    for u, v in edges:
+        out[u].append(v)
+    queue = [u for u in range(n) if not indegree[u]]
+    for u in queue:
+        for v in out[u]:
+            indegree[v] -= 1
+            if not indegree[v]:
+                queue.append(v)
+    assert len(queue) == n
+    assert len(g.dag(n, n * (n - 1) // 2, seed=1)) == n * (n - 1) // 2
+    with pytest.raises(ValueError):
+        g.dag(3, 4)
+
+
+def test_grids():
+    grid = g.grid(3, 4, 0, 9, seed=1)
+    assert len(grid) == 3 and all(len(row) == 4 for row in grid)
+    assert g.grid(2, 0) == [[], []]
+    grid = g.char_grid(5, 6, seed=1)
+    assert len(grid) == 5 and {c for row in grid for c in row} <= {'0', '1'}
@@ -0,0 +1,170 @@
+import re
+import sys
+import json
+import inspect
+import platform
+from math import erf, sqrt
+from hashlib import sha1
+from pathlib import Path
+from datetime import datetime
+from textwrap import dedent
+from collections import defaultdict
+
+from leezy.bench import format_ns
+
+
+HISTORY_FILE = '.leezy_history.jsonl'
+
+PROBLEM_DIR_RE = re.compile(r'^(\d+) - ')
+
+
+def problem_id_of(problem_dir, default):
+    """'001' for a problem folder named '001 - Two Sum'"""
+    match = PROBLEM_DIR_RE.match(Path(problem_dir).name)
+    return match.group(1) if match else default
+
+
+def source_hash(func):
+    try:
+        source = dedent(inspect.getsource(func)).strip()
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    return sha1(source.encode('utf8')).hexdigest()[:12]
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'implementation': sys.implementation.name,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'system': platform.system()
+    }
+
+
+def mann_whitney_p(xs, ys):
+    """two-sided p-value of the Mann-Whitney U test, using the normal
+    approximation with tie correction
+
+    >>> mann_whitney_p([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) < 0.05
+    True
+    """
+    n1, n2 = len(xs), len(ys)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    pooled = sorted([(x, 0) for x in xs] + [(y, 1) for y in ys])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    r1 = sum(r for r, (_, group) in zip(ranks, pooled) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    var = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return 1.0
+    z = (abs(u - mean) - 0.5) / sqrt(var)
+    return max(0.0, min(1.0, 2 * (1 - 0.5 * (1 + erf(z / sqrt(2))))))
+
+
+def compare(prev, cur, alpha=0.05):
+    """describe the change from record `prev` to record `cur`"""
+    change = cur['median'] / prev['median'] - 1 if prev['median'] else 0
+    text = f'{change:+.1%}'
+    if min(len(prev['samples']), len(cur['samples'])) < 3:
+        verdict = '? (too few samples, try bench mode)'
+    else:
+        p = mann_whitney_p(prev['samples'], cur['samples'])
+        if p >= alpha:
+            verdict = f'~ (p={p:.2g})'
+        elif change > 0:
+            verdict = f'regression (p={p:.2g})'
+        else:
+            verdict = f'improvement (p={p:.2g})'
+    if prev['source'] != cur['source']:
+        verdict += ', source changed'
+    if prev['machine'] != cur['machine']:
+        verdict += ', machine changed'
+    return f'{text} {verdict}'
+
+
+class History:
+    """results of every run, appended to a JSON Lines file in workdir"""
+
+    def __init__(self, workdir):
+        self.path = Path(workdir) / HISTORY_FILE
+
+    def append(self, records):
+        with open(self.path, 'a', encoding='utf8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+
+    def load(self, problem_id=None):
+        try:
+            f = open(self.path, encoding='utf8')
+        except FileNotFoundError:
+            return []
+        records = []
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if problem_id is None or record['problem'] == problem_id:
+                    records.append(record)
+        return records
+
+    def make_records(self, problem_id, result_by_case, case_fingerprints):
+        when = datetime.now().isoformat(timespec='seconds')
+        machine = machine_info()
+        records = []
+        for case_row, case_fp in zip(result_by_case, case_fingerprints):
+            for r in case_row:
+                if r.status != 'OK' or r.cached:
+                    continue
+                if r.stats is not None:
+                    samples = [ns / 1e9 for ns in r.stats.samples]
+                else:
+                    samples = [r.duration]
+                records.append({
+                    'time': when,
+                    'problem': problem_id,
+                    'solution': r.func_name,
+                    'source': source_hash(r.func_object),
+                    'case': case_fp,
+                    'case_num': r.case_num,
+                    'median': r.duration,
+                    'samples': samples,
+                    'machine': machine
+                })
+        return records
+
+    def trends(self, problem_id, last=5):
+        """rows of (solution, case number, runs, trend, change since the
+        previous run) for every (solution, case) of a problem
+        """
+        groups = defaultdict(list)
+        for record in self.load(problem_id):
+            groups[(record['solution'], record['case'])].append(record)
+        rows = []
+        for (solution, _), records in groups.items():
+            latest = records[-1]
+            trend = ' → '.join(format_ns(r['median'] * 1e9)
+                               for r in records[-last:])
+            change = '-'
+            if len(records) > 1:
+                change = compare(records[-2], latest)
+            rows.append((solution, latest['case_num'], len(records),
+                         trend, change))
+        rows.sort(key=lambda row: (row[1], row[0]))
+        return rows
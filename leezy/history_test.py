@@ -0,0 +1,38 @@
+from .history import History, mann_whitney_p, compare, problem_id_of
+
+
+def record(median, samples, source='a'):
+    return {'median': median, 'samples': samples, 'source': source,
+            'machine': {}}
+
+
+def test_mann_whitney_p():
+    assert mann_whitney_p([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) < 0.05
+    assert mann_whitney_p([1, 3, 5, 7, 9], [2, 4, 6, 8, 10]) > 0.5
+    assert mann_whitney_p([1, 1, 1], [1, 1, 1]) == 1.0
+
+
+def test_compare():
+    slow = record(2.0, [1.9, 2.0, 2.1, 2.0, 2.05])
+    fast = record(1.0, [0.9, 1.0, 1.1, 1.0, 1.05])
+    assert 'regression' in compare(fast, slow)
+    assert 'improvement' in compare(slow, fast)
+    assert compare(fast, dict(fast, source='b')).endswith('source changed')
+    assert 'too few samples' in compare(record(1, [1]), record(2, [2]))
+
+
+def test_history_trends(tmp_path):
+    assert problem_id_of(tmp_path / '001 - Two Sum', 'Q') == '001'
+    assert problem_id_of(tmp_path / 'scratch', 'Q') == 'Q'
+
+    store = History(tmp_path)
+    for median in (1e-3, 2e-3):
+        store.append([{'problem': '001', 'solution': 'twoSum', 'case': 'fp',
+                       'case_num': 0, 'median': median,
+                       'samples': [median] * 5, 'source': 'a',
+                       'machine': {}, 'time': ''}])
+    [(solution, case_num, runs, trend, change)] = store.trends('001')
+    assert (solution, case_num, runs) == ('twoSum', 0, 2)
+    assert trend == '1ms → 2ms'
+    assert change.startswith('+100.0% regression')
+    assert store.trends('002') == []
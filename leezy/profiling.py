@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+from collections import defaultdict
+from time import perf_counter_ns
+
+import leezy
+
+
+LEEZY_DIR = str(Path(leezy.__file__).resolve().parent)
+
+
+class FuncStat:
+    def __init__(self, label, category):
+        self.label = label
+        self.category = category
+        self.calls = 0
+        self.self_ns = 0
+        self.total_ns = 0
+
+
+class StackProfiler:
+    """a deterministic profiler recording the time of every call stack,
+    which can be exported as collapsed stacks for flame graphs
+
+    Functions are put into categories:
+        'solution': functions defined in the problem file
+        'leezy': functions of leezy, e.g. `TreeNode.make_tree`
+        'builtin': functions implemented in C
+        'other': functions of the standard library or other packages
+    """
+
+    def __init__(self, problem_file):
+        self.problem_file = str(Path(problem_file).resolve())
+        self.stacks = defaultdict(int)  # tuple of labels -> self time
+        self.funcs = {}
+        self._frames = []  # [label, start, time of children]
+        self._labels = {}
+
+    def _code_label(self, code):
+        key = (code.co_filename, code.co_firstlineno, code.co_name)
+        if key not in self._labels:
+            filename = str(Path(code.co_filename).resolve())
+            if filename == self.problem_file:
+                category = 'solution'
+            elif filename.startswith(LEEZY_DIR):
+                category = 'leezy'
+            else:
+                category = 'other'
+            name = getattr(code, 'co_qualname', code.co_name)
+            label = f'{name} ({Path(filename).stem}:{code.co_firstlineno})'
+            self._labels[key] = label
+            self.funcs.setdefault(label, FuncStat(label, category))
+        return self._labels[key]
+
+    def _builtin_label(self, func):
+        label = f'<built-in {getattr(func, "__qualname__", func)}>'
+        self.funcs.setdefault(label, FuncStat(label, 'builtin'))
+        return label
+
+    def _push(self, label):
+        self._frames.append([label, perf_counter_ns(), 0])
+
+    def _pop(self):
+        if not self._frames:
+            return
+        now = perf_counter_ns()
+        label, start, children = self._frames.pop()
+        total = now - start
+        stack = tuple(f[0] for f in self._frames) + (label,)
+        self.stacks[stack] += total - children
+        stat = self.funcs[label]
+        stat.calls += 1
+        stat.self_ns += total - children
+        # count total time only at the outermost call of recursions
+        if all(f[0] != label for f in self._frames):
+            stat.total_ns += total
+        if self._frames:
+            self._frames[-1][2] += total
+
+    def _callback(self, frame, event, arg):
+        if event == 'call':
+            self._push(self._code_label(frame.f_code))
+        elif event == 'return':
+            self._pop()
+        elif event == 'c_call':
+            # the call turning the profiler off never returns to it
+            if arg is not sys.setprofile:
+                self._push(self._builtin_label(arg))
+        elif event in ('c_return', 'c_exception'):
+            self._pop()
+
+    def call(self, func, *args, **kwargs):
+        """call `func` under the profiler"""
+        sys.setprofile(self._callback)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+            self._frames = []
+
+    def collapsed(self):
+        """lines of 'frame;frame;frame microseconds', the input format of
+        flamegraph.pl, speedscope and other flame graph tools
+        """
+        lines = []
+        for stack, ns in sorted(self.stacks.items()):
+            us = ns // 1000
+            if us > 0:
+                lines.append(f"{';'.join(stack)} {us}")
+        return '\n'.join(lines) + '\n'
+
+    def write_collapsed(self, path):
+        Path(path).write_text(self.collapsed(), encoding='utf8')
+
+    def top(self, n):
+        """`n` functions taking the most self time"""
+        return sorted(self.funcs.values(), key=lambda s: -s.self_ns)[:n]
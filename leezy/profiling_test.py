@@ -0,0 +1,30 @@
+from leezy.assists import ListNode
+from leezy.profiling import StackProfiler
+
+
+def helper(n):
+    return ListNode.make_linked_list(range(n))
+
+
+def build(n):
+    return [helper(n) for _ in range(3)]
+
+
+def test_stack_profiler():
+    profiler = StackProfiler(__file__)
+    out = profiler.call(build, 10)
+    assert len(out) == 3
+    by_name = {s.label.split(' ')[0]: s for s in profiler.funcs.values()}
+    assert by_name['build'].category == 'solution'
+    assert by_name['helper'].calls == 3
+    assert by_name['helper'].total_ns >= by_name['helper'].self_ns
+    assert by_name['ListNode.make_linked_list'].category == 'leezy'
+    assert any(s.category == 'builtin' for s in profiler.funcs.values())
+    # nothing is left of turning the profiler off
+    assert all(s.calls > 0 for s in profiler.funcs.values())
+    assert not any('setprofile' in label for label in profiler.funcs)
+
+    for line in profiler.collapsed().splitlines():
+        stack, us = line.rsplit(' ', 1)
+        assert stack.startswith('build (') and int(us) > 0
+    assert len(profiler.top(2)) == 2
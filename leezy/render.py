@@ -9,12 +9,19 @@ class TemplateType(Enum):
     Unkown = 2  # rare situation
 
 
+# contexts of `leezy pull --context`
+CONTEXTS = {
+    'tree': 'TreeContext',
+    'linkedlist': 'LinkedListContext',
+    'graph': 'GraphContext',
+    'nary': 'NaryTreeContext',
+    'grid': 'GridContext',
+}
+
+
 NormalTempl = """from leezy import solution, Solution
-{% if tree_context -%}
-from leezy.assists import TreeContext
-{% endif -%}
-{% if linkedlist_context -%}
-from leezy.assists import LinkedListContext
+{% if context_cls -%}
+from leezy.assists import {{context_cls}}
 {% endif -%}
 
 
@@ -26,11 +33,8 @@ class Q{{id_}}(Solution):
 
 def main():
     q = Q{{id_}}()
-{% if tree_context -%}
-    q.set_context(TreeContext)
-{% endif -%}
-{% if linkedlist_context -%}
-    q.set_context(LinkedListContext)
+{% if context_cls -%}
+    q.set_context({{context_cls}})
 {% endif -%}
     q.add_case(q.case({{testcase}}))
     q.run()
@@ -40,16 +44,16 @@ if __name__ == '__main__':
     main()
 """
 
-DesignTempl = """
+DesignTempl = """from leezy import Design
+
+
 {{ code_snippet }}
 
 def main():
-    {{inst}} = {{clss.0}}({{init_args}})
-    operations = {{testcase.0}}
-    oprands = {{testcase.1}}
-    for opt, opd in zip(operations, oprands):
-        if hasattr({{inst}}, opt):
-            print(getattr({{inst}}, opt).__call__(*opd))
+    d = Design({{clss.0}})
+    d.add_case({{testcase.0}},
+               {{testcase.1}})
+    d.run()
 
 
 if __name__ == '__main__':
@@ -106,25 +110,17 @@ class Render:
         code = ''
         if tmpl_type == TemplateType.Normal:
             context.update({
-                'tree_context': self.problem.context == 'tree',
-                'linkedlist_context': self.problem.context == 'linkedlist',
+                'context_cls': CONTEXTS.get(self.problem.context, ''),
                 'id_': problem.loc_id if problem.loc_id.isdigit() else 'Solution',
                 'testcase': ", ".join(repr(x) for x in problem.sample_testcase)
             })
             t = Templite(NormalTempl)
             code = t.render(context)
         elif tmpl_type == TemplateType.Design:
-            testcase = problem.sample_testcase
-            init_args = ''
-            if testcase[0][0] == clss[0]:  # first operation is initializing
-                init_args = ', '.join(repr(x) for x in testcase[1][0])
-                testcase[0] = testcase[0][1:]
-                testcase[1] = testcase[1][1:]
+            # `Design` takes operations with the constructor as they are
             context.update({
                 'code_snippet': problem.code_snippet,
-                'inst': clss[0].lower(),
-                'init_args': init_args,
-                'testcase': [repr(case) for case in testcase],
+                'testcase': [repr(case) for case in problem.sample_testcase],
             })
             t = Templite(DesignTempl)
             code = t.render(context)
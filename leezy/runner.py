@@ -0,0 +1,262 @@
+import os
+import sys
+import signal
+import inspect
+import importlib.util
+from hashlib import sha1
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# module cache of worker processes, keyed by (path, class name)
+_loaded_solutions = {}
+
+
+def solution_location(solution_cls):
+    """return (file path, class name) that workers use to find `solution_cls`
+    """
+    path = Path(inspect.getfile(solution_cls)).resolve()
+    return str(path), solution_cls.__name__
+
+
+def load_solution_class(path, cls_name):
+    """import a `Solution` subclass from a problem file by its path
+
+    The problem file is imported as a normal module instead of `__main__`,
+    so the `main()` guarded by `if __name__ == '__main__'` is not executed.
+    """
+    key = (path, cls_name)
+    if key not in _loaded_solutions:
+        mod_name = 'leezy_problem_' + sha1(path.encode('utf8')).hexdigest()[:8]
+        spec = importlib.util.spec_from_file_location(mod_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[mod_name] = module
+        spec.loader.exec_module(module)
+        _loaded_solutions[key] = getattr(module, cls_name)()
+    return _loaded_solutions[key]
+
+
+def dump_shared(obj):
+    """pickle `obj` with all its `ListNode`s and `TreeNode`s in one table,
+    so nodes shared between args, e.g. the common tail of the two lists of
+    problem 160, are still shared when `load_shared` loads it
+    """
+    import io
+    import pickle
+    from leezy.assists import ListNode, TreeNode, _NodeTable
+    table = _NodeTable()
+
+    def persistent_id(x):
+        if isinstance(x, (ListNode, TreeNode)):
+            return table.add(x)
+        return None
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    pickler.dump(obj)
+    return pickle.dumps((table.state(), buffer.getvalue()),
+                        pickle.HIGHEST_PROTOCOL)
+
+
+def load_shared(data):
+    import io
+    import pickle
+    from leezy.assists import _nodes_of_table
+    state, payload = pickle.loads(data)
+    nodes = _nodes_of_table(*state)
+    unpickler = pickle.Unpickler(io.BytesIO(payload))
+    unpickler.persistent_load = nodes.__getitem__
+    return unpickler.load()
+
+
+def _run_task(path, cls_name, func_name, case, options):
+    q = load_solution_class(path, cls_name)
+    args, kwargs = load_shared(case)
+    func = q.__class__.__dict__[func_name]
+    return q._measure(func, args, kwargs, options)
+
+
+def pool_size(workers=0):
+    """`workers` <= 0 means sizing the pool to the machine"""
+    if workers > 0:
+        return workers
+    return os.cpu_count() or 1
+
+
+def run_grid_parallel(q, options, workers=0, known=None):
+    """run every solution of `q` on every non-test case in a process pool
+
+    Args:
+        known: a grid of fields known without running, e.g. from a cache,
+               pairs whose fields are not None are not run
+
+    Yields:
+        rows of `ResultUnit` fields in the same order as `q.nontest_cases`
+        and `q.solutions`, every row as soon as it's finished
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    path, cls_name = solution_location(q.__class__)
+    if known is None:
+        known = [[None] * len(q.solutions) for _ in q.nontest_cases]
+    n_tasks = sum(fields is None for row in known for fields in row)
+    if n_tasks == 0:
+        yield from known
+        return
+    # a case is pickled once for all solutions, keeping nodes shared
+    cases = [dump_shared((case.args, case.kwargs))
+             if any(fields is None for fields in known_row) else None
+             for case, known_row in zip(q.nontest_cases, known)]
+    with ProcessPoolExecutor(min(pool_size(workers), n_tasks)) as pool:
+        futures = [[pool.submit(_run_task, path, cls_name, f.__name__,
+                                case, options)
+                    if fields is None else None
+                    for f, fields in zip(q.solutions, known_row)]
+                   for case, known_row in zip(cases, known)]
+        for row, known_row in zip(futures, known):
+            yield [fields if fut is None else fut.result()
+                   for fut, fields in zip(row, known_row)]
+
+
+def _run_outputs_batch(path, cls_name, batch):
+    q = load_solution_class(path, cls_name)
+    inputs = load_shared(batch)
+    return [q._run_outputs(args, kwargs) for args, kwargs in inputs]
+
+
+def run_outputs_parallel(q, inputs, workers=0, batch_size=64):
+    """run every solution of `q` on every (args, kwargs) of `inputs` in a
+    process pool, a task runs a batch of inputs to amortize pickling
+
+    Returns:
+        a list of rows of `Solution._run_outputs`, in the order of `inputs`
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    path, cls_name = solution_location(q.__class__)
+    batches = [dump_shared(inputs[i:i+batch_size])
+               for i in range(0, len(inputs), batch_size)]
+    with ProcessPoolExecutor(min(pool_size(workers), len(batches))) as pool:
+        futures = [pool.submit(_run_outputs_batch, path, cls_name, batch)
+                   for batch in batches]
+        return [row for fut in futures for row in fut.result()]
+
+
+class Rusage:
+    """resources used by a solution on a case in a sandbox"""
+
+    def __init__(self, before, after):
+        self.user = after.ru_utime - before.ru_utime
+        self.system = after.ru_stime - before.ru_stime
+        # ru_maxrss is in bytes on macOS, and in kilobytes on Linux
+        scale = 1 if sys.platform == 'darwin' else 1024
+        self.maxrss = after.ru_maxrss * scale
+        self.ctx_switches = ((after.ru_nvcsw - before.ru_nvcsw) +
+                             (after.ru_nivcsw - before.ru_nivcsw))
+
+    def __str__(self):
+        from leezy.utils import format_bytes
+        return (f'usr {self.user:.3f}s sys {self.system:.3f}s '
+                f'rss {format_bytes(self.maxrss)} cs {self.ctx_switches}')
+
+
+def _apply_limits(limits):
+    if resource is None:
+        return
+    cpu = limits.get('cpu')
+    if cpu:
+        cpu = int(cpu + 0.999)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    memory = limits.get('memory')
+    if memory:
+        memory = int(memory * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+
+def _sandbox_task(conn, path, cls_name, func_name, args, kwargs, options,
+                  limits):
+    try:
+        q = load_solution_class(path, cls_name)
+        func = q.__class__.__dict__[func_name]
+        _apply_limits(limits)
+        if resource is None:
+            fields = q._measure(func, args, kwargs, options)
+        else:
+            before = resource.getrusage(resource.RUSAGE_SELF)
+            fields = q._measure(func, args, kwargs, options)
+            after = resource.getrusage(resource.RUSAGE_SELF)
+            fields['rusage'] = Rusage(before, after)
+        conn.send(('OK', fields))
+    except MemoryError:
+        conn.send(('MLE', None))
+    except Exception as e:
+        conn.send(('RE', repr(e)))
+    finally:
+        conn.close()
+
+
+def run_sandboxed(path, cls_name, func_name, args, kwargs, options, limits):
+    """run a solution on a case in a fresh process with its own limits
+
+    Args:
+        limits: a dict with keys
+            'time': wall-clock limit in seconds
+            'cpu': CPU time limit in seconds, RLIMIT_CPU
+            'memory': address space limit in MiB, RLIMIT_AS
+
+    Returns:
+        `ResultUnit` fields, `status` is one of 'OK', 'TLE', 'MLE' and 'RE'
+    """
+    import multiprocessing
+
+    recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+    p = multiprocessing.Process(
+        target=_sandbox_task,
+        args=(send_conn, path, cls_name, func_name, args, kwargs, options,
+              limits),
+        daemon=True)
+    p.start()
+    send_conn.close()
+    time_limit = limits.get('time')
+    status, payload = 'TLE', f'>{time_limit}s'
+    try:
+        if recv_conn.poll(time_limit):
+            status, payload = recv_conn.recv()
+    except EOFError:
+        # killed before reporting anything
+        p.join()
+        if p.exitcode == -getattr(signal, 'SIGXCPU', -1):
+            status, payload = 'TLE', f'>{limits.get("cpu")}s CPU'
+        elif p.exitcode == -getattr(signal, 'SIGKILL', -1):
+            status, payload = 'MLE', None
+        else:
+            status, payload = 'RE', f'exit code {p.exitcode}'
+    finally:
+        recv_conn.close()
+        if p.is_alive():
+            p.kill()
+        p.join()
+
+    if status == 'OK':
+        return payload
+    return dict(status=status, error=payload)
+
+
+def run_grid_sandboxed(q, options, limits, workers=1):
+    """like `run_grid_parallel`, but every (solution, case) pair runs in
+    its own sandbox, `workers` sandboxes may run at the same time
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    path, cls_name = solution_location(q.__class__)
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        futures = [[pool.submit(run_sandboxed, path, cls_name, f.__name__,
+                                case.args, case.kwargs, options, limits)
+                    for f in q.solutions]
+                   for case in q.nontest_cases]
+        for row in futures:
+            yield [fut.result() for fut in row]
@@ -0,0 +1,43 @@
+import os
+import sys
+import json
+import subprocess
+
+# a problem file is started once per `run`, importing leezy should be cheap
+IMPORT_BUDGET_US = 100_000
+HEAVY_MODULES = ['requests', 'pytest', 'statistics', 'tracemalloc']
+
+PROBE = f'''
+import sys, json
+from leezy import Solution, solution
+print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))
+'''
+
+
+def _import_leezy(home):
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+    env.pop('LEEZY_CONFIG_PATCH', None)
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE],
+                          capture_output=True, text=True, env=env, check=True)
+
+
+def _cumulative_us(importtime, module):
+    for line in importtime.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f'{module} not found in import time report')
+
+
+def test_import_is_light(tmp_path):
+    proc = _import_leezy(tmp_path)
+    assert json.loads(proc.stdout) == []
+    # the config file is not read or created until it is used
+    assert not (tmp_path / '.leezy').exists()
+
+
+def test_import_time():
+    # best of a few runs to reduce noise
+    cost = min(_cumulative_us(_import_leezy(os.path.expanduser('~')).stderr,
+                              'leezy') for _ in range(3))
+    assert cost < IMPORT_BUDGET_US
@@ -1,16 +1,29 @@
 import re
 from itertools import zip_longest
 from textwrap import wrap, shorten
-from getpass import getuser, getpass
-from datetime import datetime
 from leezy.errors import ConfigError
 
 
+def format_bytes(size):
+    """
+    >>> format_bytes(512)
+    '512B'
+    >>> format_bytes(3 * 1024 * 1024)
+    '3MiB'
+    """
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{size:.3g}{unit}'
+        size /= 1024
+    return f'{size:.3g}GiB'
+
+
 class SecretDialog:
     def __init__(self, prelude):
         self.prelude = prelude
 
     def collect(self):
+        from getpass import getpass
         print(self.prelude)
         username = input("> username: ")
         password = getpass("> password: ")
@@ -35,6 +48,7 @@ class YesNoDialog:
 
 class SessionTokenDialog:
     def collect(self):
+        from datetime import datetime
         token = input('> LEETCODE_SESSION token: ')
         print('\n you can set expires using following format:\n',
               '    1.absolute timestamp\n',
@@ -154,3 +168,127 @@ class Table:
         self.format_head()
         self.format_body()
         return '\n'.join(self.lines)
+
+
+class _WriteWatch:
+    """a stream noting whether anything is written through it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.written = False
+
+    def write(self, text):
+        if text:
+            self.written = True
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class StreamTable(Table):
+    """a `Table` printing every row as soon as it is added, with column
+    widths fixed up front. `finish` re-flows the table to fit its contents
+    when it's printed to a terminal and still fits in the screen, and
+    nothing else was printed to `sys.stdout` or `sys.stderr` meanwhile,
+    e.g. by a solution, which the re-flowed table would overwrite.
+
+    Example:
+    >>> table = StreamTable([6, 5])
+    >>> table.add_header(['', 'Moon'])
+    +----------+---------+
+    |          |  Moon   |
+    +==========+=========+
+    >>> table.add_row(['Size', '42'])
+    |  Size    |  42     |
+    +----------+---------+
+
+    Args:
+        widths: width of every column, limited by `max_col_width`
+        file: a text stream, default is `sys.stdout`
+    """
+
+    def __init__(self, widths, file=None, **kwargs):
+        import sys
+        super().__init__(**kwargs)
+        self.settings = kwargs
+        self.file = file or sys.stdout
+        self.col_widths = [max(1, min(self.max_col_width, w)) for w in widths]
+        self.col_n = len(self.col_widths)
+        self.dummy_iter = tuple(range(self.col_n))
+        self.header = None
+        self.rows = []
+        self.n_lines = 0
+        self.watches = []
+
+    def _isatty(self):
+        isatty = getattr(self.file, 'isatty', None)
+        return bool(isatty and isatty())
+
+    def _watch_streams(self):
+        """replace `sys.stdout` and `sys.stderr` by streams noting writes,
+        the table itself writes to `self.file` directly
+        """
+        import sys
+        for name in ('stdout', 'stderr'):
+            watch = _WriteWatch(getattr(sys, name))
+            setattr(sys, name, watch)
+            self.watches.append((name, watch))
+
+    def _unwatch_streams(self):
+        """restore the streams, return whether anything was written"""
+        import sys
+        written = False
+        for name, watch in self.watches:
+            written = written or watch.written
+            if getattr(sys, name) is watch:
+                setattr(sys, name, watch.stream)
+        self.watches = []
+        return written
+
+    def _flush(self):
+        for line in self.lines:
+            print(line, file=self.file)
+        self.file.flush()
+        self.n_lines += len(self.lines)
+        self.lines = []
+
+    def add_header(self, header):
+        super().add_header(header)
+        self.header = [str(h) for h in header]
+        self.format_head()
+        self._flush()
+        if self._isatty() and not self.watches:
+            self._watch_streams()
+
+    def add_row(self, row):
+        row = [str(x) for x in row]
+        self.rows.append(row)
+        self._format_row(row)
+        self.format_sep_line()
+        self._flush()
+
+    def _fits_screen(self):
+        import shutil
+        columns, lines = shutil.get_terminal_size()
+        width = sum(w + 2 * self.pad + 1 for w in self.col_widths) + 1
+        return self.n_lines < lines and width <= columns
+
+    def close(self):
+        """restore the watched streams, also when the table isn't finished
+        """
+        self._unwatch_streams()
+
+    def finish(self):
+        """replace the printed rows by a table fitting its contents"""
+        written = self._unwatch_streams()
+        if written or not (self._isatty() and self._fits_screen()):
+            return
+        table = Table(**self.settings)
+        table.add_header(self.header)
+        for row in self.rows:
+            table.add_row(row)
+        # move the cursor to the first printed line and clear below
+        print(f'\x1b[{self.n_lines}F\x1b[J', end='', file=self.file)
+        print(table, file=self.file)
+        self.file.flush()
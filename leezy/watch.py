@@ -0,0 +1,74 @@
+import os
+import sys
+import runpy
+import traceback
+from time import sleep, strftime
+from pathlib import Path
+
+from leezy import runner
+
+
+class Watcher:
+    """run a problem file in this process whenever it's saved
+
+    The file is polled for changes of its modification time and size, no
+    service or extra package is needed. Runs share the warm interpreter
+    and the imported leezy, and with the result cache only solutions and
+    cases changed since the last run are run again.
+    """
+
+    def __init__(self, path, interval=0.5):
+        self.path = Path(path).resolve()
+        self.interval = interval
+
+    def stamp(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def run_once(self):
+        """run the file as `python <file>` would, return False if it's
+        interrupted by Ctrl-C
+        """
+        directory = str(self.path.parent)
+        cwd = os.getcwd()
+        sys.path.insert(0, directory)
+        # workers must not reuse solutions loaded before the change
+        runner._loaded_solutions.clear()
+        try:
+            os.chdir(directory)
+            runpy.run_path(str(self.path), run_name='__main__')
+        except KeyboardInterrupt:
+            print('\ninterrupted')
+            return False
+        except SystemExit:
+            pass
+        except Exception:
+            traceback.print_exc()
+        finally:
+            os.chdir(cwd)
+            sys.path.remove(directory)
+        return True
+
+    def _redraw(self):
+        if sys.stdout.isatty():
+            # clear the screen and move the cursor home
+            print('\x1b[2J\x1b[H', end='')
+        print(f'[{strftime("%H:%M:%S")}] {self.path.name}')
+
+    def loop(self):
+        """run the file now and after every change, until Ctrl-C"""
+        last = None
+        try:
+            while True:
+                stamp = self.stamp()
+                if stamp is not None and stamp != last:
+                    last = stamp
+                    self._redraw()
+                    self.run_once()
+                    print(f'\nwatching {self.path}, press Ctrl-C to stop')
+                sleep(self.interval)
+        except KeyboardInterrupt:
+            print()
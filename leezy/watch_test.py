@@ -0,0 +1,60 @@
+import os
+
+from leezy.watch import Watcher
+
+
+PROBLEM = '''
+from leezy import Solution, solution
+
+
+class Q(Solution):
+    @solution
+    def first(self, x):
+        return x + {inc}
+
+    @solution
+    def second(self, x):
+        return x + 1
+
+
+def main():
+    q = Q()
+    q.add_case(q.case(1))
+    q.run()
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+
+def test_watcher_runs_in_process(tmp_path, capsys):
+    problem_dir = tmp_path / '001 - Q'
+    problem_dir.mkdir()
+    py_path = problem_dir / '1.py'
+    py_path.write_text(PROBLEM.format(inc=1))
+    watcher = Watcher(py_path)
+    stamp = watcher.stamp()
+    cwd = os.getcwd()
+
+    assert watcher.run_once()
+    out = capsys.readouterr().out
+    assert '✓' in out and 'cached' not in out
+    # results are cached in the folder of the problem file
+    assert (problem_dir / '.leezy' / 'Q.results.pickle').is_file()
+    assert os.getcwd() == cwd
+
+    py_path.write_text(PROBLEM.format(inc=2) + '\n')
+    assert watcher.stamp() != stamp
+    watcher.run_once()
+    out = capsys.readouterr().out
+    # only the edited solution runs again
+    assert out.count('cached') == 1 and '✗ AB' in out
+
+
+def test_watcher_survives_errors(tmp_path, capsys):
+    py_path = tmp_path / 'broken.py'
+    py_path.write_text('1 / 0\n')
+    assert Watcher(py_path).run_once()
+    assert 'ZeroDivisionError' in capsys.readouterr().err
+    assert Watcher(tmp_path / 'missing.py').stamp() is None
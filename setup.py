@@ -26,14 +26,15 @@ setup(
     },
     classifiers=[
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 3.6',
-        'Programming Language :: Python :: 3.7',
-        'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
         'Topic :: Text Processing',
         'Topic :: Utilities'
     ],
     packages=['leezy'],
-    install_requires=['requests>=2.18.0', 'pytest>=5.1.3'],
-    python_requires='>=3.6'
+    install_requires=['requests>=2.18.0'],
+    extras_require={'pytest': ['pytest>=5.1.3']},
+    python_requires='>=3.9'
 )